@@ -1,53 +1,118 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import HTTPBearer 
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from db import get_db
+from typing import Optional
+from db import get_db, SessionLocal
+from pagination import id_page
+from stats import common_missing, global_stats
+from match_results import jd_family
+import json, os
 from models import User, Role, Profile
-from auth import get_user_from_token
+from auth import Principal, current_user, invalidate_principal
 bearer = HTTPBearer() 
 admin = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(bearer)])
 
 def require_admin(
-    request: Request,
-    db: Session = Depends(get_db),   
+    me: Principal = Depends(current_user),
 ):
-    me = get_user_from_token(request, db)
-    role_name = me.role_rel.name if getattr(me, "role_rel", None) else "user"
-    if role_name != "admin":
+    if me.role != "admin":
         raise HTTPException(status_code=403, detail="Admins only")
     return me
 
+ADMIN_PAGE_SIZE = int(os.getenv("ADMIN_PAGE_SIZE", "100"))
+ADMIN_MAX_PAGE_SIZE = 1000
+EXPORT_BATCH = int(os.getenv("ADMIN_EXPORT_BATCH", "500"))
+
+
+def _users_query(db: Session, role: Optional[str] = None):
+    q = (
+        db.query(User.id, User.email, Role.name.label("role"),
+                 Profile.username, Profile.major, Profile.minor, Profile.specialization)
+        .outerjoin(Profile, Profile.user_id == User.id)
+        .outerjoin(Role, Role.id == User.role_id)
+    )
+    if role:
+        # users without a role row count as "user", like in the listing
+        q = q.filter(or_(Role.name == role, User.role_id.is_(None)) if role == "user" else Role.name == role)
+    return q
+
+
+def _user_item(r) -> dict:
+    return {
+        "id": r.id,
+        "email": r.email,
+        "role": r.role or "user",
+        "profile": {
+            "username": r.username,
+            "major": r.major,
+            "minor": r.minor,
+            "specialization": r.specialization,
+        },
+    }
+
+
 @admin.get("/users")
 def list_users(
-    _: User = Depends(require_admin),           # dependency
+    role: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = ADMIN_PAGE_SIZE,
+    _: Principal = Depends(require_admin),           # dependency
     db: Session = Depends(get_db),              
 ):
-    rows = (
-        db.query(User, Profile, Role)
-        .outerjoin(Profile, Profile.user_id == User.id)
-        .outerjoin(Role, Role.id == User.role_id)
-        .all()
-    )
-    out = []
-    for u, p, r in rows:
-        out.append({
-            "id": u.id,
-            "email": u.email,
-            "role": (r.name if r else "user"),
-            "profile": {
-                "username": getattr(p, "username", None),
-                "major": getattr(p, "major", None),
-                "minor": getattr(p, "minor", None),
-                "specialization": getattr(p, "specialization", None),
-            },
-        })
-    return {"users": out}
+    rows, next_cursor = id_page(_users_query(db, role), User.id, cursor,
+                                max(1, min(limit, ADMIN_MAX_PAGE_SIZE)))
+    return {"users": [_user_item(r) for r in rows], "next_cursor": next_cursor}
+
+
+@admin.get("/users/export")
+def export_users(
+    role: Optional[str] = None,
+    _: Principal = Depends(require_admin),
+):
+    """All (filtered) users as NDJSON, streamed from a server-side cursor."""
+    def rows():
+        # own session: the request one may be closed before the body is sent
+        db = SessionLocal()
+        try:
+            q = _users_query(db, role).order_by(User.id)
+            for r in q.execution_options(stream_results=True).yield_per(EXPORT_BATCH):
+                yield json.dumps(_user_item(r)) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson",
+                             headers={"Content-Disposition": 'attachment; filename="users.ndjson"'})
+
+@admin.get("/stats")
+def admin_stats(
+    _: Principal = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Platform-wide dashboard numbers, summed from the user_stats rollups."""
+    return global_stats(db)
+
+@admin.get("/stats/missing_skills")
+def admin_missing_skills(
+    job_title: Optional[str] = None,
+    limit: int = 20,
+    _: Principal = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Most common missing skills, overall or for the JD family of job_title.
+    Families come from each attempt's job_title (the first line of its JD),
+    so JDs that do not start with the role land in their own families.
+    """
+    family = jd_family(job_title) if job_title else None
+    return {"jd_family": family, "items": common_missing(db, family, max(1, min(limit, 100)))}
 
 @admin.patch("/users/{user_id}/role")
 def set_user_role(
     user_id: int,
     role: str,
-    _: User = Depends(require_admin),           
+    _: Principal = Depends(require_admin),           
     db: Session = Depends(get_db),              
 ):
     role_obj = db.query(Role).filter_by(name=role).first()
@@ -61,16 +126,19 @@ def set_user_role(
 
     u.role_id = role_obj.id
     db.commit()
+    invalidate_principal(u.email)
     return {"ok": True, "user_id": u.id, "new_role": role}
 
 @admin.delete("/users/{user_id}")
 def delete_user(
     user_id: int,
-    _: User = Depends(require_admin),          
+    _: Principal = Depends(require_admin),          
     db: Session = Depends(get_db),              
 ):
     u = db.query(User).filter(User.id == user_id).first()
     if not u:
         raise HTTPException(404, "User not found")
+    email = u.email
     db.delete(u); db.commit()
+    invalidate_principal(email)
     return {"ok": True, "deleted_user_id": user_id}
@@ -2,26 +2,46 @@
 # HiringBuddy AI Core _ all agent logic and persistent with (pgvector)
 # -----------------------------------------------
 
-import io, json, re, time
-from typing import List, Dict, Optional, Any
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Body, Depends, Request
+import asyncio, hashlib, io, json, re, time, weakref
+from typing import List, Dict, Optional, Any, Tuple, Union
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Body, Depends, Request, BackgroundTasks
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
-from PyPDF2 import PdfReader
 from botocore.exceptions import ClientError
-from sqlalchemy.orm import Session
-from bedrock_client import invoke_chat, embed_text, DEFAULT_AWS_REGION, DEFAULT_CLAUDE
-from db import get_db
+from sqlalchemy.orm import Session, joinedload
+from bedrock_client import (
+    invoke_chat, stream_chat, embed_text, DEFAULT_AWS_REGION, DEFAULT_CLAUDE,
+    chat_cache_get, chat_cache_put, served_from_cache, chat_cache_stats,
+    chat_single_flight, coalescing_stats,
+)
+from async_bedrock_client import ainvoke_chat, achat_single_flight, coalescing_stats as async_coalescing_stats
+from embedding_cache import cached_embed_text, normalize_text, stats as embedding_cache_stats
+from db import get_db, SessionLocal
 from models import Resume, ResumeChunk, MatchAttempt, InterviewAttempt
-from auth import get_user_from_token
+from auth import Principal, current_user, get_principal
+from admin import require_admin
 from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from concurrent.futures import ThreadPoolExecutor
+from rate_limit import bedrock_guard, backoff_delay, guard_states
 import re
 import os
 import httpx
-import pdfplumber
+from indexing import store_resume_index
+from jobs import enqueue_index_job, get_job, on_indexed
+from resume_sections import ResumeSections, sections_for
+from retrieval import hybrid_rank, hybrid_rank_many, prefilter_resumes
+from cache_utils import LRUCache
+from pagination import keyset_page
+from stats import record_interview, record_match, record_rollup, user_stats
+from match_results import match_fields
+from resume_artifacts import fresh_artifacts, save_artifacts, resume_block
+from extraction import extract_docx_text, extract_pdf_text
+from extraction_cache import cached_extract_text, stats as extraction_cache_stats
+from uploads import SpooledUpload, spooled_upload
 from dotenv import load_dotenv
 from pydantic import BaseModel
 import random
@@ -42,142 +62,204 @@ def _lang_hint(language: str) -> str:
         "in clear, natural English."
     )
 
-def token_aware_chunks(text: str, max_tokens: int = 700, overlap: int = 80):
-    import re, math
-    text = re.sub(r'\s+', ' ', text).strip()
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    chunks, cur, cur_tokens = [], [], 0
-
-    def est_tokens(s: str) -> int:
-        return max(1, int(len(s.split()) / 0.75))
-
-    i = 0
-    while i < len(sentences):
-        s = sentences[i]
-        t = est_tokens(s)
-        if cur_tokens + t <= max_tokens or not cur:
-            cur.append(s); cur_tokens += t; i += 1
-        else:
-            chunk = ' '.join(cur).strip()
-            if chunk:
-                chunks.append(chunk)
-            prefix, tok = [], 0
-            for s_back in reversed(cur):
-                tok += est_tokens(s_back)
-                prefix.append(s_back)
-                if tok >= overlap:
-                    break
-            cur = list(reversed(prefix))
-            cur_tokens = sum(est_tokens(x) for x in cur)
-    last = ' '.join(cur).strip()
-    if last:
-        chunks.append(last)
-    return chunks
-
 
 # ---------------- claude Wrapper ----------------
+_SATURATED = ("ThrottlingException", "ServiceUnavailableException")
+
+
+def _is_timeout(e: Exception) -> bool:
+    msg = str(e)
+    return "ReadTimeoutError" in msg or "timed out" in msg.lower()
+
+
+def _guard_for(kwargs) -> Tuple[Any, object]:
+    """(guard, breaker ticket); every admitted call must end in guard.breaker.release(ticket)."""
+    region = kwargs.get("aws_region") or DEFAULT_AWS_REGION
+    model = kwargs.get("model_id") or DEFAULT_CLAUDE
+    guard = bedrock_guard(region, model)
+    ticket = guard.breaker.admit()
+    if ticket is None:
+        # circuit open: Bedrock is saturated, don't pile on
+        raise HTTPException(
+            503, "Claude is overloaded right now, retry shortly.",
+            headers={"Retry-After": str(guard.breaker.retry_after())},
+        )
+    return guard, ticket
+
+
+def _overloaded(guard, delay: float) -> HTTPException:
+    """503 once every retry was throttled: come back after the cooldown / backoff."""
+    wait = guard.breaker.retry_after() if guard.breaker.status == "open" else max(1, int(delay))
+    return HTTPException(503, "Claude overloaded, retry later.", headers={"Retry-After": str(wait)})
+
 
 def safe_invoke_chat(*args, retries=2, delay=4, **kwargs):
-    last_err = None
+    # deterministic prompt already answered -> no limiter token, no Bedrock call
+    hit = chat_cache_get(**kwargs)
+    if hit is not None:
+        return hit
+    # same prompt already in flight (e.g. a whole class pasting one JD) -> wait for it
+    out = chat_single_flight(lambda: _guarded_invoke_chat(args, retries, delay, kwargs), **kwargs)
+    chat_cache_put(out, **kwargs)
+    return out
+
 
+def _guarded_invoke_chat(args, retries, delay, kwargs):
     for attempt in range(1, retries + 1):
+        guard, ticket = _guard_for(kwargs)
         try:
-            return invoke_chat(*args, **kwargs)
+            guard.limiter.acquire()
+            out = invoke_chat(*args, use_cache=False, **kwargs)
         except ClientError as e:
             code = e.response.get("Error", {}).get("Code", "")
-            # serve rdown retry
-            if code in ("ThrottlingException", "ServiceUnavailableException"):
-                last_err = e
-                time.sleep(delay * attempt)
+            # server down / throttled -> slow the shared limiter + jittered retry
+            if code in _SATURATED:
+                guard.on_throttle()
+                if attempt < retries:
+                    time.sleep(backoff_delay(attempt, delay))
                 continue
-            
+            # any other Bedrock error (validation, access...) says nothing about load
             raise
         except Exception as e:
-            msg = str(e)
             # retry on timeouts too
-            if "ReadTimeoutError" in msg or "timed out" in msg.lower():
-                last_err = e
+            if _is_timeout(e):
+                guard.breaker.record_failure()
                 if attempt < retries:
-                    time.sleep(delay * attempt)
+                    time.sleep(backoff_delay(attempt, delay))
                     continue
                 # after last attempt, return error
                 raise HTTPException(504, "Claude timeout. Try again later.")
-        
             raise
+        else:
+            guard.on_success()
+        finally:
+            guard.breaker.release(ticket)
+        return out
 
     # all retries exhausted
-    raise HTTPException(504, "Claude overloaded, retry later.")
+    raise _overloaded(guard, delay)
 
 
-# ---------------- File Text Extraction ----------------
-def _extract_text_from_docx_bytes(b: bytes) -> str:
-    with io.BytesIO(b) as buf:
-        doc = Document(buf)
-        return "\n".join(p.text for p in doc.paragraphs)
-
-def _extract_text_from_pdf_bytes(b: bytes) -> str:
-    # reader = PdfReader(io.BytesIO(b)) 
-    # return "\n".join((p.extract_text() or "") for p in reader.pages)
+async def safe_ainvoke_chat(*args, retries=2, delay=4, **kwargs):
+    # same policy as safe_invoke_chat, but awaits instead of blocking a worker
+    hit = chat_cache_get(**kwargs)
+    if hit is not None:
+        return hit
+    out = await achat_single_flight(lambda: _guarded_ainvoke_chat(args, retries, delay, kwargs), **kwargs)
+    chat_cache_put(out, **kwargs)
+    return out
+
+
+async def _guarded_ainvoke_chat(args, retries, delay, kwargs):
+    for attempt in range(1, retries + 1):
+        guard, ticket = _guard_for(kwargs)
+        try:
+            await guard.limiter.aacquire()
+            out = await ainvoke_chat(*args, use_cache=False, **kwargs)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code", "")
+            if code in _SATURATED:
+                guard.on_throttle()
+                if attempt < retries:
+                    await asyncio.sleep(backoff_delay(attempt, delay))
+                continue
+            raise
+        except Exception as e:
+            if _is_timeout(e):
+                guard.breaker.record_failure()
+                if attempt < retries:
+                    await asyncio.sleep(backoff_delay(attempt, delay))
+                    continue
+                raise HTTPException(504, "Claude timeout. Try again later.")
+            raise
+        else:
+            guard.on_success()
+        finally:
+            # also on cancellation (client gone), so a half-open probe never stays taken
+            guard.breaker.release(ticket)
+        return out
+
+    raise _overloaded(guard, delay)
+
+
+# ---------------- SSE streaming ----------------
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _sse_response(chat: Dict[str, Any], finalize) -> StreamingResponse:
     """
-    try pdfplumber first 
+    Streams Claude tokens as Server-Sent Events, then one "done" event
+    with finalize(full_text) so clients get the same normalized JSON.
     """
-    # --- pdfplumber <3<3
-    try:
-        text_chunks = []
-        with io.BytesIO(b) as buf:
-            with pdfplumber.open(buf) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text() or ""
-                    text_chunks.append(page_text)
-
-        txt = "\n".join(text_chunks)
-        #cleanup
-        txt = re.sub(r"[ \t]+", " ", txt)
-        txt = re.sub(r"\n{3,}", "\n\n", txt)
-        txt = txt.strip()
-
-        if txt:
-            return txt
-    except Exception as e:
-        print("[WARN] pdfplumber failed, falling back to PyPDF2:", e)
-
-    # ---  PyPDF2 hna as fallback
-    reader = PdfReader(io.BytesIO(b))
-    txt = "\n".join((p.extract_text() or "") for p in reader.pages)
-    txt = re.sub(r"[ \t]+", " ", txt)
-    txt = re.sub(r"\n{3,}", "\n\n", txt)
-    return txt.strip()
-
-
-def _extract_text(file: UploadFile, raw: bytes) -> str:
-    name = (file.filename or "").lower()
-    if name.endswith(".docx"):
-        return _extract_text_from_docx_bytes(raw)
-    if name.endswith(".pdf"):
-        return _extract_text_from_pdf_bytes(raw)
-    if name.endswith(".txt"):
-        return raw.decode("utf-8", errors="ignore")
-    raise HTTPException(400, "Unsupported file type (.docx, .pdf, .txt only)")
-
-# ---------------- cosine Ssimilar-----------
-def cos_sim(a: List[float], b: List[float]) -> float:
-    if not a or not b or len(a) != len(b):
-        return 0.0
-    import math
-    dot = sum(x*y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x*x for x in a))
-    norm_b = math.sqrt(sum(x*x for x in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+    guard, ticket = _guard_for(chat)  # 503 before the stream starts if the circuit is open
+
+    def events():
+        # started: the finally below releases the ticket from here on
+        release_if_unstarted.detach()
+        parts: List[str] = []
+        try:
+            guard.limiter.acquire()
+            try:
+                for piece in stream_chat(**chat):
+                    parts.append(piece)
+                    yield _sse("token", {"text": piece})
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code", "")
+                if code in _SATURATED:
+                    guard.on_throttle()
+                    yield _sse("error", {"status": 503, "detail": "Claude overloaded, retry later."})
+                else:
+                    yield _sse("error", {"status": 502, "detail": f"Claude error: {code or e}"})
+                return
+            except Exception as e:
+                print("[WARN] stream_chat failed:", e)
+                if _is_timeout(e):
+                    guard.breaker.record_failure()
+                yield _sse("error", {"status": 504, "detail": "Claude timeout. Try again later."})
+                return
+            guard.on_success()
+            try:
+                done = finalize("".join(parts))
+            except HTTPException as e:
+                yield _sse("error", {"status": e.status_code, "detail": e.detail})
+                return
+            except Exception as e:
+                print("[WARN] stream finalize failed:", e)
+                yield _sse("error", {"status": 500, "detail": "Could not process Claude's answer."})
+                return
+            yield _sse("done", done)
+        finally:
+            # runs on GeneratorExit too (client disconnected mid-stream)
+            guard.breaker.release(ticket)
+
+    gen = events()
+    # a generator that is never started skips its finally; free the probe when it is dropped
+    release_if_unstarted = weakref.finalize(gen, guard.breaker.release, ticket)
+    return StreamingResponse(
+        gen,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ---------------- File Text Extraction ----------------
+# parsing lives in extraction.py (process pool); old names kept for callers
+_extract_text_from_docx_bytes = extract_docx_text
+_extract_text_from_pdf_bytes = extract_pdf_text
+
+
+async def _extract_text(file: UploadFile, raw: Union[bytes, SpooledUpload]) -> str:
+    # same bytes already parsed (peek_doc -> index_resume_mem, re-uploads) -> cached text
+    if isinstance(raw, SpooledUpload):
+        return await cached_extract_text(raw.filename, raw.source, digest=raw.sha256)
+    return await cached_extract_text(file.filename, raw)
 
 # ---------------- /peek_doc ----------------
 @router.post("/peek_doc")
 async def peek_doc(file: UploadFile = File(...), limit: int = 1200):
-    raw = await file.read()
-    if not raw:
-        raise HTTPException(400, "Empty file.")
-    text = _extract_text(file, raw)
+    async with spooled_upload(file) as upload:
+        text = await _extract_text(file, upload)
     if not text.strip():
         raise HTTPException(400, "No readable text.")
     return {"chars": len(text), "head": text[:max(100, min(limit, 4000))], "full": text}
@@ -185,98 +267,77 @@ async def peek_doc(file: UploadFile = File(...), limit: int = 1200):
 # ---------------- /index_resume_mem ----------------
 @router.post("/index_resume_mem")
 async def index_resume_mem(
-    request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     candidate_name: str = Form("Unknown"),
+    user: Principal = Depends(current_user),
     db: Session = Depends(get_db),
 ):
-    user = get_user_from_token(request, db)
-    raw = await file.read()
-    if not raw:
-        raise HTTPException(400, "Empty file.")
-    text = _extract_text(file, raw)
-    if not text.strip():
-        raise HTTPException(400, "No readable text.")
+    async with spooled_upload(file) as upload:
+        text = await _extract_text(file, upload)
+    resume = await store_resume_index(db, user.id, file.filename, text)
+    # job profile / skills / blocks are computed after the response is sent
+    background_tasks.add_task(_enrich_resume, resume.id)
+    return {"ok": True, "resume_id": resume.id}
 
-    # save resume record
-    resume = Resume(user_id=user.id, name=file.filename, text=text)
-    db.add(resume)
-    db.commit()
-    db.refresh(resume)
 
-    # split and embed each para
-    paragraphs = token_aware_chunks(text, max_tokens=700, overlap=80)
-    if len(paragraphs) <= 1:
-        words = text.split()
-        paragraphs = [" ".join(words[i:i+800]) for i in range(0, len(words), 700)]
+# ---------------- /index_resume_jobs (queued) ----------------
+@router.post("/index_resume_jobs", status_code=202)
+async def index_resume_jobs(
+    file: UploadFile = File(...),
+    user: Principal = Depends(current_user),
+    db: Session = Depends(get_db),
+):
+    """Same pipeline as /index_resume_mem, run by the jobs.py workers; poll /ai/jobs/{job_id}."""
+    async with spooled_upload(file) as upload:
+        raw = upload.read_bytes()
+        digest = upload.sha256
+    job, deduplicated = await run_in_threadpool(enqueue_index_job, user.id, file.filename, raw, digest)
+    return {"job_id": job["id"], "status": job["status"], "deduplicated": deduplicated}
 
-    if not paragraphs:
-        paragraphs = [text]
 
-    for p in paragraphs:
-        try:
-            emb = embed_text(p, aws_region=DEFAULT_AWS_REGION)
-            if not emb or not isinstance(emb, list):
-                raise ValueError("Empty embedding response")
-        except Exception as e:
-            print(f"[WARN] Embedding failed for chunk: {p[:60]!r} ({e})")
-            # fallback vector 256 dims)
-            emb = [0.0] * 256
+@router.get("/jobs/{job_id}")
+def index_job_status(job_id: str, user: Principal = Depends(current_user), db: Session = Depends(get_db)):
+    job = get_job(job_id)
+    if job is None or job["user_id"] != user.id:
+        raise HTTPException(404, "Job not found.")
+    return job
 
-        db.add(ResumeChunk(resume_id=resume.id, text=p, embedding=emb))
 
-    db.commit()
-    print(f"[OK] Indexed resume #{resume.id} with {len(paragraphs)} chunks")
-    return {"ok": True, "resume_id": resume.id}
+# ---------------- Helper: Retrieve top snippets ----------------
+def _with_section_blocks(resume: Resume, top: List[str]) -> List[str]:
+    # --- append Sills + Experience blocks k---
+    skills_block = resume_block(resume, "SKILLS")
+    experience_block = resume_block(resume, "EXPERIENCE")
+
+    # If found, append them to snippets shown to Claude
+    if skills_block:
+        top.append(skills_block)
+
+    if experience_block:
+        top.append(experience_block)
+    return top
 
 
-# ---------------- Helper: Retrieve top snippets ----------------
 def best_snippets_from_db(requirement: str, db, user, region=DEFAULT_AWS_REGION,
                           top_k_resumes=2, top_k_snippets=3):
-    qv = embed_text(requirement, aws_region=region)
-    keywords = [w for w in re.findall(r"\w+", requirement.lower()) if len(w) > 2]
+    qv = cached_embed_text(requirement, aws_region=region)
     scored = []
 
     for resume in (
     db.query(Resume)
+      .options(joinedload(Resume.artifacts))
       .filter(Resume.user_id == user.id)
       .order_by(Resume.created_at.desc())
       .limit(1)
       .all()
 ):
-        chunk_scores = []
-        for ch in resume.chunks:
-            # convert JSON from db to floats
-            vec = []
-            for x in (ch.embedding or []):
-                try:
-                    vec.append(float(x))
-                except Exception:
-                    continue
-
-            sem = cos_sim(qv, vec)
-            kw_hits = sum(1 for w in keywords if w in ch.text.lower())
-            score = 0.85 * sem + 0.15 * (min(kw_hits, 5) / 5.0)
-            chunk_scores.append((score, ch.text))
-
-        if not chunk_scores:
+        # pgvector nearest chunks + BM25 hits, fused (retrieval.py)
+        ranked = hybrid_rank(db, resume.id, requirement, qv, top_k_snippets)
+        if not ranked:
             continue
-        chunk_scores.sort(reverse=True, key=lambda t: t[0])
-        best = chunk_scores[0][0]
-        top = [t[1] for t in chunk_scores[:top_k_snippets]]
-        # --- append Sills + Experience blocks k---
-        full_text = resume.text or ""
-
-        skills_block = _extract_section_block(full_text, ["SKILLS", "TECHNICAL SKILLS"])
-        experience_block = _extract_section_block(full_text, ["EXPERIENCE", "PROFESSIONAL EXPERIENCE"])
-
-        # If found, append them to snippets shown to Claude
-        if skills_block:
-            top.append(skills_block)
-
-        if experience_block:
-            top.append(experience_block)
-
+        best = ranked[0][1]
+        top = _with_section_blocks(resume, [t for t, _ in ranked])
         print(f"[{resume.name}] best semantic score = {best:.3f}")
         scored.append((best, resume, top))
 
@@ -285,27 +346,16 @@ def best_snippets_from_db(requirement: str, db, user, region=DEFAULT_AWS_REGION,
 
 
 # ---------------- /match_mem/ matching cv jd----------------
-@router.post("/match_mem")
-def match_mem(
-    request: Request,
-    requirement: str = Body(..., embed=True),
-    language: str = Body("en"),
-    db: Session = Depends(get_db),
-):
-    user = get_user_from_token(request, db)
-    if not requirement.strip():
-        raise HTTPException(400, "Empty requirement.")
-    language = (language or "en").lower()
-    if language not in {"en", "fr"}:
-        language = "en"
+LLM_FANOUT_WORKERS = int(os.getenv("LLM_FANOUT_WORKERS", "8"))
 
-    scored = best_snippets_from_db(requirement, db, user)
-    results = []
+_LLM_POOL = ThreadPoolExecutor(max_workers=LLM_FANOUT_WORKERS, thread_name_prefix="llm")
 
-    for best, resume, snippets in scored:
-        lang_hint = _lang_hint(language)
 
-        prompt = f"""{lang_hint}
+def _score_candidate(requirement: str, language: str, best: float, resume_id: int,
+                     resume_name: str, snippets: List[str]) -> dict:
+    lang_hint = _lang_hint(language)
+
+    prompt = f"""{lang_hint}
     You are a hiring assistant. Return ONLY JSON: {{
   "score": 0-100,
   "highlights": [string],
@@ -320,92 +370,168 @@ Top evidence excerpts (from the candidate):
 {chr(10).join(snippets)}
 ---"""
 
-        out = safe_invoke_chat(
-            messages=[{"role": "user", "content": [{"text": prompt}]}],
-            system=[{"text": "Return ONLY valid JSON. No prose."}],
-            model_id=DEFAULT_CLAUDE,
-            aws_region=DEFAULT_AWS_REGION,
-            max_tokens=380,
-            temperature=0.0,
-        )
-        cleaned = out.strip().strip("`").replace("json", "", 1).strip()
-        # print claude returned
-        print("\n================ CLAUDE RAW OUTPUT ================")
-        print(cleaned)
-        print("===================================================\n")
-        results.append({
-            "resume_id": resume.id,
-            "candidate": resume.name,
-            "retrieval_semantic_best": best,
-            "llm_json": cleaned
-        })
-        time.sleep(1.5)
-#             # existing loop:
-#     for best, resume, snippets in scored:
-#         prompt = f"""You are a hiring assistant. Return ONLY JSON: {{
-#   "score": 0-100,
-#   "highlights": [string],
-#   "missing": [string]
-# }}
-# Requirement:
-# ---
-# {requirement}
-# ---
-# Top evidence excerpts (from the candidate):
-# ---
-# {chr(10).join(snippets)}
-# ---"""
-
-#         out = safe_invoke_chat(
-#             messages=[{"role": "user", "content": [{"text": prompt}]}],
-#             system=[{"text": "Return ONLY valid JSON. No prose."}],
-#             model_id=DEFAULT_CLAUDE,
-#             aws_region=DEFAULT_AWS_REGION,
-#             max_tokens=380,
-#             temperature=0.0,
-#         )
-#         cleaned = out.strip().strip("`").replace("json", "", 1).strip()
-#         print("\n================ CLAUDE RAW OUTPUT ================")
-#         print(cleaned)
-#         print("===================================================\n")
-
-#         results.append({
-#             "resume_id": resume.id,
-#             "candidate": resume.name,
-#             "retrieval_semantic_best": best,
-#             "llm_json": cleaned
-#         })
-#         time.sleep(1.5)
+    out = safe_invoke_chat(
+        messages=[{"role": "user", "content": [{"text": prompt}]}],
+        system=[{"text": "Return ONLY valid JSON. No prose."}],
+        model_id=DEFAULT_CLAUDE,
+        aws_region=DEFAULT_AWS_REGION,
+        max_tokens=380,
+        temperature=0.0,
+    )
+    cached = served_from_cache()
+    cleaned = out.strip().strip("`").replace("json", "", 1).strip()
+    # print claude returned
+    print("\n================ CLAUDE RAW OUTPUT ================")
+    print(cleaned)
+    print("===================================================\n")
+    return {
+        "resume_id": resume_id,
+        "candidate": resume_name,
+        "retrieval_semantic_best": best,
+        "llm_json": cleaned,
+        "cached": cached,
+    }
+
+
+@router.post("/match_mem")
+def match_mem(
+    requirement: str = Body(..., embed=True),
+    language: str = Body("en"),
+    user: Principal = Depends(current_user),
+    db: Session = Depends(get_db),
+):
+    if not requirement.strip():
+        raise HTTPException(400, "Empty requirement.")
+    language = (language or "en").lower()
+    if language not in {"en", "fr"}:
+        language = "en"
+
+    scored = best_snippets_from_db(requirement, db, user)
+
+    # score every candidate in parallel; safe_invoke_chat's shared limiter paces the calls
+    jobs = [(best, resume.id, resume.name, snippets) for best, resume, snippets in scored]
+    results = list(_LLM_POOL.map(lambda j: _score_candidate(requirement, language, *j), jobs))
 
     # ---- NEW: log history for the *best* result ----
     best_result = max(results, key=lambda r: r.get("retrieval_semantic_best", 0), default=None)
 
     if best_result is not None:
-        try:
-            best_json = best_result["llm_json"]
-            data = json.loads(best_json) if isinstance(best_json, str) else best_json
-            raw_score = data.get("score", 0)
-            score_val = int(max(0, min(100, round(float(raw_score)))))
-        except Exception:
-            score_val = None
-
-
         # short label for the JD
         job_title = (requirement or "").strip().split("\n")[0][:255]
         jd_snippet = (requirement or "")[:1000]
+        # parsed once here: result JSONB, highlights / missing arrays, jd_family
+        fields = match_fields(best_result["llm_json"], job_title)
 
         attempt = MatchAttempt(
             user_id=user.id,
             resume_id=best_result.get("resume_id"),
             job_title=job_title,
-            score=score_val,
             jd_snippet=jd_snippet,
             raw_json=best_result["llm_json"],
+            **fields,
         )
         db.add(attempt)
+        db.flush()
+        # dashboard rollup in the same transaction; its errors never fail the match
+        record_rollup(db, record_match, user.id, fields["score"], fields["missing"])
         db.commit()
 
     return {"results": results}
+
+
+# ---------------- /recruiter/match: one JD against every stored resume ----------------
+RECRUITER_ROLES = {"recruiter", "admin"}
+RECRUITER_PREFILTER_CHUNKS = int(os.getenv("RECRUITER_PREFILTER_CHUNKS", "1000"))
+RECRUITER_SHORTLIST = int(os.getenv("RECRUITER_SHORTLIST", "50"))
+RECRUITER_MAX_PAGE_SIZE = int(os.getenv("RECRUITER_MAX_PAGE_SIZE", "25"))
+RECRUITER_CACHE_TTL = float(os.getenv("RECRUITER_CACHE_TTL", "600"))
+
+# reranked shortlist per JD, so the next pages skip retrieval
+_shortlists = LRUCache(maxsize=256, ttl=RECRUITER_CACHE_TTL)
+
+
+def _require_recruiter(request: Request, db: Session):
+    user = get_principal(request, db)
+    if user.role not in RECRUITER_ROLES:
+        raise HTTPException(status_code=403, detail="Recruiters only")
+    return user
+
+
+def _recruiter_shortlist(requirement: str, db, region=DEFAULT_AWS_REGION):
+    """
+    [(hybrid score, resume_id, top chunks)], best first:
+    ANN prefilter over all chunks in Postgres -> best resume per candidate
+    -> hybrid BM25 + vector rerank of those resumes.
+    """
+    key = hashlib.sha256(requirement.encode("utf-8")).hexdigest()
+    hit = _shortlists.get(key)
+    if hit is not None:
+        return hit
+
+    qv = cached_embed_text(requirement, aws_region=region)
+    candidates = prefilter_resumes(db, qv, RECRUITER_PREFILTER_CHUNKS, RECRUITER_SHORTLIST)
+    top = hybrid_rank_many(db, [resume_id for resume_id, _, _ in candidates], requirement, qv, 3)
+    ranked = [
+        (chunks[0][1], resume_id, [t for t, _ in chunks])
+        for resume_id, chunks in top.items() if chunks
+    ]
+    ranked.sort(reverse=True, key=lambda t: t[0])
+    _shortlists.set(key, ranked)
+    return ranked
+
+
+@router.post("/recruiter/match")
+def recruiter_match(
+    request: Request,
+    requirement: str = Body(..., embed=True),
+    language: str = Body("en"),
+    page: int = Body(1),
+    page_size: int = Body(10),
+    db: Session = Depends(get_db),
+):
+    """
+    Ranks every stored resume (best one per candidate) against the JD;
+    only the requested page goes to Claude, scored concurrently.
+    """
+    _require_recruiter(request, db)
+    requirement = (requirement or "").strip()
+    if not requirement:
+        raise HTTPException(400, "Empty requirement.")
+    language = (language or "en").lower()
+    if language not in {"en", "fr"}:
+        language = "en"
+    page = max(1, page)
+    page_size = max(1, min(page_size, RECRUITER_MAX_PAGE_SIZE))
+
+    shortlist = _recruiter_shortlist(requirement, db)
+    window = shortlist[(page - 1) * page_size: page * page_size]
+
+    resumes = {
+        r.id: r
+        for r in db.query(Resume)
+                   .options(joinedload(Resume.artifacts), joinedload(Resume.user))
+                   .filter(Resume.id.in_([rid for _, rid, _ in window]))
+                   .all()
+    }
+    # resumes deleted since the shortlist was cached are skipped
+    jobs = [
+        (best, rid, resumes[rid].name, _with_section_blocks(resumes[rid], list(top)))
+        for best, rid, top in window if rid in resumes
+    ]
+    results = list(_LLM_POOL.map(lambda j: _score_candidate(requirement, language, *j), jobs))
+    for rank, r in enumerate(results, start=(page - 1) * page_size + 1):
+        owner = resumes[r["resume_id"]].user
+        r["rank"] = rank
+        r["user_id"] = owner.id if owner else None
+        r["email"] = owner.email if owner else None
+
+    return {
+        "results": results,
+        "page": page,
+        "page_size": page_size,
+        "total": len(shortlist),
+        "has_more": page * page_size < len(shortlist),
+    }
 #----ats system----
 class ExtractRequest(BaseModel):
     text: str
@@ -416,7 +542,7 @@ def clean_json_generic(s: str):
     return s
 #---ats
 @router.post("/extract_keywords")
-def extract_keywords(body: ExtractRequest):
+async def extract_keywords(body: ExtractRequest):
     """
     Pure keyword extraction — NOT semantic, NOT CS-specific.
     Extracts concrete requirement tokens from ANY job description.
@@ -435,7 +561,7 @@ Text:
 {body.text}
 """
 
-    out = safe_invoke_chat(
+    out = await safe_ainvoke_chat(
         messages=[{"role": "user", "content": [{"text": prompt}]}],
         system=[{"text": "Return ONLY a JSON array. No prose. No explanations."}],
         model_id=DEFAULT_CLAUDE,
@@ -443,22 +569,23 @@ Text:
         temperature=0.0,
         max_tokens=200,
     )
+    cached = served_from_cache()
 
     cleaned = clean_json_generic(out)
 
     try:
         arr = json.loads(cleaned)
         if isinstance(arr, list):
-            return {"keywords": arr}
+            return {"keywords": arr, "cached": cached}
     except:
         pass
 
-    return {"keywords": []}
+    return {"keywords": [], "cached": cached}
 
 
 #-----suggest-----
 @router.post("/suggestions_for_improvement")
-def suggestions_for_improvement(
+async def suggestions_for_improvement(
     resume_text: str = Body(...),
     job_description: str = Body(...),
     missing: List[str] = Body(default=[]),
@@ -531,7 +658,7 @@ Return ONLY valid JSON:
 }}
 """
 
-    out = safe_invoke_chat(
+    out = await safe_ainvoke_chat(
         messages=[{"role": "user", "content": [{"text": prompt}]}],
         system=[{"text": "Return ONLY valid JSON. No prose. No backticks."}],
         model_id=DEFAULT_CLAUDE,
@@ -562,55 +689,15 @@ def _pick_resume_text(user_text: str, db_text: str) -> str:
     ut = (user_text or "").strip()
     dt = (db_text or "").strip()
     return ut if len(ut) >= len(dt) else dt
-SECTION_HEADERS = {
-    "PROFILE",
-    "PROFESSIONAL EXPERIENCE", "EXPERIENCE",
-    "PROJECTS PORTFOLIO", "PROJECTS",
-    "EDUCATION",
-    "CERTIFICATES",
-    "SKILLS", "TECHNICAL SKILLS",
-    "LANGUAGES",
-}
-
-def _canon(h: str) -> str:
-    return re.sub(r"[^A-Z ]", "", (h or "").upper()).strip()
-
-def _extract_section_block(full_text: str, start_labels: List[str]) -> str:
-    t = (full_text or "").replace("\r", "\n")
-    t = re.sub(r"[ \t]+", " ", t)
-    lines = [ln.strip() for ln in t.splitlines() if ln.strip()]
-
-    heads = []
-    for i, ln in enumerate(lines):
-        up = _canon(ln)
-        if up in SECTION_HEADERS:
-            heads.append((i, up))
-
-    wanted = {_canon(s) for s in start_labels}
-    start_idx = None
-    for i, up in heads:
-        if up in wanted:
-            start_idx = i
-            break
-    if start_idx is None:
-        return ""
-
-    end_idx = len(lines)
-    for i, up in heads:
-        if i > start_idx:
-            end_idx = i
-            break
-
-    block = "\n".join(lines[start_idx + 1:end_idx]).strip()
-    block = re.sub(r"\n{3,}", "\n\n", block)
-    return block
 #helper for serper 
-def _extract_skill_tokens_from_resume(text: str, max_skills: int = 12) -> List[str]:
+def _extract_skill_tokens_from_resume(text: str, max_skills: int = 12,
+                                     sections: Optional[ResumeSections] = None) -> List[str]:
     """
     Very lightweight skill extractor for building a Serper search query.
     Uses the SKILLS / TECHNICAL SKILLS sections if present.
     """
-    skills_block = _extract_section_block(text, ["SKILLS", "TECHNICAL SKILLS"])
+    sections = sections or ResumeSections.build(text)
+    skills_block = sections.block("SKILLS")
     if not skills_block:
         # Fallback with 800 tokens
         skills_block = text[:800]
@@ -733,25 +820,54 @@ RESUME:
 
     return profile
 
+
+@on_indexed
+def _enrich_resume(resume_id: int) -> None:
+    """
+    Background stage after indexing: stores job profile, skill tokens,
+    section blocks and normalized text in resume_artifacts.
+    """
+    db = SessionLocal()
+    try:
+        resume = db.get(Resume, resume_id)
+        if resume is None:
+            return
+        text = resume.text or ""
+        sections = sections_for(resume)
+        art = save_artifacts(
+            db, resume,
+            status="pending",
+            skill_tokens=_extract_skill_tokens_from_resume(text, sections=sections),
+            blocks={k: sections.block(k) for k in sections.keys()},
+            normalized_text=normalize_text(text),
+        )
+        try:
+            profile = _extract_job_profile_from_resume(text)
+        except Exception as e:
+            print(f"[WARN] job profile for resume #{resume_id} failed:", e)
+            save_artifacts(db, resume, status="partial")
+            return
+        save_artifacts(db, resume, job_profile=profile, status="ready")
+        print(f"[OK] Enriched resume #{art.resume_id}")
+    except Exception as e:
+        db.rollback()
+        print(f"[WARN] enrichment for resume #{resume_id} failed:", e)
+    finally:
+        db.close()
+
 # ----draft cv -----
-@router.post("/draft_cv_with_headers")
-def draft_cv_with_headers(
-    request: Request,
-    resume_text: str = Body(""),
-    job_description: str = Body(...),
-    missing: List[str] = Body(default=[]),
-    headers: List[dict] = Body(default=[
-        {"title": "Profile", "context": "(keep it brief)"},
-        {"title": "Professional Experience", "context": ""},
-        {"title": "Education", "context": ""},
-        {"title": "Projects", "context": ""},
-        {"title": "Certificates", "context": ""},
-        {"title": "Skills", "context": ""},
-        {"title": "Languages", "context": ""},
-    ]),
-    language: str = Body("en"),
-    db: Session = Depends(get_db),
-):
+DEFAULT_CV_HEADERS = [
+    {"title": "Profile", "context": "(keep it brief)"},
+    {"title": "Professional Experience", "context": ""},
+    {"title": "Education", "context": ""},
+    {"title": "Projects", "context": ""},
+    {"title": "Certificates", "context": ""},
+    {"title": "Skills", "context": ""},
+    {"title": "Languages", "context": ""},
+]
+
+def _prepare_draft(request, resume_text, job_description, missing, headers, language, db):
+    """Validates inputs, picks the resume text and builds the Claude call. Shared by the plain and SSE routes."""
     if not job_description:
         raise HTTPException(400, "job_description is required.")
     language = (language or "en").lower()
@@ -760,11 +876,12 @@ def draft_cv_with_headers(
     else:
         lang_hint = "Write all CV sections in clear, professional English, suitable for an AUI junior student."
     # ----- choose the longest resume text  -----
-    user = get_user_from_token(request, db)
+    user = get_principal(request, db)
     ui_text = (resume_text or "").strip()
     db_text = ""
     latest = (
         db.query(Resume)
+          .options(joinedload(Resume.artifacts))
           .filter(Resume.user_id == user.id)
           .order_by(Resume.created_at.desc())
           .first()
@@ -777,8 +894,14 @@ def draft_cv_with_headers(
         raise HTTPException(400, "No resume text found. Upload & index a CV, or paste resume_text.")
 
     # ----- anchor key blocks for fallback -----
-    exp_block  = _extract_section_block(use_text, ["PROFESSIONAL EXPERIENCE", "EXPERIENCE"])
-    proj_block = _extract_section_block(use_text, ["PROJECTS PORTFOLIO", "PROJECTS"])
+    # stored artifacts when the DB resume won, otherwise parse the pasted text
+    if db_text and use_text == db_text.strip():
+        exp_block  = resume_block(latest, "EXPERIENCE")
+        proj_block = resume_block(latest, "PROJECTS")
+    else:
+        sections = ResumeSections.build(use_text)
+        exp_block  = sections.block("EXPERIENCE")
+        proj_block = sections.block("PROJECTS")
 
     header_text = "\n".join([f"### {h['title']}: {h.get('context','')}" for h in headers])
 
@@ -827,7 +950,7 @@ Output format — return ONLY valid JSON (no markdown/backticks) with string con
 }}
 """
 
-    out = safe_invoke_chat(
+    chat = dict(
         messages=[{"role":"user","content":[{"text":prompt}]}],
         system=[{"text":"Return ONLY valid JSON. No prose. No backticks."}],
         model_id=DEFAULT_CLAUDE,
@@ -835,7 +958,10 @@ Output format — return ONLY valid JSON (no markdown/backticks) with string con
         max_tokens=1400,
         temperature=0.2,
     )
+    return chat, exp_block, proj_block
+
 
+def _normalize_draft(out: str, exp_block: str, proj_block: str) -> dict:
     cleaned = out.strip().strip("`").replace("json", "", 1).strip()
     try:
         data = json.loads(cleaned)
@@ -878,7 +1004,40 @@ Output format — return ONLY valid JSON (no markdown/backticks) with string con
         if isinstance(data, dict):
             data = {"sections": [{"title": k, "content": str(v)} for k, v in data.items()]}
 
-    return {"ok": True, "draft": data}
+    return data
+
+
+@router.post("/draft_cv_with_headers")
+def draft_cv_with_headers(
+    request: Request,
+    resume_text: str = Body(""),
+    job_description: str = Body(...),
+    missing: List[str] = Body(default=[]),
+    headers: List[dict] = Body(default=DEFAULT_CV_HEADERS),
+    language: str = Body("en"),
+    db: Session = Depends(get_db),
+):
+    chat, exp_block, proj_block = _prepare_draft(request, resume_text, job_description, missing, headers, language, db)
+    out = safe_invoke_chat(**chat)
+    return {"ok": True, "draft": _normalize_draft(out, exp_block, proj_block)}
+
+
+@router.post("/draft_cv_with_headers/stream")
+def draft_cv_with_headers_stream(
+    request: Request,
+    resume_text: str = Body(""),
+    job_description: str = Body(...),
+    missing: List[str] = Body(default=[]),
+    headers: List[dict] = Body(default=DEFAULT_CV_HEADERS),
+    language: str = Body("en"),
+    db: Session = Depends(get_db),
+):
+    """
+    SSE variant: "token" events carry text as Claude writes it,
+    the final "done" event has the same payload as /draft_cv_with_headers.
+    """
+    chat, exp_block, proj_block = _prepare_draft(request, resume_text, job_description, missing, headers, language, db)
+    return _sse_response(chat, lambda out: {"ok": True, "draft": _normalize_draft(out, exp_block, proj_block)})
 #------ CV docs draft build
 def add_horizontal_line(paragraph):
     """Add a horizontal line under a paragraph"""
@@ -1129,7 +1288,7 @@ def cv_docx_download(
     # We’re not touching DB here, just using the token to ensure user is logged in
     # (optional: you can remove this if you want it completely open)
     # from db import get_db  # already imported at top
-    # from auth import get_user_from_token  # already imported at top
+    # from auth import get_principal  # already imported at top
 
     # Just to be safe, we won't crash if contact or sections are missing
     full_name = (payload.get("full_name") or "").strip() or "Your Name"
@@ -1257,6 +1416,7 @@ def interviewer_questions(
     specialization: Optional[str] = Body(None),
     minor: Optional[str] = Body(None),
     language: Optional[str] = Body("en"), 
+    user: Principal = Depends(current_user),
     db: Session = Depends(get_db),
 ):
     """
@@ -1266,7 +1426,6 @@ def interviewer_questions(
       2 intro + up to 5 technical + 1 behavioral (max 8).
     """
     lang_msg = _lang_hint(language) 
-    user = get_user_from_token(request, db)
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
@@ -1431,23 +1590,9 @@ Job Description (JD):
     }
 
 
-@router.post("/interviewer/evaluate")
-def interviewer_evaluate(
-    request: Request,
-    jd_text: str = Body(...),
-    major: Optional[str] = Body(None),
-    specialization: Optional[str] = Body(None),
-    answers: List[Dict[str, Any]] = Body(...),
-    language: Optional[str] = Body("en"),
-    db: Session = Depends(get_db),
-):
-    """
-    Evaluate user's interview answers:
-    - Scores each answer (0–5).
-    - Returns ideal answer and feedback per question.
-    - Computes final score (0–100) on the backend, regardless of what Claude returns.
-    """
-    user = get_user_from_token(request, db)
+def _prepare_interview_eval(request, jd_text, major, specialization, answers, language, db):
+    """Validates inputs and builds the Claude call. Returns (user, trimmed answers, chat kwargs)."""
+    user = get_principal(request, db)
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
@@ -1534,7 +1679,7 @@ Return ONLY valid JSON, no markdown, no backticks, with this structure:
 }}
 """
 
-    raw = safe_invoke_chat(
+    chat = dict(
         messages=[{"role": "user", "content": [{"text": prompt}]}],
         system=[{"text": "Return ONLY valid JSON. No prose. No backticks."},  {"text": _lang_hint(language)}, ],
         model_id=DEFAULT_CLAUDE,
@@ -1542,7 +1687,11 @@ Return ONLY valid JSON, no markdown, no backticks, with this structure:
         max_tokens=900,
         temperature=0.3,
     )
+    return user, answers, chat
+
 
+def _finalize_interview_eval(raw: str, answers: List[Dict[str, Any]], user_id: int, jd_text: str, db) -> dict:
+    """Parses Claude's output, computes the final score, logs the InterviewAttempt."""
     print("\n=========== INTERVIEWER EVAL RAW ===========")
     print(raw)
     print("============================================\n")
@@ -1669,7 +1818,7 @@ Return ONLY valid JSON, no markdown, no backticks, with this structure:
         jd_snippet = (jd_text or "")[:1000]
 
         attempt = InterviewAttempt(
-            user_id=user.id,
+            user_id=user_id,
             job_title=job_title,
             jd_snippet=jd_snippet,
             final_score=final_score,
@@ -1679,8 +1828,11 @@ Return ONLY valid JSON, no markdown, no backticks, with this structure:
             },
         )
         db.add(attempt)
+        db.flush()
+        record_rollup(db, record_interview, user_id, final_score)
         db.commit()
     except Exception as e:
+        db.rollback()
         print("[WARN] Failed to log InterviewAttempt:", e)
 
     return {
@@ -1692,6 +1844,54 @@ Return ONLY valid JSON, no markdown, no backticks, with this structure:
     }
 
 
+@router.post("/interviewer/evaluate")
+def interviewer_evaluate(
+    request: Request,
+    jd_text: str = Body(...),
+    major: Optional[str] = Body(None),
+    specialization: Optional[str] = Body(None),
+    answers: List[Dict[str, Any]] = Body(...),
+    language: Optional[str] = Body("en"),
+    db: Session = Depends(get_db),
+):
+    """
+    Evaluate user's interview answers:
+    - Scores each answer (0–5).
+    - Returns ideal answer and feedback per question.
+    - Computes final score (0–100) on the backend, regardless of what Claude returns.
+    """
+    user, answers, chat = _prepare_interview_eval(request, jd_text, major, specialization, answers, language, db)
+    raw = safe_invoke_chat(**chat)
+    return _finalize_interview_eval(raw, answers, user.id, jd_text, db)
+
+
+@router.post("/interviewer/evaluate/stream")
+def interviewer_evaluate_stream(
+    request: Request,
+    jd_text: str = Body(...),
+    major: Optional[str] = Body(None),
+    specialization: Optional[str] = Body(None),
+    answers: List[Dict[str, Any]] = Body(...),
+    language: Optional[str] = Body("en"),
+    db: Session = Depends(get_db),
+):
+    """
+    SSE variant of /interviewer/evaluate; the "done" event carries the same payload.
+    """
+    user, answers, chat = _prepare_interview_eval(request, jd_text, major, specialization, answers, language, db)
+    user_id = user.id
+
+    def finalize(raw: str) -> dict:
+        # the request session may already be closed while the body streams
+        log_db = SessionLocal()
+        try:
+            return _finalize_interview_eval(raw, answers, user_id, jd_text, log_db)
+        finally:
+            log_db.close()
+
+    return _sse_response(chat, finalize)
+
+
 #job search agent
 @router.post("/job_search_serper")
 def job_search_serper(
@@ -1699,6 +1899,7 @@ def job_search_serper(
     target_role: Optional[str] = Body(None),
     location: str = Body("Morocco"),
     num_results: int = Body(10),
+    user: Principal = Depends(current_user),
     db: Session = Depends(get_db),
 ):
     """
@@ -1710,13 +1911,13 @@ def job_search_serper(
     if not SERPER_API_KEY:
         raise HTTPException(500, "SERPER_API_KEY not configured on the server.")
 
-    user = get_user_from_token(request, db)
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     # --- latest resume text ---
     resume = (
         db.query(Resume)
+        .options(joinedload(Resume.artifacts))
         .filter(Resume.user_id == user.id)
         .order_by(Resume.created_at.desc())
         .first()
@@ -1725,18 +1926,35 @@ def job_search_serper(
         raise HTTPException(400, "No resume found. Upload & match a CV first.")
 
     full_text = resume.text or ""
+    art = fresh_artifacts(resume)
 
-    # --- AI profile from CV ---
+    # --- AI profile from CV (precomputed at index time when available) ---
     profile = {}
     skills = []
-    try:
-        profile = _extract_job_profile_from_resume(full_text)
+    profile_cached = False
+    if art is not None and art.job_profile:
+        profile = dict(art.job_profile)
+        profile_cached = True
         skills = profile.get("skills", []) or []
-    except Exception as e:
-        print("[WARN] _extract_job_profile_from_resume failed:", e)
-        # skills = _extract_skill_tokens_from_resume(full_text, max_skills=10)
+    else:
+        try:
+            profile = _extract_job_profile_from_resume(full_text)
+            profile_cached = served_from_cache()
+            skills = profile.get("skills", []) or []
+        except Exception as e:
+            print("[WARN] _extract_job_profile_from_resume failed:", e)
+            # skills = _extract_skill_tokens_from_resume(full_text, max_skills=10)
+        if profile:
+            try:
+                save_artifacts(db, resume, job_profile=profile)
+            except Exception as e:
+                db.rollback()
+                print("[WARN] saving resume artifacts failed:", e)
     if not skills:
-        skills = _extract_skill_tokens_from_resume(full_text, max_skills=10)
+        if art is not None and art.skill_tokens is not None:
+            skills = art.skill_tokens[:10]
+        else:
+            skills = _extract_skill_tokens_from_resume(full_text, max_skills=10, sections=sections_for(resume))
 
     # keep profil
     if profile is None:
@@ -1831,199 +2049,167 @@ def job_search_serper(
         "resume_id": resume.id,
         "skills_used": skills,
         "profile": profile,  
+        "profile_cached": profile_cached,
         "jobs": jobs[:num_results],
     }
 
 #----------here for history and tarcking past macthes
+# list views: projected columns only (no raw_json / eval_json), resume name
+# joined in the same query, keyset pages on (created_at, id)
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "50"))
+HISTORY_MAX_PAGE_SIZE = 200
+
+
+def _match_rows(db: Session, user_id: int, *extra_cols):
+    return (
+        db.query(MatchAttempt.id, MatchAttempt.job_title, MatchAttempt.score,
+                 MatchAttempt.created_at, Resume.name.label("resume_name"), *extra_cols)
+        .outerjoin(Resume, Resume.id == MatchAttempt.resume_id)
+        .filter(MatchAttempt.user_id == user_id)
+    )
+
+
+def _match_item(r) -> dict:
+    return {
+        "id": r.id,
+        "job_title": r.job_title or "Unnamed job",
+        "score": r.score,
+        "resume_name": r.resume_name,
+        "created_at": r.created_at.isoformat() if r.created_at else None,
+    }
+
+
+def _interview_rows(db: Session, user_id: int, *extra_cols):
+    return (
+        db.query(InterviewAttempt.id, InterviewAttempt.job_title, InterviewAttempt.final_score,
+                 InterviewAttempt.created_at, *extra_cols)
+        .filter(InterviewAttempt.user_id == user_id)
+    )
+
+
+def _interview_item(r) -> dict:
+    return {
+        "id": r.id,
+        "job_title": r.job_title or "Untitled interview",
+        "score": r.final_score,
+        "created_at": r.created_at.isoformat() if r.created_at else None,
+    }
+
+
 @router.get("/match_history/recent")
 def match_history_recent(
-    request: Request,
     limit: int = 5,
+    user: Principal = Depends(current_user),
     db: Session = Depends(get_db),
 ):
-    user = get_user_from_token(request, db)
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    rows = (
-        db.query(MatchAttempt)
-        .filter(MatchAttempt.user_id == user.id)
-        .order_by(MatchAttempt.created_at.desc())
-        .limit(limit)
-        .all()
-    )
-
-    return {
-        "items": [
-            {
-                "id": r.id,
-                "job_title": r.job_title or "Unnamed job",
-                "score": r.score,
-                "resume_name": r.resume.name if r.resume else None,
-                "created_at": r.created_at.isoformat() if r.created_at else None,
-                "raw_json": r.raw_json,
-            }
-            for r in rows
-        ]
-    }
+    rows, _ = keyset_page(_match_rows(db, user.id), MatchAttempt.created_at, MatchAttempt.id,
+                          None, max(1, min(limit, HISTORY_MAX_PAGE_SIZE)))
+    return {"items": [_match_item(r) for r in rows]}
 
 
 @router.get("/match_history")
 def match_history_all(
-    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = HISTORY_PAGE_SIZE,
+    user: Principal = Depends(current_user),
     db: Session = Depends(get_db),
 ):
-    user = get_user_from_token(request, db)
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    rows = (
-        db.query(MatchAttempt)
-        .filter(MatchAttempt.user_id == user.id)
-        .order_by(MatchAttempt.created_at.desc())
-        .all()
-    )
-
-    return {
-        "items": [
-            {
-                "id": r.id,
-                "job_title": r.job_title or "Unnamed job",
-                "score": r.score,
-                "resume_name": r.resume.name if r.resume else None,
-                "created_at": r.created_at.isoformat() if r.created_at else None,
-                "raw_json": r.raw_json,
-            }
-            for r in rows
-        ]
-    }
+    rows, next_cursor = keyset_page(_match_rows(db, user.id), MatchAttempt.created_at, MatchAttempt.id,
+                                    cursor, max(1, min(limit, HISTORY_MAX_PAGE_SIZE)))
+    return {"items": [_match_item(r) for r in rows], "next_cursor": next_cursor}
     # single match by id
 @router.get("/match_history/{match_id}")
 def match_history_one(
-    request: Request,
     match_id: int,
+    user: Principal = Depends(current_user),
     db: Session = Depends(get_db),
 ):
-    user = get_user_from_token(request, db)
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    r = (
-        db.query(MatchAttempt)
-        .filter(MatchAttempt.id == match_id, MatchAttempt.user_id == user.id)
-        .first()
-    )
+    r = _match_rows(db, user.id, MatchAttempt.raw_json).filter(MatchAttempt.id == match_id).first()
     if not r:
         raise HTTPException(status_code=404, detail="Match not found")
 
-    return {
-        "id": r.id,
-        "job_title": r.job_title or "Unnamed job",
-        "score": r.score,
-        "resume_name": r.resume.name if r.resume else None,
-        "created_at": r.created_at.isoformat() if r.created_at else None,
-        "raw_json": r.raw_json,
-    }
+    return {**_match_item(r), "raw_json": r.raw_json}
 # ---------- INTERVIEW HISTORY ---------
 
 @router.get("/interview_history/recent")
 def interview_history_recent(
-    request: Request,
     limit: int = 5,
+    user: Principal = Depends(current_user),
     db: Session = Depends(get_db),
 ):
-    user = get_user_from_token(request, db)
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    rows = (
-        db.query(InterviewAttempt)
-        .filter(InterviewAttempt.user_id == user.id)
-        .order_by(InterviewAttempt.created_at.desc())
-        .limit(limit)
-        .all()
-    )
-
-    return {
-        "items": [
-            {
-                "id": r.id,
-                "job_title": r.job_title or "Untitled interview",
-                "score": r.final_score,
-                "created_at": r.created_at.isoformat() if r.created_at else None,
-            }
-            for r in rows
-        ]
-    }
+    rows, _ = keyset_page(_interview_rows(db, user.id), InterviewAttempt.created_at, InterviewAttempt.id,
+                          None, max(1, min(limit, HISTORY_MAX_PAGE_SIZE)))
+    return {"items": [_interview_item(r) for r in rows]}
 
 
 @router.get("/interview_history")
 def interview_history_all(
-    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = HISTORY_PAGE_SIZE,
+    user: Principal = Depends(current_user),
     db: Session = Depends(get_db),
 ):
-    user = get_user_from_token(request, db)
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    rows = (
-        db.query(InterviewAttempt)
-        .filter(InterviewAttempt.user_id == user.id)
-        .order_by(InterviewAttempt.created_at.desc())
-        .all()
-    )
-
-    return {
-        "items": [
-            {
-                "id": r.id,
-                "job_title": r.job_title or "Untitled interview",
-                "score": r.final_score,
-                "created_at": r.created_at.isoformat() if r.created_at else None,
-            }
-            for r in rows
-        ]
-    }
+    rows, next_cursor = keyset_page(_interview_rows(db, user.id), InterviewAttempt.created_at,
+                                    InterviewAttempt.id, cursor, max(1, min(limit, HISTORY_MAX_PAGE_SIZE)))
+    return {"items": [_interview_item(r) for r in rows], "next_cursor": next_cursor}
 
 
 @router.get("/interview_history/{interview_id}")
 def interview_history_one(
-    request: Request,
     interview_id: int,
+    user: Principal = Depends(current_user),
     db: Session = Depends(get_db),
 ):
-    user = get_user_from_token(request, db)
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     r = (
-        db.query(InterviewAttempt)
-        .filter(InterviewAttempt.id == interview_id, InterviewAttempt.user_id == user.id)
+        _interview_rows(db, user.id, InterviewAttempt.eval_json)
+        .filter(InterviewAttempt.id == interview_id)
         .first()
     )
     if not r:
         raise HTTPException(status_code=404, detail="Interview not found")
 
     return {
-        "id": r.id,
-        "job_title": r.job_title or "Untitled interview",
-        "score": r.final_score,
-        "created_at": r.created_at.isoformat() if r.created_at else None,
+        **_interview_item(r),
         "eval_json": r.eval_json,   # full blob: per_question + final
     }
 
+# ---------- DASHBOARD STATS ---------
+@router.get("/stats")
+def my_stats(
+    user: Principal = Depends(current_user),
+    db: Session = Depends(get_db),
+):
+    """Counts, avg / best / trend of match + interview scores, top missing skills (user_stats rollup)."""
+    return user_stats(db, user.id)
+
 # ---------------- memory clear no duplicate reset etc----------------
 @router.post("/memory_clear")
-def memory_clear(request: Request, db: Session = Depends(get_db)):
-    user = get_user_from_token(request, db)
+def memory_clear(user: Principal = Depends(current_user), db: Session = Depends(get_db)):
     db.query(ResumeChunk).filter(ResumeChunk.resume.has(user_id=user.id)).delete()
     db.query(Resume).filter(Resume.user_id == user.id).delete()
     db.commit()
     return {"ok": True}
 
 @router.get("/memory_list")
-def memory_list(request: Request, db: Session = Depends(get_db)):
-    user = get_user_from_token(request, db)
+def memory_list(user: Principal = Depends(current_user), db: Session = Depends(get_db)):
     resumes = (
         db.query(Resume)
         .filter(Resume.user_id == user.id)
@@ -2031,3 +2217,15 @@ def memory_list(request: Request, db: Session = Depends(get_db)):
         .all()
     )
     return {"resumes": [{"id": r.id, "filename": r.name, "chars": len(r.text or "")} for r in resumes]}
+
+# ---------------- metrics ----------------
+@router.get("/metrics")
+def metrics(_: Principal = Depends(require_admin)):
+    """Internal counters (admins only)."""
+    return {
+        "embedding_cache": embedding_cache_stats(),
+        "chat_cache": chat_cache_stats(),
+        "extraction_cache": extraction_cache_stats(),
+        "coalescing": {"threads": coalescing_stats(), "async": async_coalescing_stats()},
+        "bedrock": guard_states(),
+    }
@@ -1,9 +1,22 @@
 # app.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from ai import router as ai_router
+from async_bedrock_client import close_clients
+from extraction import shutdown_pool
+from jobs import start_workers, stop_workers
 
-app = FastAPI(title="HiringBuddy – AI Only")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_workers()
+    yield
+    stop_workers()
+    await close_clients()
+    shutdown_pool()
+
+app = FastAPI(title="HiringBuddy – AI Only", lifespan=lifespan)
 
 
 app.add_middleware(
@@ -0,0 +1,177 @@
+# async_bedrock_client.py
+# ----------------------------------------------------
+# asyncio counterpart of bedrock_client (aiobotocore):
+# - one pooled client per region, opened lazily, closed on shutdown
+# - BEDROCK_MAX_CONCURRENCY caps in-flight model calls per process
+# - same Converse / messages-v1 payload builders + normalizers
+# Async routes can await Claude without holding a threadpool worker.
+# ----------------------------------------------------
+
+import asyncio
+import json
+import os
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional
+
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+
+from bedrock_client import (
+    DEFAULT_AWS_REGION, DEFAULT_CLAUDE, EMBEDDING_MODEL,
+    _is_anthropic, _to_converse, _to_messages_v1,
+    _normalize_converse, _normalize_messages_v1, _parse_embedding,
+    chat_cache_get, chat_cache_key, chat_cache_put, embed_request_key,
+)
+from singleflight import AsyncSingleFlight
+
+BEDROCK_MAX_CONCURRENCY = int(os.getenv("BEDROCK_MAX_CONCURRENCY", "16"))
+BEDROCK_POOL_CONNECTIONS = int(os.getenv("BEDROCK_POOL_CONNECTIONS", "32"))
+
+_session = get_session()
+_stack: Optional[AsyncExitStack] = None
+_clients: Dict[str, Any] = {}
+_client_lock: Optional[asyncio.Lock] = None
+_sem: Optional[asyncio.Semaphore] = None
+
+_chat_flight = AsyncSingleFlight()
+_embed_flight = AsyncSingleFlight()
+
+
+def _limits():
+    # created on first use so they bind to the running loop
+    global _client_lock, _sem
+    if _client_lock is None:
+        _client_lock = asyncio.Lock()
+        _sem = asyncio.Semaphore(BEDROCK_MAX_CONCURRENCY)
+    return _client_lock, _sem
+
+
+async def _aclient(region: Optional[str]) -> Any:
+    global _stack
+    region = region or DEFAULT_AWS_REGION
+    if region in _clients:
+        return _clients[region]
+    lock, _ = _limits()
+    async with lock:
+        if region not in _clients:
+            if _stack is None:
+                _stack = AsyncExitStack()
+            _clients[region] = await _stack.enter_async_context(
+                _session.create_client(
+                    "bedrock-runtime",
+                    region_name=region,
+                    config=AioConfig(
+                        retries={"max_attempts": 2, "mode": "standard"},
+                        read_timeout=25,
+                        connect_timeout=10,
+                        max_pool_connections=BEDROCK_POOL_CONNECTIONS,
+                    ),
+                )
+            )
+    return _clients[region]
+
+
+async def close_clients() -> None:
+    global _stack
+    if _stack is not None:
+        await _stack.aclose()
+    _stack = None
+    _clients.clear()
+
+
+async def ainvoke_chat(
+    *,
+    messages: List[Dict[str, Any]],
+    system: Optional[List[Dict[str, str]]] = None,
+    model_id: Optional[str] = None,
+    aws_region: Optional[str] = None,
+    max_tokens: int = 500,
+    temperature: float = 0.0,
+    top_p: float = 0.9,
+    use_cache: bool = True,
+) -> str:
+    """
+    Async unified chat:
+      - Anthropic → Converse
+      - Nova → messages-v1
+    Shares the low-temperature response cache with invoke_chat; identical
+    concurrent calls on this loop share one request.
+    """
+    call = dict(messages=messages, system=system, model_id=model_id,
+                max_tokens=max_tokens, temperature=temperature, top_p=top_p)
+    if not use_cache:
+        return await _ainvoke_chat_uncached(aws_region=aws_region, **call)
+    hit = chat_cache_get(**call)
+    if hit is not None:
+        return hit
+    text = await achat_single_flight(lambda: _ainvoke_chat_uncached(aws_region=aws_region, **call), **call)
+    chat_cache_put(text, **call)
+    return text
+
+
+async def achat_single_flight(fn, **kwargs: Any) -> str:
+    """
+    Awaits fn() once for all concurrent callers with the same chat request.
+    Sampled calls (no cache key) each run on their own.
+    """
+    return await _chat_flight.do(chat_cache_key(**kwargs), fn)
+
+
+def coalescing_stats() -> Dict[str, Any]:
+    return {"chat": _chat_flight.stats(), "embed": _embed_flight.stats()}
+
+
+async def _ainvoke_chat_uncached(
+    *,
+    messages: List[Dict[str, Any]],
+    system: Optional[List[Dict[str, str]]] = None,
+    model_id: Optional[str] = None,
+    aws_region: Optional[str] = None,
+    max_tokens: int = 500,
+    temperature: float = 0.0,
+    top_p: float = 0.9,
+) -> str:
+    mdl = model_id or DEFAULT_CLAUDE
+    client = await _aclient(aws_region)
+    _, sem = _limits()
+
+    async with sem:
+        if _is_anthropic(mdl):
+            params = _to_converse(messages, system, max_tokens=max_tokens, temperature=temperature, top_p=top_p)
+            resp = await client.converse(modelId=mdl, **params)
+            return _normalize_converse(resp)
+
+        payload = _to_messages_v1(messages, system, max_tokens=max_tokens, temperature=temperature, top_p=top_p)
+        resp = await client.invoke_model(
+            modelId=mdl,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps(payload),
+        )
+        async with resp["body"] as stream:
+            body = json.loads(await stream.read())
+    return _normalize_messages_v1(body)
+
+
+async def aembed_text(text: str, *, model_id: Optional[str] = None, aws_region: Optional[str] = None) -> List[float]:
+    """
+    Titan v2 embeddings (text), async.
+    """
+    mdl = model_id or EMBEDDING_MODEL
+    return await _embed_flight.do(embed_request_key(text, mdl), lambda: _aembed_text_uncached(text, mdl, aws_region))
+
+
+async def _aembed_text_uncached(text: str, mdl: str, aws_region: Optional[str]) -> List[float]:
+    client = await _aclient(aws_region)
+    _, sem = _limits()
+
+    async with sem:
+        resp = await client.invoke_model(
+            modelId=mdl,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps({"inputText": text}),
+        )
+        async with resp["body"] as stream:
+            data = json.loads(await stream.read())
+    return _parse_embedding(data)
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from db import get_db
+from cache_utils import LRUCache
 from models import User, Role, Profile, Resume, ResumeChunk, Complaint
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
@@ -9,12 +10,21 @@ import bcrypt
 from fastapi import BackgroundTasks
 import os, smtplib
 import re
+import hashlib, itertools, time
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional, Tuple
 from email.message import EmailMessage
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-only")
 ALGORITHM = "HS256"
 
+# token -> Principal cache (per process, re-checked against the users row on
+# every hit); entries never outlive the token's exp
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "4096"))
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "300"))
+
 # -------------------- Schemas --------------------
 class RegisterIn(BaseModel):
     email: EmailStr
@@ -45,27 +55,132 @@ def create_token(data: dict):
     to_encode["exp"] = datetime.utcnow() + timedelta(hours=2)
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def get_user_from_token(request: Request, db: Session):
-    """Helper to extract the user from Authorization header"""
+def _bearer_token(request: Request) -> str:
     auth_header = request.headers.get("authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing or invalid token")
+    return auth_header.split(" ")[1]
 
-    token = auth_header.split(" ")[1]
 
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get("sub")
-        if not email:
+        if not payload.get("sub"):
             raise HTTPException(status_code=401, detail="Invalid token payload")
     except JWTError:
         raise HTTPException(status_code=401, detail="Token verification failed")
+    return payload
+
+
+def get_user_from_token(request: Request, db: Session):
+    """Helper to extract the user from Authorization header (ORM row, for routes that write the user)"""
+    email = _decode_token(_bearer_token(request))["sub"]
 
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     return user
+
+
+# -------------------- Principal cache --------------------
+@dataclass(frozen=True)
+class ProfileInfo:
+    username: Optional[str]
+    dob: Optional[date]
+    major: Optional[str]
+    minor: Optional[str]
+    specialization: Optional[str]
+
+
+@dataclass(frozen=True)
+class Principal:
+    """What routes need about the caller, without holding an ORM row."""
+    id: int
+    email: str
+    role: str
+    profile: Optional[ProfileInfo]
+
+
+# key: sha256(token) -> (Principal, user version before the load, stamp)
+_principals = LRUCache(maxsize=PRINCIPAL_CACHE_SIZE)
+# per email (the token's sub), set by invalidate_principal; older entries are ignored.
+# A record only matters while entries loaded before it can still be cached,
+# so it expires with PRINCIPAL_CACHE_TTL.
+_user_versions = LRUCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+_version_counter = itertools.count(1)
+
+
+def invalidate_principal(email: str) -> None:
+    """Call after committing a change to a user's row, profile or role: its cached tokens reload."""
+    _user_versions.set(email, next(_version_counter))
+
+
+def _user_version(email: str) -> int:
+    return _user_versions.get(email, 0)
+
+
+def _stamp(db: Session, email: str) -> Optional[tuple]:
+    """
+    (id, role_id, password hash) straight from the users table (unique
+    index on email). Checked on every cache hit, so a role change, password
+    change or delete made through any worker applies on the next request.
+    """
+    row = (
+        db.query(User.id, User.role_id, User.hashed_password)
+          .filter(User.email == email)
+          .first()
+    )
+    return tuple(row) if row else None
+
+
+def _load_principal(db: Session, email: str) -> Tuple[Principal, tuple]:
+    # one query: user + profile + role
+    user = (
+        db.query(User)
+          .options(joinedload(User.profile), joinedload(User.role_rel))
+          .filter(User.email == email)
+          .first()
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    prof = user.profile
+    principal = Principal(
+        id=user.id,
+        email=user.email,
+        role=user.role_rel.name if user.role_rel else "user",
+        profile=ProfileInfo(
+            username=prof.username, dob=prof.dob, major=prof.major,
+            minor=prof.minor, specialization=prof.specialization,
+        ) if prof else None,
+    )
+    return principal, (user.id, user.role_id, user.hashed_password)
+
+
+def get_principal(request: Request, db: Session) -> Principal:
+    token = _bearer_token(request)
+    key = hashlib.sha256(token.encode()).hexdigest()
+    hit = _principals.get(key)
+    if hit is not None:
+        principal, version, stamp = hit
+        if version == _user_version(principal.email) and _stamp(db, principal.email) == stamp:
+            return principal
+
+    payload = _decode_token(token)
+    # read before the load: a change committed meanwhile leaves this entry stale-marked
+    version = _user_version(payload["sub"])
+    principal, stamp = _load_principal(db, payload["sub"])
+    ttl = min(PRINCIPAL_CACHE_TTL, float(payload.get("exp", 0)) - time.time())
+    if ttl > 0:
+        _principals.set(key, (principal, version, stamp), ttl=ttl)
+    return principal
+
+
+def current_user(request: Request, db: Session = Depends(get_db)) -> Principal:
+    """Dependency: the authenticated caller (cached per token)."""
+    return get_principal(request, db)
+
+
 RESET_TOKEN_EXPIRE_MINUTES = 30
 FRONTEND_RESET_URL = "http://localhost:5173/reset-password" 
 def validate_password(pwd: str):
@@ -190,9 +305,8 @@ def login(body: LoginIn, db: Session = Depends(get_db)):
 
 
 @router.get("/me")
-def get_me(request: Request, db: Session = Depends(get_db)):
-    user = get_user_from_token(request, db)
-    profile = db.query(Profile).filter(Profile.user_id == user.id).first()
+def get_me(user: Principal = Depends(current_user)):
+    profile = user.profile
 
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
@@ -204,13 +318,16 @@ def get_me(request: Request, db: Session = Depends(get_db)):
         "major": profile.major,
         "minor": profile.minor,
         "specialization": profile.specialization,
-        "role": user.role_rel.name if user.role_rel else "user"
+        "role": user.role
     }
 
 
 @router.put("/update")
-async def update_profile(request: Request, db: Session = Depends(get_db)):
-    user = get_user_from_token(request, db)
+async def update_profile(
+    request: Request,
+    user: Principal = Depends(current_user),
+    db: Session = Depends(get_db),
+):
 
     profile = db.query(Profile).filter(Profile.user_id == user.id).first()
     if not profile:
@@ -224,6 +341,7 @@ async def update_profile(request: Request, db: Session = Depends(get_db)):
 
     db.commit()
     db.refresh(profile)
+    invalidate_principal(user.email)
 
     return {"message": "Profile updated", "profile_id": profile.id}
 
@@ -250,6 +368,7 @@ def change_password(
     user.hashed_password = new_hashed
     db.add(user)
     db.commit()
+    invalidate_principal(user.email)
 
     return {"message": "Password changed successfully"}
 ##delete
@@ -280,8 +399,10 @@ def delete_account(
         synchronize_session=False
     )
 
+    email = user.email
     db.delete(user)
     db.commit()
+    invalidate_principal(email)
     return
 @router.post("/forgot-password")
 def forgot_password(
@@ -336,6 +457,7 @@ def reset_password(body: ResetPasswordIn, db: Session = Depends(get_db)):
     new_hashed = bcrypt.hashpw(body.new_password.encode(), bcrypt.gensalt()).decode()
     user.hashed_password = new_hashed
     db.commit()
+    invalidate_principal(user.email)
 
     return {"message": "Password has been reset successfully"}
 
@@ -1,12 +1,17 @@
 
 
+import hashlib
 import json
 import os
-from typing import Optional, Dict, Any, List
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, Iterator, List
 
 import boto3
 from botocore.config import Config
 
+from cache_utils import LRUCache
+from singleflight import SingleFlight
+
 DEFAULT_AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 DEFAULT_CLAUDE = os.getenv("DEFAULT_CLAUDE", "us.anthropic.claude-3-7-sonnet-20250219-v1:0")
 
@@ -15,6 +20,18 @@ EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "amazon.titan-embed-text-v2:0")
 
 _clients: Dict[str, Any] = {}
 
+# response cache for deterministic prompts (temperature <= CHAT_CACHE_MAX_TEMPERATURE)
+CHAT_CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", "2048"))
+CHAT_CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "86400"))
+CHAT_CACHE_MAX_TEMPERATURE = float(os.getenv("CHAT_CACHE_MAX_TEMPERATURE", "0.1"))
+
+_chat_cache = LRUCache(maxsize=CHAT_CACHE_SIZE, ttl=CHAT_CACHE_TTL)
+_served_from_cache: ContextVar[bool] = ContextVar("served_from_cache", default=False)
+
+# identical calls already in flight are shared instead of re-sent
+_chat_flight = SingleFlight()
+_embed_flight = SingleFlight()
+
 
 def _client(region: Optional[str]) -> Any:
     region = region or DEFAULT_AWS_REGION
@@ -108,6 +125,73 @@ def _normalize_messages_v1(body: Any) -> str:
     return json.dumps(body, ensure_ascii=False)
 
 
+def chat_request_key(
+    *,
+    messages: List[Dict[str, Any]],
+    system: Optional[List[Dict[str, str]]] = None,
+    model_id: Optional[str] = None,
+    max_tokens: int = 500,
+    temperature: float = 0.0,
+    top_p: float = 0.9,
+    **_: Any,
+) -> str:
+    """sha256 of (model, system, messages, inference config)."""
+    blob = json.dumps(
+        {
+            "model": model_id or DEFAULT_CLAUDE,
+            "system": system or [],
+            "messages": messages,
+            "inference": {"maxTokens": max_tokens, "temperature": temperature, "topP": top_p},
+        },
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def chat_cache_key(**kwargs: Any) -> Optional[str]:
+    """Request key if the call is deterministic enough to cache, else None."""
+    if kwargs.get("temperature", 0.0) > CHAT_CACHE_MAX_TEMPERATURE:
+        return None
+    return chat_request_key(**kwargs)
+
+
+def chat_cache_get(**kwargs: Any) -> Optional[str]:
+    key = chat_cache_key(**kwargs)
+    hit = _chat_cache.get(key) if key else None
+    _served_from_cache.set(hit is not None)
+    return hit
+
+
+def chat_cache_put(text: str, **kwargs: Any) -> None:
+    key = chat_cache_key(**kwargs)
+    if key and text:
+        _chat_cache.set(key, text)
+
+
+def served_from_cache() -> bool:
+    """True if the last chat call in this thread / task was answered from the response cache."""
+    return _served_from_cache.get()
+
+
+def chat_cache_stats() -> Dict[str, Any]:
+    out = _chat_cache.stats()
+    out["ttl_seconds"] = CHAT_CACHE_TTL
+    out["max_temperature"] = CHAT_CACHE_MAX_TEMPERATURE
+    return out
+
+
+def chat_single_flight(fn, **kwargs: Any) -> str:
+    """
+    Runs fn() once for all concurrent callers with the same chat request.
+    Sampled calls (no cache key) each run on their own.
+    """
+    return _chat_flight.do(chat_cache_key(**kwargs), fn)
+
+
+def coalescing_stats() -> Dict[str, Any]:
+    return {"chat": _chat_flight.stats(), "embed": _embed_flight.stats()}
+
+
 def invoke_chat(
     *,
     messages: List[Dict[str, Any]],
@@ -117,12 +201,38 @@ def invoke_chat(
     max_tokens: int = 500,
     temperature: float = 0.0,
     top_p: float = 0.9,
+    use_cache: bool = True,
 ) -> str:
     """
     Unified chat:
       - Anthropic → Converse
       - Nova → messages-v1
+    Low-temperature calls are served from / stored in the response cache and
+    identical concurrent calls share one request. use_cache=False is the plain
+    upstream call (safe_invoke_chat does both around its retry loop).
     """
+    call = dict(messages=messages, system=system, model_id=model_id,
+                max_tokens=max_tokens, temperature=temperature, top_p=top_p)
+    if not use_cache:
+        return _invoke_chat_uncached(aws_region=aws_region, **call)
+    hit = chat_cache_get(**call)
+    if hit is not None:
+        return hit
+    text = chat_single_flight(lambda: _invoke_chat_uncached(aws_region=aws_region, **call), **call)
+    chat_cache_put(text, **call)
+    return text
+
+
+def _invoke_chat_uncached(
+    *,
+    messages: List[Dict[str, Any]],
+    system: Optional[List[Dict[str, str]]] = None,
+    model_id: Optional[str] = None,
+    aws_region: Optional[str] = None,
+    max_tokens: int = 500,
+    temperature: float = 0.0,
+    top_p: float = 0.9,
+) -> str:
     mdl = model_id or DEFAULT_CLAUDE
     client = _client(aws_region)
 
@@ -142,11 +252,64 @@ def invoke_chat(
     return _normalize_messages_v1(body)
 
 
+def stream_chat(
+    *,
+    messages: List[Dict[str, Any]],
+    system: Optional[List[Dict[str, str]]] = None,
+    model_id: Optional[str] = None,
+    aws_region: Optional[str] = None,
+    max_tokens: int = 500,
+    temperature: float = 0.0,
+    top_p: float = 0.9,
+) -> Iterator[str]:
+    """
+    Streaming chat, yields text deltas as they arrive:
+      - Anthropic → converse_stream
+      - Nova → invoke_model_with_response_stream (messages-v1)
+    """
+    mdl = model_id or DEFAULT_CLAUDE
+    client = _client(aws_region)
+
+    if _is_anthropic(mdl):
+        params = _to_converse(messages, system, max_tokens=max_tokens, temperature=temperature, top_p=top_p)
+        resp = client.converse_stream(modelId=mdl, **params)
+        for event in resp["stream"]:
+            text = event.get("contentBlockDelta", {}).get("delta", {}).get("text")
+            if text:
+                yield text
+        return
+
+    payload = _to_messages_v1(messages, system, max_tokens=max_tokens, temperature=temperature, top_p=top_p)
+    resp = client.invoke_model_with_response_stream(
+        modelId=mdl,
+        contentType="application/json",
+        accept="application/json",
+        body=json.dumps(payload),
+    )
+    for event in resp["body"]:
+        chunk = event.get("chunk")
+        if not chunk:
+            continue
+        data = json.loads(chunk["bytes"])
+        text = data.get("contentBlockDelta", {}).get("delta", {}).get("text")
+        if text:
+            yield text
+
+
 def embed_text(text: str, *, model_id: Optional[str] = None, aws_region: Optional[str] = None) -> List[float]:
     """
     Titan v2 embeddings (text) — returns a vector list.
+    Concurrent calls for the same (model, text) share one request.
     """
     mdl = model_id or EMBEDDING_MODEL
+    return _embed_flight.do(embed_request_key(text, mdl), lambda: _embed_text_uncached(text, mdl, aws_region))
+
+
+def embed_request_key(text: str, model_id: str) -> tuple:
+    return model_id, hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _embed_text_uncached(text: str, mdl: str, aws_region: Optional[str]) -> List[float]:
     client = _client(aws_region)
     resp = client.invoke_model(
         modelId=mdl,
@@ -155,7 +318,10 @@ def embed_text(text: str, *, model_id: Optional[str] = None, aws_region: Optiona
         body=json.dumps({"inputText": text}),
     )
     data = json.loads(resp["body"].read())
+    return _parse_embedding(data)
+
 
+def _parse_embedding(data: Dict[str, Any]) -> List[float]:
     if "embedding" in data and isinstance(data["embedding"], dict) and "values" in data["embedding"]:
         return data["embedding"]["values"]
     if "embedding" in data and isinstance(data["embedding"], list):
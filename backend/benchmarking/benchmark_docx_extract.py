@@ -0,0 +1,117 @@
+"""
+Benchmark: python-docx Document graph vs iterparse fast path for DOCX CVs
+------------------------------------------------------------------------
+- python_docx: the previous extractor (Document(...) then join p.text).
+- fast_iterparse: docx_fast.docx_text_fast (word/document.xml, streamed).
+For every file: best-of-N wall time, tracemalloc peak, and characters
+extracted (the fast path also reads tables and text boxes, so it can
+return more text than python-docx on the same file).
+
+Run from the repo root:
+    python -m backend.benchmarking.benchmark_docx_extract --dir path/to/cvs
+Without --dir it generates --synthetic CV-like documents (tables included)
+so the script can be smoke-tested; real numbers need a real corpus.
+Output: backend/benchmarking/benchmark_docx_extract.csv
+"""
+
+import argparse, csv, io, random, statistics, time, tracemalloc
+from pathlib import Path
+
+from docx import Document
+
+from ..docx_fast import docx_text_fast, docx_text_python_docx
+
+BASE_DIR = Path(__file__).resolve().parent
+
+WORDS = ("python sql docker kubernetes react django fastapi aws azure pandas numpy "
+         "led designed built migrated deployed automated reduced improved team project "
+         "intern engineer analyst data pipeline api dashboard testing agile scrum").split()
+
+
+def synthetic_cv(rng: random.Random) -> bytes:
+    doc = Document()
+    doc.add_heading("Candidate %d" % rng.randint(1, 10_000), 0)
+    for section in ("Profile", "Professional Experience", "Education", "Projects", "Skills"):
+        doc.add_heading(section, 1)
+        for _ in range(rng.randint(3, 12)):
+            doc.add_paragraph(" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))), style="List Bullet")
+    table = doc.add_table(rows=6, cols=3)
+    for row in table.rows:
+        for cell in row.cells:
+            cell.text = " ".join(rng.choice(WORDS) for _ in range(3))
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def peak_kb(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dir", default="", help="directory of .docx CVs (searched recursively)")
+    ap.add_argument("--synthetic", type=int, default=20, help="number of generated CVs when --dir is not given")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    if args.dir:
+        corpus = [(p.name, p.read_bytes()) for p in sorted(Path(args.dir).rglob("*.docx"))]
+        source = "dir"
+    else:
+        rng = random.Random(7)
+        corpus = [(f"synthetic_{i:03d}.docx", synthetic_cv(rng)) for i in range(args.synthetic)]
+        source = "synthetic"
+    if not corpus:
+        raise SystemExit("no .docx files found")
+
+    rows = []
+    for name, raw in corpus:
+        try:
+            old_chars = len(docx_text_python_docx(raw))
+        except Exception as e:
+            print(f"skip {name}: python-docx failed ({e})")
+            continue
+        row = {
+            "file": name,
+            "corpus": source,
+            "kb": round(len(raw) / 1024, 1),
+            "python_docx_ms": round(best_of(lambda: docx_text_python_docx(raw), args.repeat) * 1000, 3),
+            "fast_ms": round(best_of(lambda: docx_text_fast(raw), args.repeat) * 1000, 3),
+            "python_docx_peak_kb": round(peak_kb(lambda: docx_text_python_docx(raw)), 1),
+            "fast_peak_kb": round(peak_kb(lambda: docx_text_fast(raw)), 1),
+            "python_docx_chars": old_chars,
+            "fast_chars": len(docx_text_fast(raw)),
+        }
+        rows.append(row)
+        print(f"{name:<32} | python-docx {row['python_docx_ms']:>8.2f} ms {row['python_docx_peak_kb']:>9.1f} KB"
+              f" | fast {row['fast_ms']:>7.2f} ms {row['fast_peak_kb']:>8.1f} KB"
+              f" | chars {row['python_docx_chars']} -> {row['fast_chars']}")
+
+    med = lambda k: statistics.median(r[k] for r in rows)
+    print(f"\nmedian over {len(rows)} files: time x{med('python_docx_ms') / med('fast_ms'):.1f} faster,"
+          f" peak memory x{med('python_docx_peak_kb') / med('fast_peak_kb'):.1f} lower")
+
+    out_path = BASE_DIR / "benchmark_docx_extract.csv"
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader(); writer.writerows(rows)
+    print(f"\n Saved {out_path.name}\n")
+
+
+if __name__ == "__main__":
+    main()
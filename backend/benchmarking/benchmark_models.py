@@ -8,7 +8,7 @@ Benchmark: Claude (plain) vs Claude+Titan (improved) vs Nova Micro (no Titan)
 Output: backend/benchmarking/benchmark_final.csv
 """
 
-import os, json, re, math, time, csv
+import os, json, re, time, csv
 from pathlib import Path
 from statistics import mean
 from docx import Document
@@ -17,6 +17,8 @@ from ..bedrock_client import (
     invoke_chat, embed_text, _client,
     DEFAULT_AWS_REGION, DEFAULT_CLAUDE
 )
+from ..vector_scoring import ChunkMatrix, cos_sim
+from ..chunking import token_aware_chunks
 
 # ---------------- Paths & Ground Truth ----------------
 BASE_DIR = Path(__file__).resolve().parent
@@ -45,31 +47,8 @@ def load_text(p: Path) -> str:
         return "\n".join(par.text for par in Document(p).paragraphs)
     return p.read_text(encoding="utf-8", errors="ignore")
 
-def token_aware_chunks(text: str, max_tokens: int = 700, overlap: int = 80):
-    # same as ai.py
-    text = re.sub(r"\s+", " ", text).strip()
-    sentences = re.split(r"(?<=[.!?])\s+", text)
-    chunks, cur, cur_tokens = [], [], 0
-    est = lambda s: max(1, int(len(s.split()) / 0.75))
-    i = 0
-    while i < len(sentences):
-        s = sentences[i]; t = est(s)
-        if cur_tokens + t <= max_tokens or not cur:
-            cur.append(s); cur_tokens += t; i += 1
-        else:
-            chunks.append(" ".join(cur))
-            prefix, tok = [], 0
-            for s_back in reversed(cur):
-                tok += est(s_back); prefix.append(s_back)
-                if tok >= overlap: break
-            cur = list(reversed(prefix))
-            cur_tokens = sum(est(x) for x in cur)
-    if cur: chunks.append(" ".join(cur))
-    return chunks
-
 def cos(a, b):
-    dot = sum(x*y for x,y in zip(a,b))
-    return dot/(math.sqrt(sum(x*x for x in a))*math.sqrt(sum(y*y for y in b)) or 1)
+    return cos_sim(a, b)
 
 def f1_metrics(true, pred):
     true_set = set(x.lower() for x in true)
@@ -179,10 +158,10 @@ results.append(row)
 print("Computing Titan retrieval (ai.py style)…")
 cv_chunks = token_aware_chunks(cv_text)  # same defaults as ai.py
 jd_emb = embed_text(jd_text, aws_region=DEFAULT_AWS_REGION)
-scored = [(cos(jd_emb, embed_text(c, aws_region=DEFAULT_AWS_REGION)), c) for c in cv_chunks]
-scored.sort(reverse=True, key=lambda t: t[0])
+cv_matrix = ChunkMatrix([embed_text(c, aws_region=DEFAULT_AWS_REGION) for c in cv_chunks])
 
 TOP_K = 5  # larger k for short CVs -> keeps recall
+scored = [(s, cv_chunks[i]) for i, s in cv_matrix.top_k(jd_emb, TOP_K)]
 top_snips = [t[1] for t in scored[:TOP_K]]
 semantic_context = "\n".join(top_snips)
 avg_sim = round(mean(s for s,_ in scored[:TOP_K]), 3) if scored[:TOP_K] else 0.0
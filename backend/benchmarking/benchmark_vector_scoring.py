@@ -0,0 +1,96 @@
+"""
+Microbenchmark: per-chunk Python cosine vs NumPy ChunkMatrix
+------------------------------------------------------------
+- python_loop: the old ai.cos_sim called once per chunk, then a full sort.
+- numpy_matvec: one float32 mat-vec against the stacked chunks + argpartition top-k.
+  Matrix build time is reported apart since it is paid once per resume, not per query.
+
+Run from the repo root:  python -m backend.benchmarking.benchmark_vector_scoring
+Output: backend/benchmarking/benchmark_vector_scoring.csv
+"""
+
+import argparse, csv, math, random, time
+from pathlib import Path
+
+import numpy as np
+
+from ..vector_scoring import ChunkMatrix
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def old_cos_sim(a, b):
+    # verbatim copy of the previous ai.cos_sim
+    if not a or not b or len(a) != len(b):
+        return 0.0
+    dot = sum(x*y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x*x for x in a))
+    norm_b = math.sqrt(sum(x*x for x in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def python_top_k(q, vecs, k):
+    scored = [(old_cos_sim(q, v), i) for i, v in enumerate(vecs)]
+    scored.sort(reverse=True)
+    return scored[:k]
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="1000,10000,100000")
+    ap.add_argument("--dim", type=int, default=1024)
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--python-cap", type=int, default=10000,
+                    help="time the Python loop on at most this many chunks and scale linearly (0 = no cap)")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(7)
+    rows = []
+    for n in [int(x) for x in args.sizes.split(",")]:
+        data = rng.standard_normal((n, args.dim), dtype=np.float32)
+        q = rng.standard_normal(args.dim, dtype=np.float32)
+
+        t0 = time.perf_counter()
+        cm = ChunkMatrix(data)
+        build = time.perf_counter() - t0
+        fast = best_of(lambda: cm.top_k(q, args.k), repeat=5)
+
+        cap = n if not args.python_cap else min(n, args.python_cap)
+        sample = data[:cap].tolist()
+        ql = q.tolist()
+        slow = best_of(lambda: python_top_k(ql, sample, args.k), repeat=1) * (n / cap)
+
+        row = {
+            "chunks": n,
+            "dim": args.dim,
+            "python_loop_s": round(slow, 4),
+            "numpy_matvec_s": round(fast, 6),
+            "matrix_build_s": round(build, 4),
+            "speedup": round(slow / fast, 1) if fast else None,
+            "python_extrapolated": cap < n,
+        }
+        rows.append(row)
+        print(f"{n:>7} chunks | python {row['python_loop_s']:>9.4f}s"
+              f"{' (scaled)' if cap < n else '         '} | numpy {row['numpy_matvec_s']:.6f}s"
+              f" | build {row['matrix_build_s']:.4f}s | x{row['speedup']}")
+
+    out_path = BASE_DIR / "benchmark_vector_scoring.csv"
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader(); writer.writerows(rows)
+    print(f"\n Saved {out_path.name}\n")
+
+
+if __name__ == "__main__":
+    main()
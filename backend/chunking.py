@@ -0,0 +1,72 @@
+# chunking.py
+# ----------------------------------------------------
+# Sentence-based, token-aware chunking with overlap (shared by
+# ai.py, in_memory_store.py and the benchmarks).
+# - per-sentence token estimates are computed once, window sums come
+#   from prefix sums and the overlap start from a bisect -> linear time
+# - default estimate is words / 0.75; any tokenizer can be plugged in
+# - iter_chunks() yields chunks lazily, token_aware_chunks() is the list
+# ----------------------------------------------------
+
+import re
+from bisect import bisect_right
+from typing import Callable, Iterator, List, Optional
+
+_WS = re.compile(r"\s+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+Estimator = Callable[[str], int]
+
+
+def est_tokens(s: str) -> int:
+    return max(1, int(len(s.split()) / 0.75))
+
+
+def tokenizer_estimator(encoding: str = "cl100k_base") -> Estimator:
+    """Exact counts from a tiktoken encoding (optional dependency)."""
+    try:
+        import tiktoken
+    except ImportError as e:
+        raise ImportError("tokenizer_estimator needs `pip install tiktoken`") from e
+    enc = tiktoken.get_encoding(encoding)
+    return lambda s: max(1, len(enc.encode(s)))
+
+
+def iter_chunks(text: str, max_tokens: int = 700, overlap: int = 80,
+                estimator: Optional[Estimator] = None) -> Iterator[str]:
+    est = estimator or est_tokens
+    text = _WS.sub(" ", text or "").strip()
+    sentences = _SENTENCE_END.split(text)
+
+    # prefix[k] = tokens in sentences[:k]; the window is sentences[start:i]
+    prefix = [0]
+    for s in sentences:
+        prefix.append(prefix[-1] + est(s))
+
+    start, i, n = 0, 0, len(sentences)
+    while i < n:
+        t = prefix[i + 1] - prefix[i]
+        if prefix[i] - prefix[start] + t <= max_tokens or start == i:
+            i += 1
+            continue
+
+        chunk = " ".join(sentences[start:i]).strip()
+        if chunk:
+            yield chunk
+        # overlap = shortest tail of the window holding >= `overlap` tokens
+        back = bisect_right(prefix, prefix[i] - overlap) - 1
+        back = min(max(back, start), i - 1)
+        # tail + next sentence still too big: start fresh instead of
+        # emitting the same window forever
+        if prefix[i] - prefix[back] + t > max_tokens:
+            back = i
+        start = back
+
+    last = " ".join(sentences[start:]).strip()
+    if last:
+        yield last
+
+
+def token_aware_chunks(text: str, max_tokens: int = 700, overlap: int = 80,
+                       estimator: Optional[Estimator] = None) -> List[str]:
+    return list(iter_chunks(text, max_tokens=max_tokens, overlap=overlap, estimator=estimator))
@@ -9,13 +9,12 @@
 import os
 import json
 from crewai import Agent, Task, Crew, LLM
-from docx import Document
+from docx_fast import docx_text
 
 AGENT_MODEL = os.getenv("CREW_AGENT_MODEL", "eu.anthropic.claude-3-7-sonnet-20250219-v1:0")
 
 def read_docx(path: str) -> str:
-    doc = Document(path)
-    return "\n".join(p.text for p in doc.paragraphs)
+    return docx_text(path)
 
 def read_text(path: str) -> str:
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
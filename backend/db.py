@@ -16,7 +16,7 @@
 # db.py (new)
 # db.py
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 POSTGRES_URL = os.getenv(
@@ -33,6 +33,11 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
 
+def init_extensions():
+    # pgvector must exist before create_all builds the vector columns / HNSW index
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+
 def get_db():
     db = SessionLocal()
     try:
@@ -0,0 +1,91 @@
+# docx_fast.py
+# ----------------------------------------------------
+# Lightweight DOCX -> text: stream-parses word/document.xml with
+# iterparse instead of building the python-docx object graph.
+# - one line per paragraph, same run text rules as python-docx
+#   (w:t, tab / ptab -> \t, line break / cr -> \n, noBreakHyphen -> -)
+# - also picks up table cells and text boxes (python-docx only
+#   returns top-level body paragraphs)
+# - mc:Fallback is skipped: it repeats the text box content of mc:Choice
+# Falls back to python-docx if the package can't be read this way.
+# ----------------------------------------------------
+
+import io
+import zipfile
+from typing import List, Union
+from xml.etree.ElementTree import iterparse
+
+from docx import Document
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+_P, _R = W + "p", W + "r"
+_T, _TAB, _PTAB, _BR, _CR, _NBH = W + "t", W + "tab", W + "ptab", W + "br", W + "cr", W + "noBreakHyphen"
+_BR_TYPE = W + "type"
+
+Source = Union[bytes, str]  # raw bytes or path to the file
+
+
+def _open(src: Source):
+    return src if isinstance(src, str) else io.BytesIO(src)
+
+
+def docx_text_fast(src: Source) -> str:
+    lines: List[str] = []
+    paras: List[List[str]] = []   # one text buffer per open w:p (text boxes nest them)
+    stack: List[str] = []         # open element tags
+    in_fallback = 0
+
+    with zipfile.ZipFile(_open(src)) as zf:
+        with zf.open("word/document.xml") as xml:
+            for event, el in iterparse(xml, events=("start", "end")):
+                tag = el.tag
+                if event == "start":
+                    stack.append(tag)
+                    if tag == MC_FALLBACK:
+                        in_fallback += 1
+                    elif tag == _P and not in_fallback:
+                        paras.append([])
+                    continue
+
+                stack.pop()
+                if tag == MC_FALLBACK:
+                    in_fallback -= 1
+                elif in_fallback:
+                    pass
+                elif tag == _P:
+                    lines.append("".join(paras.pop()))
+                    if not paras:
+                        el.clear()  # done with this body-level paragraph
+                elif paras and stack and stack[-1] == _R:
+                    # run content only (w:tab also appears in paragraph tab stops)
+                    buf = paras[-1]
+                    if tag == _T:
+                        buf.append(el.text or "")
+                    elif tag == _TAB or tag == _PTAB:
+                        buf.append("\t")
+                    elif tag == _CR:
+                        buf.append("\n")
+                    elif tag == _BR:
+                        if el.get(_BR_TYPE, "textWrapping") == "textWrapping":
+                            buf.append("\n")
+                    elif tag == _NBH:
+                        buf.append("-")
+                elif not paras and tag == W + "tbl":
+                    el.clear()
+
+    return "\n".join(lines)
+
+
+def docx_text_python_docx(src: Source) -> str:
+    doc = Document(_open(src))
+    return "\n".join(p.text for p in doc.paragraphs)
+
+
+def docx_text(src: Source) -> str:
+    try:
+        return docx_text_fast(src)
+    except Exception as e:
+        print("[WARN] fast DOCX extraction failed, falling back to python-docx:", e)
+        return docx_text_python_docx(src)
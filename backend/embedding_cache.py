@@ -0,0 +1,119 @@
+# embedding_cache.py
+# ----------------------------------------------------
+# Content-addressed cache in front of bedrock_client.embed_text
+#   key = (model_id, sha256(normalized text))
+#   tier 1: bounded in-process LRU
+#   tier 2: Postgres table embedding_cache (shared by all workers)
+# Re-uploading the same CV or retrying the same JD no longer hits Titan.
+# ----------------------------------------------------
+
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from bedrock_client import embed_text, EMBEDDING_MODEL
+from cache_utils import LRUCache
+from db import SessionLocal
+from models import EmbeddingCacheEntry
+
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "4096"))
+EMBED_CACHE_DB = os.getenv("EMBED_CACHE_DB", "1") == "1"
+
+_WS = re.compile(r"\s+")
+
+_memory = LRUCache(maxsize=EMBED_CACHE_SIZE)
+_lock = threading.Lock()
+_counters: Dict[str, int] = {"memory_hits": 0, "db_hits": 0, "misses": 0, "db_errors": 0}
+
+
+def _bump(name: str) -> None:
+    with _lock:
+        _counters[name] += 1
+
+
+def normalize_text(text: str) -> str:
+    return _WS.sub(" ", text or "").strip()
+
+
+def cache_key(text: str, model_id: Optional[str] = None) -> Tuple[str, str]:
+    mdl = model_id or EMBEDDING_MODEL
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return mdl, digest
+
+
+def _db_get(key: Tuple[str, str]) -> Optional[List[float]]:
+    if not EMBED_CACHE_DB:
+        return None
+    db = SessionLocal()
+    try:
+        row = db.get(EmbeddingCacheEntry, key)
+        if row is None or row.embedding is None:
+            return None
+        return [float(x) for x in row.embedding]
+    except Exception as e:
+        _bump("db_errors")
+        print("[WARN] embedding cache read failed:", e)
+        return None
+    finally:
+        db.close()
+
+
+def _db_put(key: Tuple[str, str], vec: List[float]) -> None:
+    if not EMBED_CACHE_DB:
+        return
+    db = SessionLocal()
+    try:
+        stmt = (
+            pg_insert(EmbeddingCacheEntry)
+            .values(model_id=key[0], text_sha256=key[1], embedding=vec)
+            .on_conflict_do_nothing(index_elements=["model_id", "text_sha256"])
+        )
+        db.execute(stmt)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        _bump("db_errors")
+        print("[WARN] embedding cache write failed:", e)
+    finally:
+        db.close()
+
+
+def cached_embed_text(text: str, *, model_id: Optional[str] = None,
+                      aws_region: Optional[str] = None) -> List[float]:
+    """
+    Drop-in for embed_text. The normalized text is what gets embedded,
+    so a cached vector is always the one its key describes.
+    """
+    key = cache_key(text, model_id)
+
+    vec = _memory.get(key)
+    if vec is not None:
+        _bump("memory_hits")
+        return vec
+
+    vec = _db_get(key)
+    if vec is not None:
+        _bump("db_hits")
+        _memory.set(key, vec)
+        return vec
+
+    _bump("misses")
+    vec = embed_text(normalize_text(text), model_id=key[0], aws_region=aws_region)
+    if vec:
+        _memory.set(key, vec)
+        _db_put(key, vec)
+    return vec
+
+
+def stats() -> Dict[str, object]:
+    with _lock:
+        out: Dict[str, object] = dict(_counters)
+    lookups = out["memory_hits"] + out["db_hits"] + out["misses"]
+    out["hit_rate"] = round((out["memory_hits"] + out["db_hits"]) / lookups, 4) if lookups else 0.0
+    out["memory"] = _memory.stats()
+    out["db_tier"] = EMBED_CACHE_DB
+    return out
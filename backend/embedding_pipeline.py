@@ -0,0 +1,45 @@
+# embedding_pipeline.py
+# ----------------------------------------------------
+# Concurrent chunk embedding for resume indexing:
+# - bounded worker pool (EMBED_WORKERS) shared by all requests
+# - results come back in chunk order
+# - a failed chunk gives None instead of failing the whole resume
+# ----------------------------------------------------
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from bedrock_client import DEFAULT_AWS_REGION
+from embedding_cache import cached_embed_text
+from models import EMBEDDING_DIM
+
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "8"))
+
+_POOL = ThreadPoolExecutor(max_workers=EMBED_WORKERS, thread_name_prefix="embed")
+
+
+def _embed_one(text: str, region: str) -> Optional[List[float]]:
+    try:
+        emb = cached_embed_text(text, aws_region=region)
+        if not emb or not isinstance(emb, list):
+            raise ValueError("Empty embedding response")
+        if len(emb) != EMBEDDING_DIM:
+            raise ValueError(f"Expected {EMBEDDING_DIM} dims, got {len(emb)}")
+        return emb
+    except Exception as e:
+        print(f"[WARN] Embedding failed for chunk: {text[:60]!r} ({e})")
+        return None
+
+
+def embed_chunks(chunks: List[str], region: str = DEFAULT_AWS_REGION) -> List[Optional[List[float]]]:
+    """Blocking version, for worker threads / scripts."""
+    return list(_POOL.map(lambda c: _embed_one(c, region), chunks))
+
+
+async def embed_chunks_async(chunks: List[str], region: str = DEFAULT_AWS_REGION) -> List[Optional[List[float]]]:
+    """Runs the Titan calls on the pool so the event loop stays free; gather keeps order."""
+    loop = asyncio.get_running_loop()
+    futs = [loop.run_in_executor(_POOL, _embed_one, c, region) for c in chunks]
+    return list(await asyncio.gather(*futs))
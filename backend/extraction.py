@@ -0,0 +1,205 @@
+# extraction.py
+# ----------------------------------------------------
+# Resume text extraction (PDF / DOCX / TXT) off the event loop:
+# - CPU-bound parsing runs in a shared ProcessPoolExecutor
+# - long PDFs are split into page ranges parsed in parallel
+# - per-job timeout, enforced inside the worker once the job starts
+#   (time spent queued doesn't count, other jobs are never touched) +
+#   caps on upload size and page count
+# Extractors take the raw bytes or a file path.
+# The plain sync extractors stay usable from scripts / threads.
+# ----------------------------------------------------
+
+import asyncio
+import io
+import os
+import re
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple, Union
+
+import pdfplumber
+from fastapi import HTTPException
+from PyPDF2 import PdfReader
+
+from docx_fast import docx_text
+
+# bump whenever extractor output changes, so cached text gets re-extracted
+EXTRACTOR_VERSION = "2"
+
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXTRACT_TIMEOUT = float(os.getenv("EXTRACT_TIMEOUT", "30"))
+EXTRACT_MAX_BYTES = int(os.getenv("EXTRACT_MAX_BYTES", str(10 * 1024 * 1024)))
+EXTRACT_MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "50"))
+PDF_PAGES_PER_JOB = int(os.getenv("PDF_PAGES_PER_JOB", "8"))
+
+_SPACES = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+# without SIGALRM (Windows) the timeout falls back to wait_for in the event loop
+_HAS_ALARM = hasattr(signal, "setitimer")
+
+Source = Union[bytes, str]  # raw bytes or path to the file
+
+
+def _cleanup(txt: str) -> str:
+    txt = _SPACES.sub(" ", txt)
+    txt = _BLANK_LINES.sub("\n\n", txt)
+    return txt.strip()
+
+
+def _open(src: Source):
+    return src if isinstance(src, str) else io.BytesIO(src)
+
+
+def source_size(src: Source) -> int:
+    return os.path.getsize(src) if isinstance(src, str) else len(src)
+
+
+# ---------------- sync extractors (run inside the pool) ----------------
+def extract_docx_text(b: Source) -> str:
+    return docx_text(b)
+
+
+def pdf_page_count(b: Source) -> int:
+    return len(PdfReader(_open(b)).pages)
+
+
+def pdf_pages_text(b: Source, start: int = 0, end: Optional[int] = None) -> List[str]:
+    """pdfplumber text of pages [start, end)."""
+    with pdfplumber.open(_open(b)) as pdf:
+        return [(page.extract_text() or "") for page in pdf.pages[start:end]]
+
+
+def pdf_text_pypdf2(b: Source) -> str:
+    reader = PdfReader(_open(b))
+    return _cleanup("\n".join((p.extract_text() or "") for p in reader.pages))
+
+
+def read_text_file(b: Source) -> str:
+    if isinstance(b, str):
+        with open(b, "rb") as f:
+            b = f.read()
+    return b.decode("utf-8", errors="ignore")
+
+
+def extract_pdf_text(b: Source) -> str:
+    """
+    try pdfplumber first, PyPDF2 as fallback
+    """
+    try:
+        txt = _cleanup("\n".join(pdf_pages_text(b)))
+        if txt:
+            return txt
+    except Exception as e:
+        print("[WARN] pdfplumber failed, falling back to PyPDF2:", e)
+    return pdf_text_pypdf2(b)
+
+
+# ---------------- process pool ----------------
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+
+
+def _reset_pool(pool: ProcessPoolExecutor) -> None:
+    """A worker died (crash, OOM kill): drop the broken pool, _get_pool() starts a fresh one."""
+    global _pool
+    if _pool is pool:
+        _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ExtractTimeout(BaseException):
+    """
+    Raised inside a worker when its job runs past EXTRACT_TIMEOUT.
+    A BaseException, so the extractors' `except Exception` fallbacks
+    don't swallow it.
+    """
+
+
+def _on_alarm(signum, frame):
+    raise ExtractTimeout()
+
+
+def _with_deadline(timeout: float, fn, *args):
+    """Runs fn(*args) in the worker with a SIGALRM deadline that starts now, not when it was queued."""
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+async def _run(fn, *args):
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    try:
+        if _HAS_ALARM:
+            return await loop.run_in_executor(pool, _with_deadline, EXTRACT_TIMEOUT, fn, *args)
+        return await asyncio.wait_for(loop.run_in_executor(pool, fn, *args), EXTRACT_TIMEOUT)
+    except (ExtractTimeout, asyncio.TimeoutError):
+        print(f"[WARN] {fn.__name__} timed out after {EXTRACT_TIMEOUT}s")
+        raise HTTPException(504, "Document parsing timed out.")
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        raise HTTPException(503, "Document parser restarted, please retry.")
+
+
+def _page_ranges(n_pages: int, per_job: int) -> List[Tuple[int, int]]:
+    per_job = max(1, per_job)
+    return [(i, min(i + per_job, n_pages)) for i in range(0, n_pages, per_job)]
+
+
+async def _extract_pdf_async(raw: Source) -> str:
+    try:
+        n_pages = await _run(pdf_page_count, raw)
+    except HTTPException:
+        raise
+    except Exception:
+        n_pages = None  # PyPDF2 can't read it; let pdfplumber try
+    if n_pages is not None and n_pages > EXTRACT_MAX_PAGES:
+        raise HTTPException(400, f"PDF has {n_pages} pages (max {EXTRACT_MAX_PAGES}).")
+
+    if n_pages is None or n_pages <= PDF_PAGES_PER_JOB:
+        return await _run(extract_pdf_text, raw)
+
+    # long PDF: one job per page range, results joined back in page order
+    try:
+        parts = await asyncio.gather(*[_run(pdf_pages_text, raw, s, e) for s, e in _page_ranges(n_pages, PDF_PAGES_PER_JOB)])
+        txt = _cleanup("\n".join(t for part in parts for t in part))
+        if txt:
+            return txt
+    except HTTPException:
+        raise
+    except Exception as e:
+        print("[WARN] pdfplumber failed, falling back to PyPDF2:", e)
+    return await _run(pdf_text_pypdf2, raw)
+
+
+async def extract_text_async(filename: str, raw: Source) -> str:
+    """Picks the extractor from the file name; parsing never runs on the event loop."""
+    if source_size(raw) > EXTRACT_MAX_BYTES:
+        raise HTTPException(413, f"File too large (max {EXTRACT_MAX_BYTES // (1024 * 1024)} MB).")
+    name = (filename or "").lower()
+    if name.endswith(".docx"):
+        return await _run(extract_docx_text, raw)
+    if name.endswith(".pdf"):
+        return await _extract_pdf_async(raw)
+    if name.endswith(".txt"):
+        return read_text_file(raw)
+    raise HTTPException(400, "Unsupported file type (.docx, .pdf, .txt only)")
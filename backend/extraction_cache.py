@@ -0,0 +1,110 @@
+# extraction_cache.py
+# ----------------------------------------------------
+# Extracted-text cache in front of extraction.extract_text_async
+#   key = (EXTRACTOR_VERSION, file type, sha256(raw bytes))
+#   tier 1: bounded in-process LRU
+#   tier 2: optional directory (EXTRACT_CACHE_DIR), survives restarts
+# peek_doc followed by index_resume_mem on the same CV parses it once.
+# ----------------------------------------------------
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+from cache_utils import LRUCache
+from extraction import EXTRACTOR_VERSION, Source, extract_text_async
+
+EXTRACT_CACHE_SIZE = int(os.getenv("EXTRACT_CACHE_SIZE", "256"))
+EXTRACT_CACHE_DIR = os.getenv("EXTRACT_CACHE_DIR", "")
+
+_memory = LRUCache(maxsize=EXTRACT_CACHE_SIZE)
+_lock = threading.Lock()
+_counters: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "disk_errors": 0}
+
+
+def _bump(name: str) -> None:
+    with _lock:
+        _counters[name] += 1
+
+
+def cache_key(filename: str, raw: Source, digest: Optional[str] = None) -> Tuple[str, str, str]:
+    ext = os.path.splitext((filename or "").lower())[1].lstrip(".")
+    if digest is None:
+        if isinstance(raw, str):
+            raise ValueError("digest is required when extracting from a path")
+        digest = hashlib.sha256(raw).hexdigest()
+    return EXTRACTOR_VERSION, ext, digest
+
+
+def _disk_path(key: Tuple[str, str, str]) -> str:
+    version, ext, digest = key
+    return os.path.join(EXTRACT_CACHE_DIR, version, digest[:2], f"{digest}.{ext}.txt")
+
+
+def _disk_get(key: Tuple[str, str, str]) -> Optional[str]:
+    if not EXTRACT_CACHE_DIR:
+        return None
+    try:
+        with open(_disk_path(key), "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        _bump("disk_errors")
+        print("[WARN] extraction cache read failed:", e)
+        return None
+
+
+def _disk_put(key: Tuple[str, str, str], text: str) -> None:
+    if not EXTRACT_CACHE_DIR:
+        return
+    path = _disk_path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write + rename so a concurrent reader never sees half a file
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except Exception as e:
+        _bump("disk_errors")
+        print("[WARN] extraction cache write failed:", e)
+
+
+async def cached_extract_text(filename: str, raw: Source, digest: Optional[str] = None) -> str:
+    """
+    Drop-in for extract_text_async. `digest` is the sha256 of the file when
+    the caller already has it (required when `raw` is a path).
+    """
+    key = cache_key(filename, raw, digest)
+
+    text = _memory.get(key)
+    if text is not None:
+        _bump("memory_hits")
+        return text
+
+    text = _disk_get(key)
+    if text is not None:
+        _bump("disk_hits")
+        _memory.set(key, text)
+        return text
+
+    _bump("misses")
+    text = await extract_text_async(filename, raw)
+    if text.strip():
+        _memory.set(key, text)
+        _disk_put(key, text)
+    return text
+
+
+def stats() -> Dict[str, object]:
+    with _lock:
+        out: Dict[str, object] = dict(_counters)
+    lookups = out["memory_hits"] + out["disk_hits"] + out["misses"]
+    out["hit_rate"] = round((out["memory_hits"] + out["disk_hits"]) / lookups, 4) if lookups else 0.0
+    out["memory"] = _memory.stats()
+    out["disk_dir"] = EXTRACT_CACHE_DIR or None
+    out["extractor_version"] = EXTRACTOR_VERSION
+    return out
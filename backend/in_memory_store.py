@@ -6,49 +6,13 @@
 # 
 # ----------------------------------------------------
 
-import math
-import re
 from typing import List, Dict, Any
 
-from bedrock_client import embed_text, DEFAULT_AWS_REGION
-
-
-def cos_sim(a: List[float], b: List[float]) -> float:
-    dot = sum(x * y for x, y in zip(a, b))
-    na = math.sqrt(sum(x * x for x in a))
-    nb = math.sqrt(sum(y * y for y in b))
-    return 0.0 if na == 0 or nb == 0 else dot / (na * nb)
-
+import numpy as np
 
-def token_aware_chunks(text: str, max_tokens: int = 700, overlap: int = 80) -> List[str]:
-    text = re.sub(r'\s+', ' ', text).strip()
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    chunks, cur, cur_tokens = [], [], 0
-
-    def est_tokens(s: str) -> int:
-        return max(1, int(len(s.split()) / 0.75))
-
-    i = 0
-    while i < len(sentences):
-        s = sentences[i]
-        t = est_tokens(s)
-        if cur_tokens + t <= max_tokens or not cur:
-            cur.append(s); cur_tokens += t; i += 1
-        else:
-            chunk = ' '.join(cur).strip()
-            if chunk:
-                chunks.append(chunk)
-            prefix, tok = [], 0
-            for s_back in reversed(cur):
-                tok += est_tokens(s_back)
-                prefix.append(s_back)
-                if tok >= overlap: break
-            cur = list(reversed(prefix))
-            cur_tokens = sum(est_tokens(x) for x in cur)
-    last = ' '.join(cur).strip()
-    if last:
-        chunks.append(last)
-    return chunks
+from bedrock_client import embed_text, DEFAULT_AWS_REGION
+from chunking import token_aware_chunks
+from vector_scoring import ChunkMatrix, cos_sim, top_k_indices
 
 
 MEM: Dict[str, Any] = {"resumes": []}
@@ -63,7 +27,9 @@ def add_resume(name: str, text: str, *, region: str = DEFAULT_AWS_REGION) -> int
         vec = embed_text(ch, aws_region=region)
         items.append({"text": ch, "vec": vec})
     rid = SEQ; SEQ += 1
-    MEM["resumes"].append({"id": rid, "name": name, "chunks": items})
+    # stacked once here so every query is a single mat-vec
+    matrix = ChunkMatrix([it["vec"] for it in items])
+    MEM["resumes"].append({"id": rid, "name": name, "chunks": items, "matrix": matrix})
     return rid
 
 
@@ -83,16 +49,17 @@ def best_snippets_for_requirement(requirement: str, *, region: str = DEFAULT_AWS
 
     scored = []
     for r in MEM["resumes"]:
-        chunk_scores = []
-        for ch in r["chunks"]:
-            sem = cos_sim(qv, ch["vec"])
-            kw_hits = sum(1 for w in kw if w in ch["text"].lower())
-            score = 0.85 * sem + 0.15 * (min(kw_hits, 5) / 5.0)
-            chunk_scores.append((score, ch["text"]))
-        if not chunk_scores: continue
-        chunk_scores.sort(reverse=True, key=lambda t: t[0])
-        best_score = chunk_scores[0][0]
-        top_snips = [t[1] for t in chunk_scores[:top_k_snippets]]
+        if not r["chunks"]:
+            continue
+        sem = r["matrix"].scores(qv)
+        kw_hits = np.array(
+            [min(sum(1 for w in kw if w in ch["text"].lower()), 5) for ch in r["chunks"]],
+            dtype=np.float32,
+        )
+        chunk_scores = 0.85 * sem + 0.15 * (kw_hits / 5.0)
+        order = top_k_indices(chunk_scores, top_k_snippets)
+        best_score = float(chunk_scores[order[0]])
+        top_snips = [r["chunks"][i]["text"] for i in order]
         scored.append((best_score, r, top_snips))
     scored.sort(reverse=True, key=lambda t: t[0])
     return scored[:top_k_resumes]
@@ -0,0 +1,66 @@
+# indexing.py
+# ----------------------------------------------------
+# Resume indexing pipeline shared by /ai/index_resume_mem (inline)
+# and the job workers of jobs.py:
+#   extracted text -> chunks -> Titan embeddings -> Resume + ResumeChunk rows
+#   (+ BM25 term rows)
+# `progress(stage, percent)` lets the job runner report where it is.
+# ----------------------------------------------------
+
+from typing import Callable, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from bedrock_client import DEFAULT_AWS_REGION
+from chunking import token_aware_chunks
+from embedding_pipeline import embed_chunks_async
+from models import Resume, ResumeChunk
+from resume_sections import ResumeSections
+from retrieval import index_chunk_terms
+
+Progress = Callable[[str, int], None]
+
+
+def chunk_resume_text(text: str) -> List[str]:
+    # split para
+    paragraphs = token_aware_chunks(text, max_tokens=700, overlap=80)
+    if len(paragraphs) <= 1:
+        words = text.split()
+        paragraphs = [" ".join(words[i:i+800]) for i in range(0, len(words), 700)]
+
+    if not paragraphs:
+        paragraphs = [text]
+    return paragraphs
+
+
+async def store_resume_index(db: Session, user_id: int, name: str, text: str,
+                             progress: Optional[Progress] = None) -> Resume:
+    report = progress or (lambda stage, pct: None)
+    if not (text or "").strip():
+        raise HTTPException(400, "No readable text.")
+
+    report("chunking", 30)
+    paragraphs = chunk_resume_text(text)
+
+    # embed all chunks concurrently (order kept, failed chunk -> None)
+    report("embedding", 40)
+    embeddings = await embed_chunks_async(paragraphs, region=DEFAULT_AWS_REGION)
+
+    # save resume record + all chunks in one transaction
+    report("saving", 90)
+    resume = Resume(user_id=user_id, name=name, text=text,
+                    sections=ResumeSections.build(text).to_json())
+    db.add(resume)
+    db.flush()
+    chunks = [
+        ResumeChunk(resume_id=resume.id, text=p, embedding=emb)
+        for p, emb in zip(paragraphs, embeddings)
+    ]
+    db.add_all(chunks)
+    db.flush()
+    # BM25 term rows for retrieval.py
+    index_chunk_terms(db, chunks)
+    db.commit()
+    print(f"[OK] Indexed resume #{resume.id} with {len(paragraphs)} chunks")
+    return resume
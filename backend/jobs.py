@@ -0,0 +1,331 @@
+# jobs.py
+# ----------------------------------------------------
+# Background queue for resume indexing (POST /ai/index_resume_jobs):
+# - Postgres-backed: index_jobs rows, workers claim them with
+#   FOR UPDATE SKIP LOCKED, so several app processes can share the queue
+# - in-process fallback (INDEX_JOBS_BACKEND=memory, or when the DB write
+#   fails) keeps the jobs in a dict
+# - retries with jittered backoff, lease so a crashed worker's job is
+#   picked up again, identical uploads (user + sha256) join the live job
+#   or get the already indexed resume
+# The pipeline itself is indexing.py, the same one the inline route uses.
+# ----------------------------------------------------
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from db import SessionLocal
+from extraction_cache import cached_extract_text
+from indexing import store_resume_index
+from models import IndexJob
+from rate_limit import backoff_delay
+
+INDEX_JOBS_BACKEND = os.getenv("INDEX_JOBS_BACKEND", "postgres")  # postgres | memory
+INDEX_WORKERS = int(os.getenv("INDEX_WORKERS", "2"))
+INDEX_JOB_MAX_ATTEMPTS = int(os.getenv("INDEX_JOB_MAX_ATTEMPTS", "3"))
+INDEX_JOB_RETRY_BASE = float(os.getenv("INDEX_JOB_RETRY_BASE", "5"))
+INDEX_JOB_LEASE = float(os.getenv("INDEX_JOB_LEASE", "300"))
+INDEX_POLL_SECONDS = float(os.getenv("INDEX_POLL_SECONDS", "2"))
+INDEX_JOB_MEMORY_TTL = float(os.getenv("INDEX_JOB_MEMORY_TTL", "3600"))  # finished in-process jobs
+
+_LIVE = ("queued", "running")
+_FIELDS = ("id", "user_id", "filename", "status", "stage", "progress", "attempts",
+           "max_attempts", "error", "resume_id", "created_at", "updated_at")
+
+_mem_jobs: Dict[str, dict] = {}
+_mem_lock = threading.Lock()
+
+_wake = threading.Event()
+_stop = threading.Event()
+_threads: List[threading.Thread] = []
+_hooks: List[Callable[[int], None]] = []
+
+
+def on_indexed(fn: Callable[[int], None]) -> Callable[[int], None]:
+    """Registers fn(resume_id), run by the worker after a job indexed a resume."""
+    _hooks.append(fn)
+    return fn
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _public(job) -> dict:
+    get = job.get if isinstance(job, dict) else lambda k: getattr(job, k)
+    return {k: get(k) for k in _FIELDS}
+
+
+# ---------------- in-process backend ----------------
+def _mem_find_live(user_id: int, digest: str) -> Optional[dict]:
+    for job in _mem_jobs.values():
+        if job["user_id"] == user_id and job["content_sha256"] == digest and job["status"] in _LIVE:
+            return job
+    return None
+
+
+def _mem_prune() -> None:
+    cutoff = _now() - timedelta(seconds=INDEX_JOB_MEMORY_TTL)
+    for job_id in [k for k, j in _mem_jobs.items() if j["status"] not in _LIVE and j["updated_at"] < cutoff]:
+        del _mem_jobs[job_id]
+
+
+def _mem_enqueue(user_id: int, filename: str, raw: bytes, digest: str) -> Tuple[dict, bool]:
+    with _mem_lock:
+        _mem_prune()
+        live = _mem_find_live(user_id, digest)
+        if live is not None:
+            return _public(live), True
+        now = _now()
+        job = {
+            "id": uuid.uuid4().hex, "user_id": user_id, "filename": filename,
+            "content_sha256": digest, "payload": raw, "status": "queued", "stage": None,
+            "progress": 0, "attempts": 0, "max_attempts": INDEX_JOB_MAX_ATTEMPTS,
+            "error": None, "resume_id": None, "run_after": 0.0, "locked_at": None,
+            "created_at": now, "updated_at": now,
+        }
+        _mem_jobs[job["id"]] = job
+        return _public(job), False
+
+
+def _mem_claim() -> Optional[str]:
+    with _mem_lock:
+        now = time.time()
+        for job in _mem_jobs.values():
+            stale = job["status"] == "running" and job["locked_at"] is not None \
+                and now - job["locked_at"] > INDEX_JOB_LEASE
+            if (job["status"] == "queued" and job["run_after"] <= now) or stale:
+                job.update(status="running", attempts=job["attempts"] + 1,
+                           locked_at=now, updated_at=_now())
+                return job["id"]
+    return None
+
+
+# ---------------- Postgres backend ----------------
+def _pg_find_live(db, user_id: int, digest: str) -> Optional[IndexJob]:
+    return (
+        db.query(IndexJob)
+          .filter(IndexJob.user_id == user_id,
+                  IndexJob.content_sha256 == digest,
+                  IndexJob.status.in_(_LIVE))
+          .first()
+    )
+
+
+def _pg_find_done(db, user_id: int, digest: str) -> Optional[IndexJob]:
+    # same file already indexed and the resume still exists
+    return (
+        db.query(IndexJob)
+          .filter(IndexJob.user_id == user_id,
+                  IndexJob.content_sha256 == digest,
+                  IndexJob.status == "done",
+                  IndexJob.resume_id.isnot(None))
+          .order_by(IndexJob.created_at.desc())
+          .first()
+    )
+
+
+def _pg_enqueue(user_id: int, filename: str, raw: bytes, digest: str) -> Tuple[dict, bool]:
+    db = SessionLocal()
+    try:
+        existing = _pg_find_live(db, user_id, digest) or _pg_find_done(db, user_id, digest)
+        if existing is not None:
+            return _public(existing), True
+        job = IndexJob(
+            id=uuid.uuid4().hex, user_id=user_id, filename=filename, content_sha256=digest,
+            payload=raw, status="queued", progress=0, attempts=0,
+            max_attempts=INDEX_JOB_MAX_ATTEMPTS,
+        )
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # same upload enqueued concurrently: the unique live index picked a winner
+            db.rollback()
+            live = _pg_find_live(db, user_id, digest)
+            if live is None:
+                raise
+            return _public(live), True
+        db.refresh(job)
+        return _public(job), False
+    finally:
+        db.close()
+
+
+def _pg_claim() -> Optional[str]:
+    db = SessionLocal()
+    try:
+        job = (
+            db.query(IndexJob)
+              .filter(or_(
+                  and_(IndexJob.status == "queued", IndexJob.run_after <= func.now()),
+                  and_(IndexJob.status == "running",
+                       IndexJob.locked_at < func.now() - timedelta(seconds=INDEX_JOB_LEASE)),
+              ))
+              .order_by(IndexJob.created_at)
+              .with_for_update(skip_locked=True)
+              .first()
+        )
+        if job is None:
+            db.rollback()
+            return None
+        job.status = "running"
+        job.attempts = job.attempts + 1
+        job.locked_at = func.now()
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+
+# ---------------- public API ----------------
+def enqueue_index_job(user_id: int, filename: str, raw: bytes, digest: str) -> Tuple[dict, bool]:
+    """Returns (job, deduplicated). Falls back to the in-process queue if Postgres is unavailable."""
+    if INDEX_JOBS_BACKEND == "postgres":
+        try:
+            out = _pg_enqueue(user_id, filename, raw, digest)
+            _wake.set()
+            return out
+        except SQLAlchemyError as e:
+            print("[WARN] index job queue: Postgres unavailable, using in-process queue:", e)
+    out = _mem_enqueue(user_id, filename, raw, digest)
+    _wake.set()
+    return out
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    with _mem_lock:
+        job = _mem_jobs.get(job_id)
+        if job is not None:
+            return _public(job)
+    if INDEX_JOBS_BACKEND != "postgres":
+        return None
+    db = SessionLocal()
+    try:
+        job = db.get(IndexJob, job_id)
+        return _public(job) if job is not None else None
+    finally:
+        db.close()
+
+
+def _update(job_id: str, **fields) -> None:
+    with _mem_lock:
+        job = _mem_jobs.get(job_id)
+        if job is not None:
+            job.update(fields, updated_at=_now())
+            return
+    db = SessionLocal()
+    try:
+        if "run_after" in fields:
+            fields["run_after"] = func.now() + timedelta(seconds=fields["run_after"] - time.time())
+        db.query(IndexJob).filter(IndexJob.id == job_id).update(fields, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _load(job_id: str) -> Optional[dict]:
+    with _mem_lock:
+        job = _mem_jobs.get(job_id)
+        if job is not None:
+            return dict(job)
+    db = SessionLocal()
+    try:
+        job = db.get(IndexJob, job_id)
+        if job is None:
+            return None
+        return {"user_id": job.user_id, "filename": job.filename, "content_sha256": job.content_sha256,
+                "payload": job.payload, "attempts": job.attempts, "max_attempts": job.max_attempts}
+    finally:
+        db.close()
+
+
+# ---------------- workers ----------------
+async def _pipeline(db, job: dict, progress) -> int:
+    progress("extracting", 10)
+    text = await cached_extract_text(job["filename"], job["payload"], digest=job["content_sha256"])
+    resume = await store_resume_index(db, job["user_id"], job["filename"], text, progress=progress)
+    return resume.id
+
+
+def _run_job(job_id: str) -> None:
+    job = _load(job_id)
+    if job is None:
+        return
+    db = SessionLocal()
+    try:
+        resume_id = asyncio.run(_pipeline(db, job, lambda stage, pct: _update(job_id, stage=stage, progress=pct)))
+    except Exception as e:
+        db.rollback()
+        permanent = isinstance(e, HTTPException) and e.status_code < 500
+        msg = e.detail if isinstance(e, HTTPException) else str(e)
+        if permanent or job["attempts"] >= job["max_attempts"]:
+            print(f"[WARN] index job {job_id} failed:", msg)
+            _update(job_id, status="failed", error=str(msg)[:2000], payload=None, locked_at=None)
+        else:
+            delay = backoff_delay(job["attempts"], INDEX_JOB_RETRY_BASE)
+            print(f"[WARN] index job {job_id} attempt {job['attempts']} failed, retry in {delay:.1f}s:", msg)
+            _update(job_id, status="queued", error=str(msg)[:2000], locked_at=None,
+                    run_after=time.time() + delay)
+        return
+    finally:
+        db.close()
+
+    _update(job_id, status="done", stage="done", progress=100, resume_id=resume_id,
+            error=None, payload=None, locked_at=None)
+    for hook in _hooks:
+        try:
+            hook(resume_id)
+        except Exception as e:
+            print(f"[WARN] post-index hook failed for resume #{resume_id}:", e)
+
+
+def _claim() -> Optional[str]:
+    job_id = _mem_claim()
+    if job_id is None and INDEX_JOBS_BACKEND == "postgres":
+        try:
+            job_id = _pg_claim()
+        except SQLAlchemyError as e:
+            print("[WARN] index job claim failed:", e)
+    return job_id
+
+
+def _worker() -> None:
+    while not _stop.is_set():
+        job_id = _claim()
+        if job_id is None:
+            _wake.wait(INDEX_POLL_SECONDS)
+            _wake.clear()
+            continue
+        try:
+            _run_job(job_id)
+        except Exception as e:
+            # bookkeeping failed (e.g. DB blip); the lease hands the job to a worker later
+            print(f"[WARN] index worker error on job {job_id}:", e)
+
+
+def start_workers() -> None:
+    if _threads:
+        return
+    _stop.clear()
+    for n in range(INDEX_WORKERS):
+        t = threading.Thread(target=_worker, name=f"index-worker-{n}", daemon=True)
+        t.start()
+        _threads.append(t)
+
+
+def stop_workers(timeout: float = 5.0) -> None:
+    _stop.set()
+    _wake.set()
+    for t in _threads:
+        t.join(timeout)
+    _threads.clear()
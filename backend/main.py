@@ -1,18 +1,32 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from db import Base, engine
+from db import Base, engine, init_extensions
 from auth import router as auth_router
 from admin import admin as admin_router
 from support import support as support_router
 from ai import router as ai_router
+from async_bedrock_client import close_clients
+from extraction import shutdown_pool
+from jobs import start_workers, stop_workers
 from models import *
 from dotenv import load_dotenv
 import os
 
 load_dotenv() 
+init_extensions()
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_workers()
+    yield
+    stop_workers()
+    await close_clients()
+    shutdown_pool()
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:5173",
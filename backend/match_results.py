@@ -0,0 +1,82 @@
+# match_results.py
+# ----------------------------------------------------
+# Claude's match output parsed once, when the MatchAttempt is written:
+#   result     -> JSONB (the whole object)
+#   highlights -> text[]
+#   missing    -> text[] (lowercased, GIN-indexed)
+#   jd_family  -> normalized job title (the JD's first line), to group
+#                 attempts on similar JDs
+# so analytics ("most common missing skills for backend roles") run
+# in Postgres instead of re-parsing raw_json in Python.
+# ----------------------------------------------------
+
+import json
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+# words that change the level, not the job
+_LEVEL_WORDS = {
+    "senior", "junior", "sr", "jr", "lead", "principal", "intern", "internship",
+    "stage", "stagiaire", "trainee", "graduate", "entry", "level", "mid",
+    "i", "ii", "iii",
+}
+_NON_WORD = re.compile(r"[^a-z0-9+#]+")
+MAX_SKILL_LEN = 120
+
+
+def parse_match_json(raw: Any) -> Dict[str, Any]:
+    """Claude's match JSON (string or dict) -> dict, {} if unreadable."""
+    if isinstance(raw, dict):
+        return raw
+    try:
+        txt = (raw or "").strip().strip("`")
+        if txt.startswith("json"):
+            txt = txt[4:]
+        data = json.loads(txt)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _str_list(items: Any) -> List[str]:
+    if not isinstance(items, list):
+        return []
+    return [" ".join(str(s).split()) for s in items if s is not None and str(s).strip()]
+
+
+def normalize_skills(items: Any) -> List[str]:
+    """Lowercased, de-duplicated, order kept."""
+    return list(dict.fromkeys(s.lower()[:MAX_SKILL_LEN] for s in _str_list(items)))
+
+
+def match_score(result: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int(max(0, min(100, round(float(result.get("score", 0))))))
+    except Exception:
+        return None
+
+
+def jd_family(job_title: Optional[str]) -> Optional[str]:
+    """
+    'Senior Backend Engineer (Python)' -> 'backend engineer python'.
+    Callers pass MatchAttempt.job_title, i.e. the first line of the pasted
+    JD: when that line is not the role ("About us", a company name), the
+    family is only as good as that line.
+    """
+    folded = unicodedata.normalize("NFKD", job_title or "")
+    folded = "".join(c for c in folded if not unicodedata.combining(c)).lower()
+    words = [w for w in _NON_WORD.sub(" ", folded).split() if w not in _LEVEL_WORDS]
+    return " ".join(words)[:120] or None
+
+
+def match_fields(raw: Any, job_title: Optional[str] = None) -> Dict[str, Any]:
+    """Column values for a MatchAttempt built from Claude's output."""
+    result = parse_match_json(raw)
+    return {
+        "result": result or None,
+        "score": match_score(result) if result else None,
+        "highlights": _str_list(result.get("highlights")),
+        "missing": normalize_skills(result.get("missing")),
+        "jd_family": jd_family(job_title),
+    }
@@ -0,0 +1,27 @@
+-- 001: ResumeChunk.embedding JSON -> pgvector + HNSW index
+-- Run once on databases created before the pgvector switch
+-- (fresh databases get all of this from Base.metadata.create_all).
+-- Dimension must match EMBEDDING_DIM (Titan v2 default = 1024).
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+BEGIN;
+
+-- old zero-vector fallbacks were 256 dims; they carry no signal, drop them
+UPDATE resume_chunks
+   SET embedding = NULL
+ WHERE embedding IS NOT NULL
+   AND json_array_length(embedding) <> 1024;
+
+ALTER TABLE resume_chunks
+    ALTER COLUMN embedding TYPE vector(1024)
+    USING embedding::text::vector(1024);
+
+CREATE INDEX IF NOT EXISTS ix_resume_chunks_resume_id
+    ON resume_chunks (resume_id);
+
+CREATE INDEX IF NOT EXISTS ix_resume_chunks_embedding_hnsw
+    ON resume_chunks USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+COMMIT;
@@ -0,0 +1,6 @@
+-- 002: Resume.sections (section index built at upload time)
+-- Rows indexed before this column existed keep NULL; the app parses
+-- their text on read (resume_sections.sections_for), so no backfill needed.
+
+ALTER TABLE resumes
+    ADD COLUMN IF NOT EXISTS sections JSON;
@@ -0,0 +1,15 @@
+-- 003: resume_artifacts (job profile / skill tokens / section blocks per resume)
+-- Filled by the background enrichment after /ai/index_resume_mem.
+-- Existing resumes get a row the first time /ai/job_search_serper runs for them.
+
+CREATE TABLE IF NOT EXISTS resume_artifacts (
+    resume_id       INTEGER PRIMARY KEY REFERENCES resumes(id) ON DELETE CASCADE,
+    text_sha256     VARCHAR(64) NOT NULL,
+    version         INTEGER NOT NULL DEFAULT 1,
+    status          VARCHAR(16) NOT NULL DEFAULT 'pending',
+    job_profile     JSON,
+    skill_tokens    JSON,
+    blocks          JSON,
+    normalized_text TEXT,
+    updated_at      TIMESTAMPTZ DEFAULT now()
+);
@@ -0,0 +1,28 @@
+-- 004: index_jobs (queue behind POST /ai/index_resume_jobs, see jobs.py)
+-- Workers claim rows with FOR UPDATE SKIP LOCKED; payload is cleared when a job ends.
+
+CREATE TABLE IF NOT EXISTS index_jobs (
+    id             VARCHAR(32) PRIMARY KEY,
+    user_id        INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    filename       VARCHAR(255) NOT NULL,
+    content_sha256 VARCHAR(64) NOT NULL,
+    payload        BYTEA,
+    status         VARCHAR(16) NOT NULL DEFAULT 'queued',
+    stage          VARCHAR(32),
+    progress       INTEGER NOT NULL DEFAULT 0,
+    attempts       INTEGER NOT NULL DEFAULT 0,
+    max_attempts   INTEGER NOT NULL DEFAULT 3,
+    error          TEXT,
+    resume_id      INTEGER REFERENCES resumes(id) ON DELETE SET NULL,
+    run_after      TIMESTAMPTZ DEFAULT now(),
+    locked_at      TIMESTAMPTZ,
+    created_at     TIMESTAMPTZ DEFAULT now(),
+    updated_at     TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_index_jobs_claim ON index_jobs (status, run_after);
+
+-- one live job per (user, file content): duplicate uploads join it
+CREATE UNIQUE INDEX IF NOT EXISTS ux_index_jobs_live_upload
+    ON index_jobs (user_id, content_sha256)
+    WHERE status IN ('queued', 'running');
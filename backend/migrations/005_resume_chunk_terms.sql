@@ -0,0 +1,18 @@
+-- 005: BM25 inverted index over resume_chunks (see retrieval.py)
+-- New chunks are indexed at upload time. Chunks with n_tokens IS NULL
+-- (indexed before this migration) get their term rows the first time
+-- their resume is searched.
+
+ALTER TABLE resume_chunks
+    ADD COLUMN IF NOT EXISTS n_tokens INTEGER;
+
+CREATE TABLE IF NOT EXISTS resume_chunk_terms (
+    chunk_id  INTEGER NOT NULL REFERENCES resume_chunks(id) ON DELETE CASCADE,
+    term      VARCHAR(64) NOT NULL,
+    resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+    tf        INTEGER NOT NULL,
+    PRIMARY KEY (chunk_id, term)
+);
+
+CREATE INDEX IF NOT EXISTS ix_resume_chunk_terms_lookup
+    ON resume_chunk_terms (resume_id, term);
@@ -0,0 +1,9 @@
+-- 006: composite indexes for the keyset-paginated history lists
+-- (/ai/match_history, /ai/interview_history: newest first per user;
+-- Postgres walks the index backwards for the DESC order)
+
+CREATE INDEX IF NOT EXISTS ix_match_attempts_user_created
+    ON match_attempts (user_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS ix_interview_attempts_user_created
+    ON interview_attempts (user_id, created_at, id);
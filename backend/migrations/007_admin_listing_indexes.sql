@@ -0,0 +1,8 @@
+-- 007: indexes behind the keyset-paginated admin complaint listing
+-- (newest first, optionally filtered by status). users pages on its primary key.
+
+CREATE INDEX IF NOT EXISTS ix_complaints_created
+    ON complaints (created_at, id);
+
+CREATE INDEX IF NOT EXISTS ix_complaints_status_created
+    ON complaints (status, created_at, id);
@@ -0,0 +1,19 @@
+-- 008: user_stats (per-user dashboard rollup behind /ai/stats, see stats.py)
+-- Rows are created on the first attempt or the first /ai/stats call,
+-- built from the existing history, so no backfill is needed.
+
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id             INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    match_count         INTEGER NOT NULL DEFAULT 0,
+    match_scored        INTEGER NOT NULL DEFAULT 0,
+    match_score_sum     INTEGER NOT NULL DEFAULT 0,
+    match_best          INTEGER,
+    match_recent        JSON,
+    interview_count     INTEGER NOT NULL DEFAULT 0,
+    interview_scored    INTEGER NOT NULL DEFAULT 0,
+    interview_score_sum INTEGER NOT NULL DEFAULT 0,
+    interview_best      INTEGER,
+    interview_recent    JSON,
+    missing_counts      JSON,
+    updated_at          TIMESTAMPTZ DEFAULT now()
+);
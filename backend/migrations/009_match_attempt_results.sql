@@ -0,0 +1,21 @@
+-- 009: parsed match results on match_attempts (see match_results.py)
+-- New attempts fill these at write time. After running this file, fill
+-- the existing rows once (safe to stop and re-run):
+--   cd backend && python tools/backfill_match_results.py
+-- user_stats rows built before the backfill keep their missing-skill
+-- counters; delete them to rebuild from the arrays if needed.
+-- jd_family is derived from job_title, which is the first line of the JD
+-- as pasted. A JD that opens with a company blurb or "About us" gets a
+-- family built from that line, not from the role.
+
+ALTER TABLE match_attempts
+    ADD COLUMN IF NOT EXISTS result     JSONB,
+    ADD COLUMN IF NOT EXISTS highlights TEXT[],
+    ADD COLUMN IF NOT EXISTS missing    VARCHAR(120)[],
+    ADD COLUMN IF NOT EXISTS jd_family  VARCHAR(120);
+
+CREATE INDEX IF NOT EXISTS ix_match_attempts_missing_gin
+    ON match_attempts USING gin (missing);
+
+CREATE INDEX IF NOT EXISTS ix_match_attempts_jd_family
+    ON match_attempts (jd_family);
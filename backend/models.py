@@ -1,8 +1,14 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Text, DateTime, JSON, Float
+import os
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Text, DateTime, JSON, Float, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from pgvector.sqlalchemy import Vector
 from db import Base
 
+# Titan v2 returns 1024 dims by default (256 / 512 if configured)
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "1024"))
+
 class Role(Base):
     __tablename__ = "roles"
     id = Column(Integer, primary_key=True, index=True)
@@ -47,7 +53,13 @@ class Complaint(Base):
     status = Column(String(20), default="open")       # open | in_progress | resolved | rejected
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    user = relationship("User", lazy="joined")
+    # listings never read it; load on access only
+    user = relationship("User", lazy="select")
+
+    __table_args__ = (
+        Index("ix_complaints_created", "created_at", "id"),
+        Index("ix_complaints_status_created", "status", "created_at", "id"),
+    )
 
 # whole resume file
 class Resume(Base):
@@ -57,11 +69,15 @@ class Resume(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     name = Column(String(255), nullable=False)
     text = Column(Text, nullable=False)
+    # ResumeSections.to_json(): canonical header -> char span in text
+    sections = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationship
     user = relationship("User", backref="resumes")
     chunks = relationship("ResumeChunk", cascade="all, delete", back_populates="resume")
+    artifacts = relationship("ResumeArtifacts", uselist=False, cascade="all, delete-orphan",
+                             back_populates="resume")
 
 
 # individual text chunks + Titan embeddings
@@ -69,12 +85,97 @@ class ResumeChunk(Base):
     __tablename__ = "resume_chunks"
 
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False, index=True)
     text = Column(Text, nullable=False)
-    embedding = Column(JSON, nullable=True)  # Titan embedding vector
+    embedding = Column(Vector(EMBEDDING_DIM), nullable=True)  # Titan embedding vector (pgvector)
     score = Column(Float, default=0.0)
+    n_tokens = Column(Integer, nullable=True)  # BM25 doc length, NULL = terms not indexed yet
 
     resume = relationship("Resume", back_populates="chunks")
+    terms = relationship("ResumeChunkTerm", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        # ANN index so top-k ordering by cosine distance runs inside Postgres
+        Index(
+            "ix_resume_chunks_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+# inverted index over chunk text for BM25 (see retrieval.py)
+class ResumeChunkTerm(Base):
+    __tablename__ = "resume_chunk_terms"
+
+    chunk_id = Column(Integer, ForeignKey("resume_chunks.id", ondelete="CASCADE"), primary_key=True)
+    term = Column(String(64), primary_key=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False)
+    tf = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_resume_chunk_terms_lookup", "resume_id", "term"),
+    )
+
+# derived per-resume data, filled in the background after indexing (see resume_artifacts.py)
+class ResumeArtifacts(Base):
+    __tablename__ = "resume_artifacts"
+
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    text_sha256 = Column(String(64), nullable=False)   # Resume.text these were computed from
+    version = Column(Integer, nullable=False, default=1)
+    status = Column(String(16), nullable=False, default="pending")  # pending | ready | partial
+
+    job_profile = Column(JSON, nullable=True)      # Claude: skills / roles / seniority
+    skill_tokens = Column(JSON, nullable=True)     # from the SKILLS section
+    blocks = Column(JSON, nullable=True)           # canonical section -> cleaned body
+    normalized_text = Column(Text, nullable=True)  # whitespace-collapsed Resume.text
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    resume = relationship("Resume", back_populates="artifacts")
+
+# resume indexing jobs: the Postgres-backed queue of jobs.py
+class IndexJob(Base):
+    __tablename__ = "index_jobs"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    filename = Column(String(255), nullable=False)
+    content_sha256 = Column(String(64), nullable=False)
+    payload = Column(LargeBinary, nullable=True)  # uploaded file, dropped once the job ends
+
+    status = Column(String(16), nullable=False, default="queued")  # queued | running | done | failed
+    stage = Column(String(32), nullable=True)
+    progress = Column(Integer, nullable=False, default=0)           # 0-100
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    error = Column(Text, nullable=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="SET NULL"), nullable=True)
+
+    run_after = Column(DateTime(timezone=True), server_default=func.now())
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_index_jobs_claim", "status", "run_after"),
+        # one live job per (user, file content): duplicate uploads join it
+        Index(
+            "ux_index_jobs_live_upload", "user_id", "content_sha256",
+            unique=True, postgresql_where=status.in_(["queued", "running"]),
+        ),
+    )
+
+# content-addressed Titan embeddings (see embedding_cache.py)
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+
+    model_id = Column(String(128), primary_key=True)
+    text_sha256 = Column(String(64), primary_key=True)
+    embedding = Column(Vector(), nullable=False)  # no fixed dim: one row per model
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class MatchAttempt(Base):
     __tablename__ = "match_attempts"
@@ -87,12 +188,47 @@ class MatchAttempt(Base):
     score = Column(Integer, nullable=True)           
     jd_snippet = Column(Text, nullable=True)          
     raw_json = Column(Text, nullable=True)           
+    # parsed at write time (match_results.match_fields)
+    result = Column(JSONB, nullable=True)
+    highlights = Column(ARRAY(Text), nullable=True)
+    missing = Column(ARRAY(String(120)), nullable=True)   # lowercased skills
+    jd_family = Column(String(120), nullable=True)        # normalized job_title
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", backref="match_attempts")
     resume = relationship("Resume")
 
+    __table_args__ = (
+        # history lists: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_match_attempts_user_created", "user_id", "created_at", "id"),
+        # missing @> ARRAY['docker'] and friends
+        Index("ix_match_attempts_missing_gin", "missing", postgresql_using="gin"),
+        Index("ix_match_attempts_jd_family", "jd_family"),
+    )
+
+# per-user dashboard rollup, updated with every attempt (see stats.py)
+class UserStats(Base):
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    match_count = Column(Integer, nullable=False, default=0)
+    match_scored = Column(Integer, nullable=False, default=0)      # attempts with a score
+    match_score_sum = Column(Integer, nullable=False, default=0)
+    match_best = Column(Integer, nullable=True)
+    match_recent = Column(JSON, nullable=True)                     # last N scores, oldest first
+
+    interview_count = Column(Integer, nullable=False, default=0)
+    interview_scored = Column(Integer, nullable=False, default=0)
+    interview_score_sum = Column(Integer, nullable=False, default=0)
+    interview_best = Column(Integer, nullable=True)
+    interview_recent = Column(JSON, nullable=True)
+
+    missing_counts = Column(JSON, nullable=True)                   # skill -> times reported missing
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class InterviewAttempt(Base):
     __tablename__ = "interview_attempts"
 
@@ -114,4 +250,8 @@ class InterviewAttempt(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # SAME LOGIC AS MatchAttempt: backref creates User.interview_attempts
-    user = relationship("User", backref="interview_attempts")
\ No newline at end of file
+    user = relationship("User", backref="interview_attempts")
+
+    __table_args__ = (
+        Index("ix_interview_attempts_user_created", "user_id", "created_at", "id"),
+    )
\ No newline at end of file
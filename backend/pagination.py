@@ -0,0 +1,71 @@
+# pagination.py
+# ----------------------------------------------------
+# Keyset ("seek") pagination on (created_at, id), newest first, or on
+# id alone (tables without created_at, e.g. users).
+# The cursor is the last row of the previous page, base64 JSON, so the
+# client treats it as opaque. Page cost does not grow with the offset,
+# and rows inserted meanwhile do not shift pages.
+# ----------------------------------------------------
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+def _pack(values: list) -> str:
+    raw = json.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _unpack(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return _pack([created_at.isoformat(), row_id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, row_id = _unpack(cursor)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query, created_col, id_col, cursor: Optional[str],
+                limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Rows of `query` after `cursor`, ordered (created_at, id) desc, plus the
+    next cursor (None on the last page). Rows must expose created_at and id.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    rows = query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+def id_page(query, id_col, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Rows of `query` with id above the cursor, ascending, plus the next cursor."""
+    if cursor:
+        try:
+            (after_id,) = _unpack(cursor)
+            after_id = int(after_id)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(id_col > after_id)
+    rows = query.order_by(id_col).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, _pack([rows[-1].id])
@@ -0,0 +1,232 @@
+# rate_limit.py
+# ----------------------------------------------------
+# Client-side protection for Bedrock, one guard per (region, model):
+# - token bucket shared by every thread / coroutine
+# - AIMD: the rate is learned from throttle responses
+# - circuit breaker: fail fast while Bedrock is saturated
+# ----------------------------------------------------
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)            # tokens added per second
+        self.capacity = float(capacity)    # burst size
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Takes one token; returns how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate if self.rate > 0 else float("inf")
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        wait = self.reserve()
+        if timeout is not None and wait > timeout:
+            self.refund()
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, timeout: Optional[float] = None) -> bool:
+        wait = self.reserve()
+        if timeout is not None and wait > timeout:
+            self.refund()
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def refund(self) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1.0)
+
+    def state(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {"rate": self.rate, "capacity": self.capacity, "tokens": round(self._tokens, 3)}
+
+
+# ---------------- adaptive limiter (AIMD) ----------------
+class AdaptiveLimiter:
+    """
+    Token bucket whose rate is learned from Bedrock's answers:
+    additive increase on success, multiplicative decrease on throttling.
+    """
+
+    def __init__(self, rate: float, capacity: float, *, min_rate: float = 0.2,
+                 max_rate: float = 20.0, increase: float = 0.05, decrease: float = 0.5):
+        self.bucket = TokenBucket(rate=rate, capacity=capacity)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.throttles = 0
+        self.successes = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        return self.bucket.acquire(timeout)
+
+    async def aacquire(self, timeout: Optional[float] = None) -> bool:
+        return await self.bucket.aacquire(timeout)
+
+    def on_success(self) -> None:
+        b = self.bucket
+        with b._lock:
+            self.successes += 1
+            b.rate = min(self.max_rate, b.rate + self.increase)
+
+    def on_throttle(self) -> None:
+        b = self.bucket
+        with b._lock:
+            self.throttles += 1
+            b.rate = max(self.min_rate, b.rate * self.decrease)
+            # drop the burst too, otherwise every waiting worker fires at once
+            b._tokens = min(b._tokens, 0.0)
+
+    def state(self) -> dict:
+        out = self.bucket.state()
+        out.update({"throttles": self.throttles, "successes": self.successes})
+        return out
+
+
+# ---------------- circuit breaker ----------------
+CLOSED_TICKET = object()  # calls admitted while closed; nothing to free
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `threshold` consecutive saturation failures,
+    open -> half_open after `cooldown` seconds (one probe call allowed),
+    half_open -> closed on success / back to open on failure.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 20.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.status = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe: Optional[object] = None  # ticket of the half-open trial call
+        self._lock = threading.Lock()
+
+    def admit(self) -> Optional[object]:
+        """
+        None = refused, else a ticket for guard.breaker.release(). The one
+        half-open trial call gets a fresh token, so only its own release
+        (not a late one from an earlier call) frees the probe slot.
+        """
+        with self._lock:
+            if self.status == "closed":
+                return CLOSED_TICKET
+            if self.status == "open":
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    return None
+                self.status = "half_open"
+                self._probe = None
+            if self._probe is not None:
+                return None
+            self._probe = object()
+            return self._probe
+
+    def allow(self) -> bool:
+        return self.admit() is not None
+
+    def release(self, ticket: Optional[object]) -> None:
+        """
+        End of an admitted call whose outcome said nothing about saturation
+        (other errors, client gone). Frees the probe slot without closing or
+        reopening; a no-op for any ticket but the current probe, so calling
+        it twice or after record_success / record_failure is harmless.
+        """
+        with self._lock:
+            if ticket is not None and ticket is self._probe:
+                self._probe = None
+
+    def retry_after(self) -> int:
+        with self._lock:
+            left = self.cooldown - (time.monotonic() - self.opened_at)
+        return max(1, int(left + 0.999))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.status = "closed"
+            self.failures = 0
+            self._probe = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.status == "half_open" or self.failures >= self.threshold:
+                self.status = "open"
+                self.opened_at = time.monotonic()
+            self._probe = None
+
+    def state(self) -> dict:
+        with self._lock:
+            return {"status": self.status, "consecutive_failures": self.failures}
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter, so workers don't retry in lockstep."""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+# ---------------- per (region, model) registry ----------------
+LIMITER_RATE = float(os.getenv("CLAUDE_RATE_PER_SEC", "2"))
+LIMITER_BURST = float(os.getenv("CLAUDE_BURST", "4"))
+LIMITER_MAX_RATE = float(os.getenv("CLAUDE_MAX_RATE_PER_SEC", "20"))
+BREAKER_THRESHOLD = int(os.getenv("BEDROCK_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.getenv("BEDROCK_BREAKER_COOLDOWN", "20"))
+
+
+class BedrockGuard:
+    def __init__(self):
+        self.limiter = AdaptiveLimiter(LIMITER_RATE, LIMITER_BURST, max_rate=LIMITER_MAX_RATE)
+        self.breaker = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+
+    def on_success(self) -> None:
+        self.limiter.on_success()
+        self.breaker.record_success()
+
+    def on_throttle(self) -> None:
+        self.limiter.on_throttle()
+        self.breaker.record_failure()
+
+    def state(self) -> dict:
+        return {"limiter": self.limiter.state(), "breaker": self.breaker.state()}
+
+
+_guards: Dict[Tuple[str, str], BedrockGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def bedrock_guard(region: str, model_id: str) -> BedrockGuard:
+    key = (region, model_id)
+    with _guards_lock:
+        if key not in _guards:
+            _guards[key] = BedrockGuard()
+        return _guards[key]
+
+
+def guard_states() -> Dict[str, dict]:
+    with _guards_lock:
+        items = list(_guards.items())
+    return {f"{region}/{model}": g.state() for (region, model), g in items}
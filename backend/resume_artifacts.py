@@ -0,0 +1,58 @@
+# resume_artifacts.py
+# ----------------------------------------------------
+# Read / write helpers for ResumeArtifacts (derived per-resume data:
+# Claude job profile, skill tokens, section blocks, normalized text).
+# Rows are tied to sha256(Resume.text) + ARTIFACTS_VERSION; if either
+# changed the row is stale and readers fall back to computing live.
+# The enrichment job itself lives in ai.py next to the extractors.
+# ----------------------------------------------------
+
+import hashlib
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
+from models import Resume, ResumeArtifacts
+from resume_sections import sections_for
+
+# bump when what we store changes, old rows get recomputed
+ARTIFACTS_VERSION = 1
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def fresh_artifacts(resume: Resume) -> Optional[ResumeArtifacts]:
+    """resume.artifacts if it matches the current text / version, else None."""
+    art = resume.artifacts
+    if art is None or art.version != ARTIFACTS_VERSION:
+        return None
+    if art.text_sha256 != text_digest(resume.text):
+        return None
+    return art
+
+
+def save_artifacts(db: Session, resume: Resume, **fields: Any) -> ResumeArtifacts:
+    """Upserts the row for this resume (stale rows are reset first) and commits."""
+    digest = text_digest(resume.text)
+    art = resume.artifacts
+    if art is None:
+        art = ResumeArtifacts(resume_id=resume.id)
+        resume.artifacts = art
+    if art.text_sha256 != digest or art.version != ARTIFACTS_VERSION:
+        art.job_profile = art.skill_tokens = art.blocks = art.normalized_text = None
+    art.text_sha256 = digest
+    art.version = ARTIFACTS_VERSION
+    for k, v in fields.items():
+        setattr(art, k, v)
+    db.commit()
+    return art
+
+
+def resume_block(resume: Resume, key: str) -> str:
+    """Cleaned section body, from artifacts when fresh, else from the section index."""
+    art = fresh_artifacts(resume)
+    if art is not None and art.blocks is not None:
+        return art.blocks.get(key, "")
+    return sections_for(resume).block(key)
@@ -0,0 +1,123 @@
+# resume_sections.py
+# ----------------------------------------------------
+# Section index for a resume, built in one pass over the text:
+# canonical header (SKILLS, EXPERIENCE, ...) -> [start, end) char span
+# of the section body in Resume.text. Stored in Resume.sections at
+# index time, so later lookups slice the text instead of re-splitting it.
+# Headers are matched accent-insensitively, English + French aliases.
+# ----------------------------------------------------
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# bump when the aliases / parsing change, stored indexes get rebuilt
+SECTIONS_VERSION = 1
+
+# canonical key -> header lines that open it (compared after _canon)
+SECTION_ALIASES: Dict[str, List[str]] = {
+    "PROFILE": ["PROFILE", "PROFIL", "SUMMARY"],
+    "EXPERIENCE": [
+        "PROFESSIONAL EXPERIENCE", "EXPERIENCE", "WORK EXPERIENCE",
+        "EXPERIENCE PROFESSIONNELLE", "EXPERIENCES PROFESSIONNELLES", "EXPERIENCES",
+    ],
+    "PROJECTS": ["PROJECTS PORTFOLIO", "PROJECTS", "PROJETS", "PROJETS ACADEMIQUES"],
+    "EDUCATION": ["EDUCATION", "FORMATION", "FORMATIONS", "PARCOURS ACADEMIQUE"],
+    "CERTIFICATES": ["CERTIFICATES", "CERTIFICATIONS", "CERTIFICATS"],
+    "SKILLS": ["SKILLS", "TECHNICAL SKILLS", "COMPETENCES", "COMPETENCES TECHNIQUES"],
+    "LANGUAGES": ["LANGUAGES", "LANGUES"],
+}
+
+_NON_ALPHA = re.compile(r"[^A-Z ]")
+_SPACES = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def _canon(h: str) -> str:
+    folded = unicodedata.normalize("NFKD", h or "")
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return _NON_ALPHA.sub("", folded.upper()).strip()
+
+
+_HEADER_TO_KEY: Dict[str, str] = {
+    _canon(alias): key for key, aliases in SECTION_ALIASES.items() for alias in aliases
+}
+
+# every header line we recognise (canonical form)
+SECTION_HEADERS = frozenset(_HEADER_TO_KEY)
+
+
+def section_key(label: str) -> Optional[str]:
+    """'Technical Skills' / 'Compétences' -> 'SKILLS'."""
+    return _HEADER_TO_KEY.get(_canon(label))
+
+
+def _clean_block(raw: str) -> str:
+    lines = [_SPACES.sub(" ", ln).strip() for ln in raw.replace("\r", "\n").splitlines()]
+    block = "\n".join(ln for ln in lines if ln).strip()
+    return _BLANK_LINES.sub("\n\n", block)
+
+
+class ResumeSections:
+    def __init__(self, text: str, spans: Dict[str, Tuple[int, int]]):
+        self.text = text or ""
+        self.spans = spans
+
+    @classmethod
+    def build(cls, text: str) -> "ResumeSections":
+        text = text or ""
+        # \r -> \n keeps offsets aligned with the original text
+        pieces = text.replace("\r", "\n").splitlines(keepends=True)
+
+        heads: List[Tuple[int, int, str]] = []  # (header start, body start, key)
+        pos = 0
+        for piece in pieces:
+            line = _SPACES.sub(" ", piece).strip()
+            key = _HEADER_TO_KEY.get(_canon(line)) if line else None
+            if key:
+                heads.append((pos, pos + len(piece), key))
+            pos += len(piece)
+
+        spans: Dict[str, Tuple[int, int]] = {}
+        for n, (_, body_start, key) in enumerate(heads):
+            if key in spans:
+                continue  # first occurrence wins
+            end = heads[n + 1][0] if n + 1 < len(heads) else len(text)
+            spans[key] = (body_start, end)
+        return cls(text, spans)
+
+    @classmethod
+    def from_json(cls, text: str, data: Optional[dict]) -> "ResumeSections":
+        """Stored index if it is current, otherwise rebuilt from the text."""
+        try:
+            if data and data.get("v") == SECTIONS_VERSION and data.get("len") == len(text or ""):
+                return cls(text, {k: (int(s), int(e)) for k, (s, e) in data["spans"].items()})
+        except Exception:
+            pass
+        return cls.build(text)
+
+    def to_json(self) -> dict:
+        return {
+            "v": SECTIONS_VERSION,
+            "len": len(self.text),
+            "spans": {k: [s, e] for k, (s, e) in self.spans.items()},
+        }
+
+    def block(self, *labels: str) -> str:
+        """
+        Body of the first section (in document order) matching any label,
+        with blank lines dropped and spaces collapsed; "" if there is none.
+        """
+        found = [self.spans[k] for k in {section_key(lb) or lb for lb in labels} if k in self.spans]
+        if not found:
+            return ""
+        start, end = min(found)
+        return _clean_block(self.text[start:end])
+
+    def keys(self) -> Iterable[str]:
+        return self.spans.keys()
+
+
+def sections_for(resume) -> ResumeSections:
+    """ResumeSections of a Resume row (falls back to parsing rows indexed before the column existed)."""
+    return ResumeSections.from_json(resume.text or "", getattr(resume, "sections", None))
@@ -0,0 +1,278 @@
+# retrieval.py
+# ----------------------------------------------------
+# Hybrid chunk retrieval: pgvector cosine similarity + BM25.
+# - at index time every ResumeChunk gets its term frequencies in
+#   resume_chunk_terms (+ n_tokens = doc length), see index_chunk_terms
+# - at query time BM25 is computed over the chunks of one resume from
+#   those rows only (no chunk text is re-read or re-lowercased)
+# - tokens are whole words, so "java" no longer matches "javascript";
+#   c++ / c# / node.js stay one token
+# - chunks indexed before the table existed are indexed on first use
+#   (ON CONFLICT DO NOTHING, concurrent first searches are fine)
+# - prefilter_resumes: one ANN query over every stored chunk, for the
+#   recruiter endpoint (one JD against all resumes); hybrid_rank_many
+#   then reranks the shortlisted resumes in a fixed number of queries
+# Final score = RETRIEVAL_VECTOR_WEIGHT * sim + RETRIEVAL_BM25_WEIGHT * bm25 / max(bm25)
+# ----------------------------------------------------
+
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, text as sql_text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from models import Resume, ResumeChunk, ResumeChunkTerm
+from vector_scoring import top_k_indices
+
+RETRIEVAL_VECTOR_WEIGHT = float(os.getenv("RETRIEVAL_VECTOR_WEIGHT", "0.85"))
+RETRIEVAL_BM25_WEIGHT = float(os.getenv("RETRIEVAL_BM25_WEIGHT", "0.15"))
+# how many nearest chunks pgvector hands back, and how many BM25 hits join them
+RETRIEVAL_CANDIDATES = int(os.getenv("RETRIEVAL_CANDIDATES", "12"))
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+# pgvector caps hnsw.ef_search at 1000, and an HNSW scan returns at most ef_search rows
+HNSW_MAX_EF_SEARCH = 1000
+
+_TOKEN = re.compile(r"[^\W_][\w+#]*(?:\.[^\W_][\w+#]*)*")
+_MAX_TERM_LEN = 64  # resume_chunk_terms.term
+_INSERT_BATCH = 5000  # rows per INSERT, well under Postgres' 65535 bind parameters
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall((text or "").lower()) if 1 < len(t) <= _MAX_TERM_LEN]
+
+
+def query_terms(text: str) -> List[str]:
+    # same filter the old keyword hits used (len > 2), unique, order kept
+    return list(dict.fromkeys(t for t in tokenize(text) if len(t) > 2))
+
+
+# ---------------- index time ----------------
+def _term_rows(chunks: Iterable[ResumeChunk]) -> List[dict]:
+    """Sets n_tokens on each chunk and returns its resume_chunk_terms rows."""
+    rows = []
+    for ch in chunks:
+        tokens = tokenize(ch.text)
+        ch.n_tokens = len(tokens)
+        rows.extend(
+            dict(chunk_id=ch.id, resume_id=ch.resume_id, term=term, tf=tf)
+            for term, tf in Counter(tokens).items()
+        )
+    return rows
+
+
+def index_chunk_terms(db: Session, chunks: Iterable[ResumeChunk]) -> None:
+    """Adds term rows + n_tokens for chunks that already have ids (flushed). Caller commits."""
+    db.add_all(ResumeChunkTerm(**row) for row in _term_rows(chunks))
+
+
+def _ensure_indexed(db: Session, resume_ids: Sequence[int]) -> None:
+    pending = (
+        db.query(ResumeChunk)
+          .filter(ResumeChunk.resume_id.in_(list(resume_ids)), ResumeChunk.n_tokens.is_(None))
+          .all()
+    )
+    if not pending:
+        return
+    # two first searches on the same legacy resume build the same rows;
+    # the second one skips them instead of failing on the primary key
+    rows = _term_rows(pending)
+    for i in range(0, len(rows), _INSERT_BATCH):
+        db.execute(
+            pg_insert(ResumeChunkTerm.__table__)
+            .values(rows[i:i + _INSERT_BATCH])
+            .on_conflict_do_nothing(index_elements=["chunk_id", "term"])
+        )
+    db.commit()
+
+
+# ---------------- query time ----------------
+def _bm25(rows, n_docs: int, avg_len: float) -> Dict[int, float]:
+    """rows = (chunk_id, term, tf, doc_len) of one resume."""
+    avg_len = float(avg_len or 0.0) or 1.0
+    df = Counter(term for _, term, _, _ in rows)
+    scores: Dict[int, float] = {}
+    for chunk_id, term, tf, doc_len in rows:
+        idf = math.log(1.0 + (n_docs - df[term] + 0.5) / (df[term] + 0.5))
+        norm = tf + BM25_K1 * (1.0 - BM25_B + BM25_B * (doc_len or 0) / avg_len)
+        scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (BM25_K1 + 1.0) / norm
+    return scores
+
+
+def bm25_scores(db: Session, resume_id: int, terms: Sequence[str]) -> Dict[int, float]:
+    """chunk_id -> BM25 score for the chunks of one resume that contain any of the terms."""
+    if not terms:
+        return {}
+    n_docs, avg_len = (
+        db.query(func.count(ResumeChunk.id), func.avg(ResumeChunk.n_tokens))
+          .filter(ResumeChunk.resume_id == resume_id)
+          .one()
+    )
+    if not n_docs:
+        return {}
+
+    rows = (
+        db.query(ResumeChunkTerm.chunk_id, ResumeChunkTerm.term, ResumeChunkTerm.tf, ResumeChunk.n_tokens)
+          .join(ResumeChunk, ResumeChunk.id == ResumeChunkTerm.chunk_id)
+          .filter(ResumeChunkTerm.resume_id == resume_id, ResumeChunkTerm.term.in_(list(terms)))
+          .all()
+    )
+    return _bm25(rows, n_docs, avg_len)
+
+
+def _extra_candidates(lexical: Dict[int, float], seen: set) -> List[int]:
+    best = sorted(lexical.items(), key=lambda kv: -kv[1])[:RETRIEVAL_CANDIDATES]
+    return [cid for cid, _ in best if cid not in seen]
+
+
+def _fuse(rows, lexical: Dict[int, float], top_k: int) -> List[Tuple[str, float]]:
+    """rows = (chunk_id, text, sem) candidates of one resume -> top_k (text, hybrid score)."""
+    if not rows:
+        return []
+    sem = np.array([float(v) if v is not None else 0.0 for _, _, v in rows], dtype=np.float32)
+    bm25 = np.array([lexical.get(cid, 0.0) for cid, _, _ in rows], dtype=np.float32)
+    top_bm25 = float(bm25.max())
+    if top_bm25 > 0:
+        bm25 /= top_bm25
+    scores = RETRIEVAL_VECTOR_WEIGHT * sem + RETRIEVAL_BM25_WEIGHT * bm25
+    return [(rows[i][1], float(scores[i])) for i in top_k_indices(scores, top_k)]
+
+
+def hybrid_rank(db: Session, resume_id: int, query: str, qv: Sequence[float],
+                top_k: int) -> List[Tuple[str, float]]:
+    """
+    Top chunks of a resume for the query as (text, hybrid score), best first.
+    Candidates = pgvector nearest chunks + best BM25 chunks.
+    """
+    _ensure_indexed(db, [resume_id])
+
+    distance = ResumeChunk.embedding.cosine_distance(qv)
+    sem_col = (1 - distance).label("sem")
+    rows = (
+        db.query(ResumeChunk.id, ResumeChunk.text, sem_col)
+          .filter(ResumeChunk.resume_id == resume_id)
+          .order_by(distance)
+          .limit(max(RETRIEVAL_CANDIDATES, top_k))
+          .all()
+    )
+
+    lexical = bm25_scores(db, resume_id, query_terms(query))
+    extra = _extra_candidates(lexical, {cid for cid, _, _ in rows})
+    if extra:
+        rows += db.query(ResumeChunk.id, ResumeChunk.text, sem_col).filter(ResumeChunk.id.in_(extra)).all()
+    return _fuse(rows, lexical, top_k)
+
+
+# ---------------- many resumes ----------------
+def prefilter_resumes(db: Session, qv: Sequence[float], n_chunks: int,
+                      limit: int) -> List[Tuple[int, int, float]]:
+    """
+    Nearest n_chunks chunks over all resumes (HNSW), grouped per resume and
+    kept to each user's best resume: [(resume_id, user_id, best sim)], best first.
+    """
+    n_chunks = max(1, min(n_chunks, HNSW_MAX_EF_SEARCH))
+    if db.get_bind().dialect.name == "postgresql":
+        # default ef_search (40) would cap the scan at 40 chunks
+        db.execute(sql_text(f"SET LOCAL hnsw.ef_search = {max(40, n_chunks)}"))
+
+    distance = ResumeChunk.embedding.cosine_distance(qv)
+    nearest = (
+        db.query(ResumeChunk.resume_id.label("resume_id"), distance.label("dist"))
+          .filter(ResumeChunk.embedding.isnot(None))
+          .order_by(distance)
+          .limit(n_chunks)
+          .subquery()
+    )
+    best = func.min(nearest.c.dist)
+    rows = (
+        db.query(nearest.c.resume_id, Resume.user_id, (1 - best).label("sem"))
+          .join(Resume, Resume.id == nearest.c.resume_id)
+          .group_by(nearest.c.resume_id, Resume.user_id)
+          .order_by(best)
+          .all()
+    )
+
+    out, users = [], set()
+    for resume_id, user_id, sem in rows:
+        if user_id in users:
+            continue
+        users.add(user_id)
+        out.append((resume_id, user_id, float(sem)))
+        if len(out) >= limit:
+            break
+    return out
+
+
+def hybrid_rank_many(db: Session, resume_ids: Sequence[int], query: str, qv: Sequence[float],
+                     top_k: int) -> Dict[int, List[Tuple[str, float]]]:
+    """
+    hybrid_rank for several resumes in a fixed number of queries:
+    resume_id -> top chunks as (text, hybrid score), best first.
+    """
+    resume_ids = list(dict.fromkeys(resume_ids))
+    if not resume_ids:
+        return {}
+    _ensure_indexed(db, resume_ids)
+
+    # nearest chunks per resume: row_number() over (partition by resume_id order by distance)
+    distance = ResumeChunk.embedding.cosine_distance(qv)
+    sem_col = (1 - distance).label("sem")
+    ranked = (
+        db.query(
+            ResumeChunk.id.label("id"), ResumeChunk.resume_id.label("resume_id"),
+            ResumeChunk.text.label("text"), sem_col,
+            func.row_number().over(partition_by=ResumeChunk.resume_id, order_by=distance).label("rn"),
+        )
+        .filter(ResumeChunk.resume_id.in_(resume_ids))
+        .subquery()
+    )
+    candidates: Dict[int, list] = {rid: [] for rid in resume_ids}
+    for cid, rid, text, sem in (
+        db.query(ranked.c.id, ranked.c.resume_id, ranked.c.text, ranked.c.sem)
+          .filter(ranked.c.rn <= max(RETRIEVAL_CANDIDATES, top_k))
+          .order_by(ranked.c.resume_id, ranked.c.rn)
+          .all()
+    ):
+        candidates[rid].append((cid, text, sem))
+
+    # BM25: per-resume stats and matching term rows, grouped in Python
+    lexical: Dict[int, Dict[int, float]] = {}
+    terms = query_terms(query)
+    if terms:
+        doc_stats = {
+            rid: (n_docs, avg_len)
+            for rid, n_docs, avg_len in (
+                db.query(ResumeChunk.resume_id, func.count(ResumeChunk.id), func.avg(ResumeChunk.n_tokens))
+                  .filter(ResumeChunk.resume_id.in_(resume_ids))
+                  .group_by(ResumeChunk.resume_id)
+                  .all()
+            )
+        }
+        term_rows: Dict[int, list] = {}
+        for rid, cid, term, tf, doc_len in (
+            db.query(ResumeChunkTerm.resume_id, ResumeChunkTerm.chunk_id, ResumeChunkTerm.term,
+                     ResumeChunkTerm.tf, ResumeChunk.n_tokens)
+              .join(ResumeChunk, ResumeChunk.id == ResumeChunkTerm.chunk_id)
+              .filter(ResumeChunkTerm.resume_id.in_(resume_ids), ResumeChunkTerm.term.in_(terms))
+              .all()
+        ):
+            term_rows.setdefault(rid, []).append((cid, term, tf, doc_len))
+        lexical = {rid: _bm25(rows, *doc_stats[rid]) for rid, rows in term_rows.items() if rid in doc_stats}
+
+    extra = {
+        cid: rid
+        for rid, scores in lexical.items()
+        for cid in _extra_candidates(scores, {c for c, _, _ in candidates[rid]})
+    }
+    if extra:
+        for cid, text, sem in (
+            db.query(ResumeChunk.id, ResumeChunk.text, sem_col).filter(ResumeChunk.id.in_(list(extra))).all()
+        ):
+            candidates[extra[cid]].append((cid, text, sem))
+
+    return {rid: _fuse(rows, lexical.get(rid, {}), top_k) for rid, rows in candidates.items()}
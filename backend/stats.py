@@ -0,0 +1,244 @@
+# stats.py
+# ----------------------------------------------------
+# Per-user dashboard aggregates (user_stats), kept up to date when
+# match_mem / interviewer_evaluate insert an attempt, so /ai/stats is
+# one primary-key read instead of the full history.
+# - record_match / record_interview run in the attempt's own transaction,
+#   inside a SAVEPOINT (record_rollup): a failure is logged and rolled back
+#   to the savepoint instead of losing the attempt
+# - every writer takes a per-user advisory lock first, so building a row
+#   and incrementing it never interleave (no attempt is counted twice)
+# - a user without a row (history older than the table) gets one built
+#   from their attempts the first time it is needed
+# - missing skills come from MatchAttempt.missing (match_results.py)
+# ----------------------------------------------------
+
+import os
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from models import InterviewAttempt, MatchAttempt, UserStats
+
+STATS_RECENT = int(os.getenv("STATS_RECENT", "10"))          # scores kept for the trend
+STATS_MAX_SKILLS = int(os.getenv("STATS_MAX_SKILLS", "200"))  # missing-skill counters per user
+STATS_TOP_SKILLS = 10
+
+
+def _push(recent: Optional[list], score: Optional[int]) -> list:
+    recent = list(recent or [])
+    if score is not None:
+        recent.append(int(score))
+    return recent[-STATS_RECENT:]
+
+
+def _add_missing(counts: Optional[dict], skills: Iterable[str]) -> dict:
+    c = Counter(counts or {})
+    c.update(skills)
+    if len(c) > STATS_MAX_SKILLS:
+        c = Counter(dict(c.most_common(STATS_MAX_SKILLS)))
+    return dict(c)
+
+
+# ---------------- build from history ----------------
+def _build_values(db: Session, user_id: int) -> dict:
+    m_count, m_scored, m_sum, m_best = (
+        db.query(func.count(MatchAttempt.id), func.count(MatchAttempt.score),
+                 func.coalesce(func.sum(MatchAttempt.score), 0), func.max(MatchAttempt.score))
+          .filter(MatchAttempt.user_id == user_id)
+          .one()
+    )
+    i_count, i_scored, i_sum, i_best = (
+        db.query(func.count(InterviewAttempt.id), func.count(InterviewAttempt.final_score),
+                 func.coalesce(func.sum(InterviewAttempt.final_score), 0),
+                 func.max(InterviewAttempt.final_score))
+          .filter(InterviewAttempt.user_id == user_id)
+          .one()
+    )
+
+    def recent(col, created, id_col, owner):
+        rows = (
+            db.query(col)
+              .filter(owner == user_id, col.isnot(None))
+              .order_by(created.desc(), id_col.desc())
+              .limit(STATS_RECENT)
+              .all()
+        )
+        return [int(v) for (v,) in reversed(rows)]
+
+    skill = func.unnest(MatchAttempt.missing).label("skill")
+    sub = db.query(skill).filter(MatchAttempt.user_id == user_id).subquery()
+    missing = (
+        db.query(sub.c.skill, func.count())
+          .group_by(sub.c.skill)
+          .order_by(func.count().desc())
+          .limit(STATS_MAX_SKILLS)
+          .all()
+    )
+
+    return dict(
+        user_id=user_id,
+        match_count=m_count, match_scored=m_scored, match_score_sum=int(m_sum), match_best=m_best,
+        match_recent=recent(MatchAttempt.score, MatchAttempt.created_at, MatchAttempt.id, MatchAttempt.user_id),
+        interview_count=i_count, interview_scored=i_scored, interview_score_sum=int(i_sum),
+        interview_best=i_best,
+        interview_recent=recent(InterviewAttempt.final_score, InterviewAttempt.created_at,
+                                InterviewAttempt.id, InterviewAttempt.user_id),
+        missing_counts={k: int(v) for k, v in missing},
+    )
+
+
+def _lock_user(db: Session, user_id: int) -> None:
+    # held until the transaction ends; one lock space for the user_stats writers
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtext("user_stats"), user_id)))
+
+
+def _locked_row(db: Session, user_id: int) -> Tuple[UserStats, bool]:
+    """
+    (row locked for update, built_now). Taken under the user's advisory lock:
+    a row built now counts every committed attempt plus the caller's own
+    flushed one, and an attempt still uncommitted in another transaction
+    is counted by that transaction's increment once it gets the lock.
+    """
+    _lock_user(db, user_id)
+    inserted = 0
+    if db.get(UserStats, user_id) is None:
+        inserted = db.execute(
+            pg_insert(UserStats.__table__)
+            .values(**_build_values(db, user_id))
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        ).rowcount
+    row = db.query(UserStats).filter(UserStats.user_id == user_id).with_for_update().one()
+    return row, bool(inserted)
+
+
+# ---------------- incremental updates ----------------
+def record_match(db: Session, user_id: int, score: Optional[int], missing: Iterable[str]) -> None:
+    """Call once the MatchAttempt is flushed, in its transaction (record_rollup)."""
+    row, built = _locked_row(db, user_id)
+    if built:
+        return
+    row.match_count += 1
+    if score is not None:
+        row.match_scored += 1
+        row.match_score_sum += int(score)
+        row.match_best = score if row.match_best is None else max(row.match_best, score)
+    row.match_recent = _push(row.match_recent, score)
+    row.missing_counts = _add_missing(row.missing_counts, missing)
+
+
+def record_interview(db: Session, user_id: int, score: Optional[int]) -> None:
+    """Call once the InterviewAttempt is flushed, in its transaction (record_rollup)."""
+    row, built = _locked_row(db, user_id)
+    if built:
+        return
+    row.interview_count += 1
+    if score is not None:
+        row.interview_scored += 1
+        row.interview_score_sum += int(score)
+        row.interview_best = score if row.interview_best is None else max(row.interview_best, score)
+    row.interview_recent = _push(row.interview_recent, score)
+
+
+def record_rollup(db: Session, update, *args) -> None:
+    """
+    update(db, *args) (record_match / record_interview) in a SAVEPOINT of the
+    caller's transaction, after the attempt is flushed. A rollup error rolls
+    back to the savepoint and is logged, so the attempt still commits.
+    """
+    try:
+        with db.begin_nested():
+            update(db, *args)
+    except Exception as e:
+        print("[WARN] user_stats update failed:", e)
+
+
+# ---------------- read ----------------
+def _trend(recent: List[int]) -> Optional[float]:
+    # mean of the newer half minus mean of the older half
+    if len(recent) < 2:
+        return None
+    half = len(recent) // 2
+    old, new = recent[:half], recent[-half:]
+    return round(sum(new) / len(new) - sum(old) / len(old), 1)
+
+
+def _block(count: int, scored: int, total: int, best: Optional[int], recent: Optional[list]) -> dict:
+    recent = list(recent or [])
+    return {
+        "count": count,
+        "avg": round(total / scored, 1) if scored else None,
+        "best": best,
+        "last": recent[-1] if recent else None,
+        "trend": _trend(recent),
+        "recent": recent,
+    }
+
+
+def top_missing(counts: Optional[dict], n: int = STATS_TOP_SKILLS) -> List[dict]:
+    return [{"skill": k, "count": v} for k, v in Counter(counts or {}).most_common(n)]
+
+
+def user_stats(db: Session, user_id: int) -> dict:
+    row = db.get(UserStats, user_id)
+    if row is None:
+        row, _ = _locked_row(db, user_id)
+        db.commit()
+    return {
+        "matches": _block(row.match_count, row.match_scored, row.match_score_sum,
+                          row.match_best, row.match_recent),
+        "interviews": _block(row.interview_count, row.interview_scored, row.interview_score_sum,
+                             row.interview_best, row.interview_recent),
+        "top_missing": top_missing(row.missing_counts),
+    }
+
+
+def global_stats(db: Session) -> dict:
+    """Admin view: sums over every user's rollup row (users never backfilled are not counted)."""
+    (users, m_count, m_scored, m_sum, m_best,
+     i_count, i_scored, i_sum, i_best) = db.query(
+        func.count(UserStats.user_id),
+        func.coalesce(func.sum(UserStats.match_count), 0),
+        func.coalesce(func.sum(UserStats.match_scored), 0),
+        func.coalesce(func.sum(UserStats.match_score_sum), 0),
+        func.max(UserStats.match_best),
+        func.coalesce(func.sum(UserStats.interview_count), 0),
+        func.coalesce(func.sum(UserStats.interview_scored), 0),
+        func.coalesce(func.sum(UserStats.interview_score_sum), 0),
+        func.max(UserStats.interview_best),
+    ).one()
+
+    missing: Counter = Counter()
+    for (counts,) in db.query(UserStats.missing_counts).yield_per(500):
+        missing.update(counts or {})
+
+    def block(count, scored, total, best):
+        return {"count": int(count), "avg": round(int(total) / int(scored), 1) if scored else None,
+                "best": best}
+
+    return {
+        "users": users,
+        "matches": block(m_count, m_scored, m_sum, m_best),
+        "interviews": block(i_count, i_scored, i_sum, i_best),
+        "top_missing": top_missing(missing),
+    }
+
+
+def common_missing(db: Session, family: Optional[str] = None, limit: int = 20) -> List[dict]:
+    """Most frequent missing skills over all attempts, optionally for one JD family (in Postgres)."""
+    skill = func.unnest(MatchAttempt.missing).label("skill")
+    q = db.query(skill)
+    if family:
+        q = q.filter(MatchAttempt.jd_family == family)
+    sub = q.subquery()
+    rows = (
+        db.query(sub.c.skill, func.count().label("n"))
+          .group_by(sub.c.skill)
+          .order_by(func.count().desc(), sub.c.skill)
+          .limit(limit)
+          .all()
+    )
+    return [{"skill": k, "count": int(n)} for k, n in rows]
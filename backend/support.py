@@ -1,9 +1,14 @@
 # support.py
 from fastapi import APIRouter, Depends, HTTPException, Request, Body, Path
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from db import get_db
+from typing import Optional
+from db import get_db, SessionLocal
+from pagination import keyset_page
+import json, os
 from models import Complaint, User
-from auth import get_user_from_token   
+from auth import Principal, get_principal
 from admin import require_admin        
 
 support = APIRouter(prefix="/support", tags=["support"])
@@ -16,9 +21,9 @@ def create_complaint(
     db: Session = Depends(get_db),
 ):
     # attach logged-in user 
-    me: User | None = None
+    me: Principal | None = None
     try:
-        me = get_user_from_token(request, db)
+        me = get_principal(request, db)
     except Exception:
         me = None
 
@@ -37,28 +42,75 @@ def create_complaint(
     db.add(c); db.commit(); db.refresh(c)
     return {"ok": True, "id": c.id}
 
-# Admin: list all complaints (newest first)
+# Admin: list complaints (newest first), keyset pages
+COMPLAINTS_PAGE_SIZE = int(os.getenv("COMPLAINTS_PAGE_SIZE", "100"))
+COMPLAINTS_MAX_PAGE_SIZE = 1000
+EXPORT_BATCH = int(os.getenv("ADMIN_EXPORT_BATCH", "500"))
+
+
+def _complaints_query(db: Session, status: Optional[str] = None, category: Optional[str] = None):
+    q = db.query(
+        Complaint.id, Complaint.user_id, Complaint.name, Complaint.email, Complaint.category,
+        Complaint.subject, Complaint.message, Complaint.status, Complaint.created_at,
+    )
+    if status:
+        q = q.filter(Complaint.status == status)
+    if category:
+        q = q.filter(Complaint.category == category)
+    return q
+
+
+def _complaint_item(r) -> dict:
+    return {
+        "id": r.id, "user_id": r.user_id,
+        "name": r.name, "email": r.email,
+        "category": r.category, "subject": r.subject, "message": r.message,
+        "status": r.status, "created_at": r.created_at,
+    }
+
+
 @support.get("/admin/complaints")
 def list_complaints(
-    _admin: User = Depends(require_admin),
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = COMPLAINTS_PAGE_SIZE,
+    _admin: Principal = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
-    rows = db.query(Complaint).order_by(Complaint.created_at.desc()).all()
-    return {"items": [
-        {
-            "id": r.id, "user_id": r.user_id,
-            "name": r.name, "email": r.email,
-            "category": r.category, "subject": r.subject, "message": r.message,
-            "status": r.status, "created_at": r.created_at,
-        } for r in rows
-    ]}
+    rows, next_cursor = keyset_page(
+        _complaints_query(db, status, category), Complaint.created_at, Complaint.id,
+        cursor, max(1, min(limit, COMPLAINTS_MAX_PAGE_SIZE)),
+    )
+    return {"items": [_complaint_item(r) for r in rows], "next_cursor": next_cursor}
+
+
+@support.get("/admin/complaints/export")
+def export_complaints(
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    _admin: Principal = Depends(require_admin),
+):
+    """All (filtered) complaints as NDJSON, streamed from a server-side cursor."""
+    def rows():
+        db = SessionLocal()
+        try:
+            q = _complaints_query(db, status, category).order_by(
+                Complaint.created_at.desc(), Complaint.id.desc())
+            for r in q.execution_options(stream_results=True).yield_per(EXPORT_BATCH):
+                yield json.dumps(jsonable_encoder(_complaint_item(r))) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson",
+                             headers={"Content-Disposition": 'attachment; filename="complaints.ndjson"'})
 
 # Admin: update status
 @support.patch("/admin/complaints/{cid}/status")
 def set_complaint_status(
     cid: int = Path(..., ge=1),
     body: dict = Body(...),  
-    _admin: User = Depends(require_admin),
+    _admin: Principal = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     c = db.get(Complaint, cid)
@@ -70,7 +122,7 @@ def set_complaint_status(
 @support.delete("/admin/complaints/{cid}")
 def delete_complaint(
     cid: int = Path(..., ge=1),
-    _admin: User = Depends(require_admin),
+    _admin: Principal = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     c = db.get(Complaint, cid)
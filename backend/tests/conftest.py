@@ -0,0 +1,10 @@
+# conftest.py
+# ----------------------------------------------------
+# backend modules import each other flat ("from models import ..."),
+# so tests put backend/ on sys.path the same way uvicorn's cwd does.
+# ----------------------------------------------------
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
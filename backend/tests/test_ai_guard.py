@@ -0,0 +1,82 @@
+# test_ai_guard.py
+# ----------------------------------------------------
+# ai.py's Bedrock guard wiring: 503 + Retry-After once throttle retries
+# run out, and the SSE stream's probe ticket / finalize error paths.
+# ----------------------------------------------------
+
+import itertools
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+
+import ai
+from rate_limit import bedrock_guard
+
+_models = itertools.count()
+
+
+def _chat():
+    # a model id of its own, so every test gets a fresh guard
+    return {"messages": [{"role": "user", "content": [{"text": "hi"}]}],
+            "model_id": f"test-model-{next(_models)}", "aws_region": "test-region"}
+
+
+def _throttled(*args, **kwargs):
+    raise ClientError({"Error": {"Code": "ThrottlingException"}}, "Converse")
+
+
+def _half_open(chat):
+    guard = bedrock_guard(chat["aws_region"], chat["model_id"])
+    guard.breaker.status = "open"
+    guard.breaker.opened_at = -1e9
+    return guard
+
+
+def test_exhausted_throttle_retries_are_503_with_retry_after(monkeypatch):
+    monkeypatch.setattr(ai, "invoke_chat", _throttled)
+    monkeypatch.setattr(ai.time, "sleep", lambda s: None)
+    with pytest.raises(HTTPException) as exc:
+        ai.safe_invoke_chat(retries=2, delay=4, **_chat())
+    assert exc.value.status_code == 503
+    assert int(exc.value.headers["Retry-After"]) >= 1
+
+
+def _events(monkeypatch, chat, pieces, finalize):
+    monkeypatch.setattr(ai, "stream_chat", lambda **kw: iter(pieces))
+    monkeypatch.setattr(ai, "StreamingResponse", lambda gen, **kw: gen)
+    return ai._sse_response(chat, finalize)
+
+
+def test_finalize_error_becomes_an_error_event(monkeypatch):
+    chat = _chat()
+
+    def finalize(text):
+        raise ValueError("bad json")
+
+    out = list(_events(monkeypatch, chat, ["a", "b"], finalize))
+    assert out[-1].startswith("event: error")
+    assert '"status": 500' in out[-1]
+
+
+def test_started_stream_releases_its_probe_once(monkeypatch):
+    chat = _chat()
+    guard = _half_open(chat)
+    released = []
+    release = guard.breaker.release
+    monkeypatch.setattr(guard.breaker, "release", lambda t: (released.append(t), release(t)))
+
+    gen = _events(monkeypatch, chat, ["a"], lambda text: {"ok": True})
+    out = list(gen)
+    assert out[-1].startswith("event: done")
+    del gen
+    assert len(released) == 1
+
+
+def test_unstarted_stream_frees_the_probe_when_dropped(monkeypatch):
+    chat = _chat()
+    guard = _half_open(chat)
+    gen = _events(monkeypatch, chat, ["a"], lambda text: {"ok": True})
+    assert guard.breaker.admit() is None  # probe taken by the stream
+    del gen
+    assert guard.breaker.admit() is not None
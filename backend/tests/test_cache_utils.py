@@ -0,0 +1,71 @@
+# test_cache_utils.py
+# ----------------------------------------------------
+# LRUCache: recency order, eviction, TTL (cache-wide and per entry), counters.
+# ----------------------------------------------------
+
+import cache_utils
+from cache_utils import LRUCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 500.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_evicts_least_recently_used():
+    c = LRUCache(maxsize=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1  # "b" is now the oldest
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert (c.get("a"), c.get("c")) == (1, 3)
+    assert c.stats()["evictions"] == 1
+
+
+def test_overwrite_does_not_evict():
+    c = LRUCache(maxsize=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.set("a", 10)
+    assert len(c) == 2 and c.get("a") == 10 and c.get("b") == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_utils.time, "monotonic", clock)
+    c = LRUCache(maxsize=10, ttl=5)
+    c.set("a", 1)
+    c.set("b", 2, ttl=60)  # per-entry TTL wins over the cache default
+    clock.now += 4.9
+    assert c.get("a") == 1
+    clock.now += 0.1
+    assert c.get("a", "gone") == "gone"
+    assert c.get("b") == 2
+    assert len(c) == 1  # expired entries are dropped on read
+
+
+def test_no_ttl_never_expires(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_utils.time, "monotonic", clock)
+    c = LRUCache(maxsize=10)
+    c.set("a", 1)
+    clock.now += 10 ** 6
+    assert c.get("a") == 1
+
+
+def test_counters_pop_and_clear():
+    c = LRUCache(maxsize=0)  # clamped to 1
+    assert c.maxsize == 1
+    c.get("x")
+    c.set("x", None)
+    assert c.get("x", "default") is None  # a stored None is a hit
+    assert c.pop("x") is None and c.pop("x", 7) == 7
+    c.set("y", 1)
+    c.clear()
+    assert len(c) == 0
+    s = c.stats()
+    assert (s["hits"], s["misses"]) == (1, 1)
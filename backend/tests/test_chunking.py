@@ -0,0 +1,124 @@
+# test_chunking.py
+# ----------------------------------------------------
+# Golden test: chunking.token_aware_chunks must return exactly what the
+# old quadratic version in ai.py returned, wherever that one terminated.
+# The old loop re-emitted the same window forever when the overlap tail
+# plus the next sentence was over max_tokens; _reference raises there.
+# ----------------------------------------------------
+
+import random
+import re
+
+import pytest
+
+from chunking import token_aware_chunks
+
+
+class Hang(Exception):
+    pass
+
+
+def _reference(text: str, max_tokens: int = 700, overlap: int = 80):
+    """ai.token_aware_chunks before chunking.py, plus a repeat guard."""
+    text = re.sub(r'\s+', ' ', text).strip()
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    chunks, cur, cur_tokens = [], [], 0
+    seen = set()
+
+    def est_tokens(s: str) -> int:
+        return max(1, int(len(s.split()) / 0.75))
+
+    i = 0
+    while i < len(sentences):
+        s = sentences[i]
+        t = est_tokens(s)
+        if cur_tokens + t <= max_tokens or not cur:
+            cur.append(s); cur_tokens += t; i += 1
+        else:
+            if (i, len(cur)) in seen:
+                raise Hang()
+            seen.add((i, len(cur)))
+            chunk = ' '.join(cur).strip()
+            if chunk:
+                chunks.append(chunk)
+            prefix, tok = [], 0
+            for s_back in reversed(cur):
+                tok += est_tokens(s_back)
+                prefix.append(s_back)
+                if tok >= overlap:
+                    break
+            cur = list(reversed(prefix))
+            cur_tokens = sum(est_tokens(x) for x in cur)
+    last = ' '.join(cur).strip()
+    if last:
+        chunks.append(last)
+    return chunks
+
+
+def _sentence(rng: random.Random, n_words: int) -> str:
+    words = [f"w{rng.randrange(1000)}" for _ in range(n_words)]
+    return " ".join(words) + rng.choice([".", "!", "?"])
+
+
+def _doc(seed: int, n_sentences: int, max_words: int) -> str:
+    rng = random.Random(seed)
+    seps = [" ", "  ", "\n", "\n\n", "\t "]
+    return "".join(_sentence(rng, rng.randint(1, max_words)) + rng.choice(seps)
+                   for _ in range(n_sentences))
+
+
+FIXED = [
+    # sentence boundaries, whitespace runs, no trailing punctuation
+    ("One. Two!  Three?\nFour.\n\nFive", 3, 1),
+    ("Python developer. Built APIs with FastAPI!   Led a team of five? Shipped.", 12, 3),
+    ("no sentence end at all just words " * 20, 50, 10),
+    ("", 700, 80),
+    ("Single sentence.", 700, 80),
+    # one sentence longer than max_tokens: kept whole (the old loop hung on one
+    # after a non-empty window, so only the lone case is comparable)
+    ("very " * 300 + "long sentence.", 40, 2),
+    # overlap spanning more than one sentence
+    (" ".join(f"Sentence number {k} here." for k in range(40)), 30, 12),
+    # tail + next sentence over max_tokens hung the reference: see the tests below
+]
+
+
+@pytest.mark.parametrize("text,max_tokens,overlap", FIXED)
+def test_matches_reference_on_fixed_inputs(text, max_tokens, overlap):
+    assert token_aware_chunks(text, max_tokens, overlap) == _reference(text, max_tokens, overlap)
+
+
+def test_matches_reference_on_generated_documents():
+    compared = 0
+    for seed in range(60):
+        text = _doc(seed, n_sentences=40, max_words=30)
+        for max_tokens, overlap in [(700, 80), (120, 20), (60, 25), (40, 0), (25, 5)]:
+            try:
+                expected = _reference(text, max_tokens, overlap)
+            except Hang:
+                continue
+            assert token_aware_chunks(text, max_tokens, overlap) == expected, (seed, max_tokens, overlap)
+            compared += 1
+    assert compared > 100
+
+
+def test_terminates_where_reference_hung():
+    # the tail kept after the first chunk (whole window, 16 tokens < overlap)
+    # plus the next sentence is over max_tokens
+    text = " ".join(["Aa bb cc."] * 6)
+    with pytest.raises(Hang):
+        _reference(text, max_tokens=16, overlap=40)
+    chunks = token_aware_chunks(text, max_tokens=16, overlap=40)
+    assert chunks
+    assert all(len(c.split()) <= 12 for c in chunks)
+    assert " ".join(chunks).count("Aa") >= 6
+
+
+def test_over_long_sentence_mid_document():
+    long = "very " * 300 + "long sentence."
+    text = f"Short one. Short two. {long} Short three."
+    with pytest.raises(Hang):
+        _reference(text, max_tokens=40, overlap=2)
+    assert token_aware_chunks(text, max_tokens=40, overlap=2) == [
+        "Short one. Short two.", long, "Short three.",
+    ]
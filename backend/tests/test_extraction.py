@@ -0,0 +1,71 @@
+# test_extraction.py
+# ----------------------------------------------------
+# extraction._run timeouts: the deadline starts when a job starts running
+# in a worker, and a timed-out job never takes other requests down with it.
+# ----------------------------------------------------
+
+import asyncio
+import os
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import extraction
+
+
+def nap(seconds: float) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def busy_forever() -> None:
+    # pure-Python hang with a fallback, like a stuck pdfplumber parse
+    while True:
+        try:
+            time.sleep(0.05)
+        except Exception:
+            pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    def make(workers: int, timeout: float):
+        monkeypatch.setattr(extraction, "EXTRACT_WORKERS", workers)
+        monkeypatch.setattr(extraction, "EXTRACT_TIMEOUT", timeout)
+        extraction.shutdown_pool()
+        return extraction._get_pool()
+
+    yield make
+    extraction.shutdown_pool()
+
+
+def test_time_spent_queued_does_not_count(pool):
+    pool(workers=1, timeout=1.0)
+
+    async def both():
+        # the second job waits ~0.7s for the only worker, then runs 0.5s
+        return await asyncio.gather(extraction._run(nap, 0.7), extraction._run(nap, 0.5))
+
+    pids = asyncio.run(both())
+    assert len(pids) == 2
+
+
+def test_hung_job_times_out_without_touching_others(pool):
+    first = pool(workers=2, timeout=1.0)
+
+    async def scenario():
+        hung = asyncio.ensure_future(extraction._run(busy_forever))
+        fast = await extraction._run(nap, 0.1)
+        with pytest.raises(HTTPException) as exc:
+            await hung
+        return fast, exc.value
+
+    fast_pid, err = asyncio.run(scenario())
+    assert err.status_code == 504
+    assert extraction._get_pool() is first
+    # every worker (including the one that ran the hung job) is still serving
+    pids = {p.pid for p in first._processes.values()}
+    assert fast_pid in pids and len(pids) == 2
+    assert all(p.is_alive() for p in first._processes.values())
+    assert asyncio.run(extraction._run(nap, 0)) in pids
@@ -0,0 +1,66 @@
+# test_match_results.py
+# ----------------------------------------------------
+# Claude match JSON -> MatchAttempt columns, and jd_family normalization.
+# ----------------------------------------------------
+
+import json
+
+import pytest
+
+from match_results import jd_family, match_fields, parse_match_json
+
+
+RAW = {
+    "score": 78.6,
+    "highlights": ["  Built REST   APIs ", "", None, "Led a team"],
+    "missing": ["Docker", "docker", " Kubernetes ", None, "AWS"],
+}
+
+
+@pytest.mark.parametrize("raw", [
+    RAW,
+    json.dumps(RAW),
+    "```json\n" + json.dumps(RAW) + "\n```",
+])
+def test_match_fields_from_dict_string_or_fenced(raw):
+    fields = match_fields(raw, "Senior Backend Engineer")
+    assert fields["result"] == RAW
+    assert fields["score"] == 79
+    assert fields["highlights"] == ["Built REST APIs", "Led a team"]
+    assert fields["missing"] == ["docker", "kubernetes", "aws"]
+    assert fields["jd_family"] == "backend engineer"
+
+
+def test_match_fields_unreadable_output():
+    fields = match_fields("Claude says: no JSON here", "Data Analyst")
+    assert fields == {
+        "result": None, "score": None, "highlights": [], "missing": [],
+        "jd_family": "data analyst",
+    }
+
+
+@pytest.mark.parametrize("score,expected", [(-5, 0), (150, 100), ("64.4", 64), ("n/a", None)])
+def test_score_clamped_and_rounded(score, expected):
+    assert match_fields({"score": score})["score"] == expected
+
+
+def test_parse_match_json_rejects_non_objects():
+    assert parse_match_json("[1, 2]") == {}
+    assert parse_match_json(None) == {}
+
+
+@pytest.mark.parametrize("title,family", [
+    ("Senior Backend Engineer (Python)", "backend engineer python"),
+    ("Jr. C++ / C# Developer", "c++ c# developer"),
+    ("Ingénieur Logiciel - Stage", "ingenieur logiciel"),
+    ("Data Scientist II", "data scientist"),
+    ("Senior Lead", None),
+    ("", None),
+    (None, None),
+])
+def test_jd_family(title, family):
+    assert jd_family(title) == family
+
+
+def test_jd_family_is_capped():
+    assert len(jd_family("word " * 100)) <= 120
@@ -0,0 +1,85 @@
+# test_principal_cache.py
+# ----------------------------------------------------
+# get_principal's per-token cache: hits are re-checked against the users
+# row, so changes committed by another worker (no invalidate_principal
+# in this process) apply on the next request.
+# ----------------------------------------------------
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+import auth
+from models import Base, Profile, Role, User
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(auth, "_principals", auth.LRUCache(maxsize=16))
+    monkeypatch.setattr(auth, "_user_versions", auth.LRUCache(maxsize=16, ttl=60))
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Role.__table__, User.__table__, Profile.__table__])
+    session = sessionmaker(bind=engine)()
+    session.add_all([Role(id=1, name="admin"), Role(id=2, name="user")])
+    session.add(User(id=7, email="a@x.io", hashed_password="h1", role_id=1))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _request(token: str) -> Request:
+    return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
+def _other_worker(db, **changes):
+    # committed elsewhere: this process never calls invalidate_principal
+    db.query(User).filter(User.id == 7).update(changes)
+    db.commit()
+    db.expire_all()
+
+
+def test_cache_hit_skips_the_full_load(db, monkeypatch):
+    req = _request(auth.create_token({"sub": "a@x.io"}))
+    assert auth.get_principal(req, db).role == "admin"
+    loads = []
+    load = auth._load_principal
+    monkeypatch.setattr(auth, "_load_principal", lambda *a: loads.append(1) or load(*a))
+    assert auth.get_principal(req, db).role == "admin"
+    assert loads == []
+
+
+def test_demotion_in_another_worker_applies_immediately(db):
+    req = _request(auth.create_token({"sub": "a@x.io"}))
+    assert auth.get_principal(req, db).role == "admin"
+    _other_worker(db, role_id=2)
+    assert auth.get_principal(req, db).role == "user"
+
+
+def test_password_change_in_another_worker_reloads(db, monkeypatch):
+    req = _request(auth.create_token({"sub": "a@x.io"}))
+    auth.get_principal(req, db)
+    _other_worker(db, hashed_password="h2")
+    loads = []
+    load = auth._load_principal
+    monkeypatch.setattr(auth, "_load_principal", lambda *a: loads.append(1) or load(*a))
+    auth.get_principal(req, db)
+    assert loads == [1]
+
+
+def test_deleted_user_is_rejected(db):
+    req = _request(auth.create_token({"sub": "a@x.io"}))
+    auth.get_principal(req, db)
+    db.query(User).filter(User.id == 7).delete()
+    db.commit()
+    with pytest.raises(HTTPException) as exc:
+        auth.get_principal(req, db)
+    assert exc.value.status_code == 404
+
+
+def test_versions_are_bounded(monkeypatch):
+    monkeypatch.setattr(auth, "_user_versions", auth.LRUCache(maxsize=3, ttl=60))
+    for i in range(10):
+        auth.invalidate_principal(f"u{i}@x.io")
+    assert len(auth._user_versions) == 3
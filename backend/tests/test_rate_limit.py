@@ -0,0 +1,125 @@
+# test_rate_limit.py
+# ----------------------------------------------------
+# CircuitBreaker state transitions, including the half-open probe slot.
+# ----------------------------------------------------
+
+import rate_limit
+from rate_limit import CLOSED_TICKET, CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(monkeypatch, threshold=2, cooldown=10.0):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return CircuitBreaker(threshold=threshold, cooldown=cooldown), clock
+
+
+def _open(br, clock):
+    for _ in range(br.threshold):
+        br.record_failure()
+    assert br.status == "open"
+    clock.now += br.cooldown
+
+
+def test_opens_after_threshold_consecutive_failures(monkeypatch):
+    br, _ = _breaker(monkeypatch, threshold=3)
+    br.record_failure()
+    br.record_failure()
+    assert br.status == "closed" and br.allow()
+    br.record_failure()
+    assert br.status == "open"
+    assert not br.allow()
+
+
+def test_success_resets_failure_count(monkeypatch):
+    br, _ = _breaker(monkeypatch, threshold=2)
+    br.record_failure()
+    br.record_success()
+    br.record_failure()
+    assert br.status == "closed"
+
+
+def test_half_open_admits_a_single_probe(monkeypatch):
+    br, clock = _breaker(monkeypatch)
+    br.record_failure()
+    br.record_failure()
+    clock.now += 9.0
+    assert br.admit() is None
+    clock.now += 1.0
+    probe = br.admit()
+    assert probe is not None and probe is not CLOSED_TICKET
+    assert br.status == "half_open"
+    assert br.admit() is None
+
+
+def test_probe_success_closes(monkeypatch):
+    br, clock = _breaker(monkeypatch)
+    _open(br, clock)
+    ticket = br.admit()
+    br.record_success()
+    br.release(ticket)
+    assert br.status == "closed"
+    assert br.admit() is CLOSED_TICKET
+
+
+def test_probe_failure_reopens(monkeypatch):
+    br, clock = _breaker(monkeypatch)
+    _open(br, clock)
+    ticket = br.admit()
+    br.record_failure()
+    br.release(ticket)
+    assert br.status == "open"
+    assert br.admit() is None
+    assert br.retry_after() == 10
+
+
+def test_released_probe_frees_the_slot_without_changing_state(monkeypatch):
+    br, clock = _breaker(monkeypatch)
+    _open(br, clock)
+    ticket = br.admit()
+    br.release(ticket)  # e.g. ValidationException or client disconnect
+    assert br.status == "half_open"
+    assert br.admit() not in (None, CLOSED_TICKET)
+
+
+def test_release_of_a_closed_ticket_keeps_the_probe(monkeypatch):
+    br, clock = _breaker(monkeypatch)
+    early = br.admit()  # admitted before the circuit opened
+    _open(br, clock)
+    assert br.admit() not in (None, CLOSED_TICKET)
+    br.release(early)
+    assert br.admit() is None
+
+
+def test_stale_probe_release_keeps_the_current_probe(monkeypatch):
+    br, clock = _breaker(monkeypatch)
+    _open(br, clock)
+    first = br.admit()
+    br.release(first)
+    second = br.admit()
+    assert second is not None and second is not first
+    br.release(first)  # e.g. a second release of the first call
+    assert br.admit() is None
+    br.release(second)
+    br.release(second)
+    assert br.admit() not in (None, CLOSED_TICKET)
+
+
+def test_late_release_after_reopen_is_a_noop(monkeypatch):
+    br, clock = _breaker(monkeypatch)
+    _open(br, clock)
+    first = br.admit()
+    br.record_failure()
+    clock.now += br.cooldown
+    second = br.admit()
+    br.release(first)
+    assert br.admit() is None
+    br.release(second)
+    assert br.admit() not in (None, CLOSED_TICKET)
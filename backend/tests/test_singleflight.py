@@ -0,0 +1,46 @@
+# test_singleflight.py
+# ----------------------------------------------------
+# chat_single_flight: identical deterministic chat calls share one
+# upstream call, sampled ones (above the cache temperature) never do.
+# ----------------------------------------------------
+
+import threading
+import time
+
+from bedrock_client import CHAT_CACHE_MAX_TEMPERATURE, chat_single_flight
+
+MESSAGES = [{"role": "user", "content": [{"text": "hello"}]}]
+
+
+def _run_concurrently(temperature: float, n: int = 3) -> int:
+    calls = []
+    release = threading.Event()
+
+    def upstream():
+        calls.append(1)
+        release.wait(2)
+        return "answer"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            chat_single_flight(upstream, messages=MESSAGES, temperature=temperature)))
+        for _ in range(n)
+    ]
+    for t in threads:
+        t.start()
+    # let every caller reach the flight before the leader returns
+    time.sleep(0.2)
+    release.set()
+    for t in threads:
+        t.join()
+    assert results == ["answer"] * n
+    return len(calls)
+
+
+def test_deterministic_calls_coalesce():
+    assert _run_concurrently(0.0) == 1
+
+
+def test_sampled_calls_run_on_their_own():
+    assert _run_concurrently(CHAT_CACHE_MAX_TEMPERATURE + 0.5) == 3
@@ -0,0 +1,186 @@
+# test_stats.py
+# ----------------------------------------------------
+# Pure helpers behind /ai/stats, record_rollup's error handling, and two
+# concurrent first attempts of a user without a rollup row.
+# ----------------------------------------------------
+
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from sqlalchemy.sql.dml import Insert
+
+import stats
+from stats import _add_missing, _block, _push, _trend, record_match, record_rollup, top_missing
+
+
+def test_trend_needs_two_scores():
+    assert _trend([]) is None
+    assert _trend([70]) is None
+
+
+def test_trend_is_newer_half_minus_older_half():
+    assert _trend([50, 70]) == 20.0
+    assert _trend([60, 60, 80, 90]) == 25.0
+    # odd length: the middle score is left out of both halves
+    assert _trend([40, 100, 60]) == 20.0
+    assert _trend([90, 80, 70, 60]) == -20.0
+
+
+def test_push_keeps_the_last_scores(monkeypatch):
+    monkeypatch.setattr(stats, "STATS_RECENT", 3)
+    assert _push(None, 5) == [5]
+    assert _push([1, 2, 3], 4) == [2, 3, 4]
+    assert _push([1, 2], None) == [1, 2]
+
+
+def test_add_missing_counts_and_caps(monkeypatch):
+    monkeypatch.setattr(stats, "STATS_MAX_SKILLS", 2)
+    counts = _add_missing(None, ["docker", "sql"])
+    assert counts == {"docker": 1, "sql": 1}
+    counts = _add_missing(counts, ["docker", "aws"])
+    assert counts == {"docker": 2, "sql": 1} or counts == {"docker": 2, "aws": 1}
+    assert _add_missing({"go": 3}, []) == {"go": 3}
+
+
+def test_block_and_top_missing():
+    assert _block(0, 0, 0, None, None) == {
+        "count": 0, "avg": None, "best": None, "last": None, "trend": None, "recent": [],
+    }
+    b = _block(3, 2, 150, 90, [60, 90])
+    assert (b["avg"], b["last"], b["trend"]) == (75.0, 90, 30.0)
+    assert top_missing({"a": 1, "b": 3, "c": 2}, 2) == [
+        {"skill": "b", "count": 3}, {"skill": "c", "count": 2},
+    ]
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    @contextmanager
+    def begin_nested(self):
+        self.calls.append("savepoint")
+        try:
+            yield
+        except Exception:
+            self.calls.append("rollback to savepoint")
+            raise
+        self.calls.append("release savepoint")
+
+
+def test_record_rollup_runs_in_a_savepoint():
+    db, seen = FakeSession(), []
+    record_rollup(db, lambda d, *a: seen.append(a), 7, 80)
+    assert seen == [(7, 80)] and db.calls == ["savepoint", "release savepoint"]
+
+
+def test_record_rollup_swallows_rollup_errors(capsys):
+    def boom(db, *args):
+        raise RuntimeError("lock timeout")
+
+    db = FakeSession()
+    record_rollup(db, boom, 7, 80)
+    assert db.calls == ["savepoint", "rollback to savepoint"]
+    assert "[WARN]" in capsys.readouterr().out
+
+
+# ---------------- concurrent first attempts ----------------
+class Store:
+    """Committed state of one user: attempts, the rollup row, the advisory lock."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.row = None
+        self.lock = threading.Lock()
+        self.log = []
+
+
+class TxSession:
+    """
+    Just enough of a Session for _locked_row / record_match, with
+    READ COMMITTED visibility: other transactions' attempts and rows
+    show up only once they commit.
+    """
+
+    def __init__(self, store, name):
+        self.store, self.name = store, name
+        self.pending = 0      # this transaction's flushed attempts
+        self.inserted = None  # rollup row inserted by this transaction
+        self.locked = False
+
+    def add_attempt(self):
+        self.pending += 1
+
+    def execute(self, stmt):
+        if isinstance(stmt, Insert):
+            if self.store.row is not None:
+                return SimpleNamespace(rowcount=0)  # ON CONFLICT DO NOTHING
+            self.inserted = SimpleNamespace(**self.built)
+            return SimpleNamespace(rowcount=1)
+        self.store.lock.acquire()  # pg_advisory_xact_lock
+        self.locked = True
+        self.store.log.append(f"{self.name} locked")
+
+    def get(self, model, user_id):
+        self.store.log.append(f"{self.name} get")
+        return self.inserted or self.store.row
+
+    def query(self, model):
+        row = self.inserted or self.store.row
+        q = SimpleNamespace(one=lambda: row)
+        q.filter = lambda *a: q
+        q.with_for_update = lambda: q
+        return q
+
+    @contextmanager
+    def begin_nested(self):
+        yield
+
+    def commit(self):
+        self.store.attempts += self.pending
+        if self.inserted is not None:
+            self.store.row = self.inserted
+        self.store.log.append(f"{self.name} commit")
+        if self.locked:
+            self.store.lock.release()
+
+
+def _built_values(store, building):
+    def build(db, user_id):
+        building.set()
+        time.sleep(0.1)  # the other transaction reaches the lock meanwhile
+        db.built = dict(
+            user_id=user_id, match_count=store.attempts + db.pending, match_scored=0,
+            match_score_sum=0, match_best=None, match_recent=[], interview_count=0,
+            interview_scored=0, interview_score_sum=0, interview_best=None,
+            interview_recent=[], missing_counts={},
+        )
+        return db.built
+    return build
+
+
+def test_concurrent_first_attempts_are_counted_once(monkeypatch):
+    store, building = Store(), threading.Event()
+    monkeypatch.setattr(stats, "_build_values", _built_values(store, building))
+    a, b = TxSession(store, "a"), TxSession(store, "b")
+
+    def attempt(db, wait=None):
+        db.add_attempt()
+        if wait is not None:
+            wait.wait(2)
+        record_rollup(db, record_match, 7, None, [])
+        db.commit()
+
+    threads = [threading.Thread(target=attempt, args=(a,)),
+               threading.Thread(target=attempt, args=(b, building))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert store.attempts == 2
+    assert store.row.match_count == 2
+    # b only looks for the row once a's build is committed
+    assert store.log == ["a locked", "a get", "a commit", "b locked", "b get", "b commit"]
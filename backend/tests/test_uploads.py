@@ -0,0 +1,80 @@
+# test_uploads.py
+# ----------------------------------------------------
+# spooled_upload: hashing off UploadFile.file, size cap, magic bytes,
+# PDF page cap at upload time.
+# ----------------------------------------------------
+
+import asyncio
+import hashlib
+import io
+import tempfile
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PyPDF2 import PdfWriter
+
+import uploads
+
+
+def _pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def _upload(name: str, data: bytes) -> UploadFile:
+    f = tempfile.SpooledTemporaryFile(max_size=16)
+    f.write(data)
+    f.seek(0)
+    return UploadFile(f, size=len(data), filename=name)
+
+
+def _open(name: str, data: bytes):
+    async def go():
+        async with uploads.spooled_upload(_upload(name, data)) as up:
+            return up.size, up.sha256, up.source
+
+    return asyncio.run(go())
+
+
+def test_hashes_the_request_file_in_place():
+    data = b"plain resume text " * 100
+    size, digest, source = _open("cv.txt", data)
+    assert size == len(data)
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert source == data
+
+
+def test_pdf_within_page_cap(monkeypatch):
+    monkeypatch.setattr(uploads, "EXTRACT_MAX_PAGES", 3)
+    data = _pdf(3)
+    assert _open("cv.pdf", data)[2] == data
+
+
+def test_pdf_over_page_cap_rejected_at_upload(monkeypatch):
+    monkeypatch.setattr(uploads, "EXTRACT_MAX_PAGES", 3)
+    with pytest.raises(HTTPException) as exc:
+        _open("cv.pdf", _pdf(4))
+    assert exc.value.status_code == 400
+    assert "4 pages" in exc.value.detail
+
+
+@pytest.mark.parametrize("name, data, status", [
+    ("cv.pdf", b"not a pdf", 400),
+    ("cv.docx", b"not a zip", 400),
+    ("cv.txt", b"", 400),
+])
+def test_rejected(name, data, status):
+    with pytest.raises(HTTPException) as exc:
+        _open(name, data)
+    assert exc.value.status_code == status
+
+
+def test_too_large(monkeypatch):
+    monkeypatch.setattr(uploads, "EXTRACT_MAX_BYTES", 10)
+    with pytest.raises(HTTPException) as exc:
+        _open("cv.txt", b"x" * 11)
+    assert exc.value.status_code == 413
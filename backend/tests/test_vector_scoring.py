@@ -0,0 +1,72 @@
+# test_vector_scoring.py
+# ----------------------------------------------------
+# top_k_indices ordering (ties, k > n, empty input) and ChunkMatrix
+# scoring against the scalar cos_sim, zero / missing rows included.
+# ----------------------------------------------------
+
+import numpy as np
+import pytest
+
+from vector_scoring import ChunkMatrix, cos_sim, top_k_indices
+
+
+def test_top_k_best_first():
+    scores = np.array([0.1, 0.9, 0.5, 0.7], dtype=np.float32)
+    assert top_k_indices(scores, 2).tolist() == [1, 3]
+
+
+def test_top_k_ties_keep_input_order():
+    scores = np.array([0.5, 0.8, 0.5, 0.8, 0.5], dtype=np.float32)
+    assert top_k_indices(scores, 5).tolist() == [1, 3, 0, 2, 4]
+    assert top_k_indices(scores, 2).tolist() == [1, 3]
+
+
+def test_top_k_more_than_n_returns_everything_sorted():
+    scores = np.array([0.2, 0.6, 0.4], dtype=np.float32)
+    assert top_k_indices(scores, 10).tolist() == [1, 2, 0]
+
+
+def test_top_k_empty_scores():
+    assert top_k_indices(np.empty(0, dtype=np.float32), 3).tolist() == []
+
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_top_k_nonpositive_k(k):
+    assert top_k_indices(np.ones(3, dtype=np.float32), k).tolist() == []
+
+
+def test_scores_match_cos_sim():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(20, 16)).tolist()
+    query = rng.normal(size=16).tolist()
+    got = ChunkMatrix(vectors).scores(query)
+    want = [cos_sim(v, query) for v in vectors]
+    np.testing.assert_allclose(got, want, rtol=1e-5, atol=1e-6)
+
+
+def test_zero_norm_and_bad_rows_score_zero():
+    m = ChunkMatrix([[1.0, 0.0], [0.0, 0.0], None, [1.0, 2.0, 3.0], [0.0, 3.0]])
+    assert m.dim == 2 and len(m) == 5
+    assert m.scores([1.0, 1.0]).tolist() == pytest.approx([2 ** -0.5, 0.0, 0.0, 0.0, 2 ** -0.5])
+
+
+def test_zero_or_wrong_size_query_scores_zero():
+    m = ChunkMatrix([[1.0, 0.0], [0.0, 1.0]])
+    assert m.scores([0.0, 0.0]).tolist() == [0.0, 0.0]
+    assert m.scores([1.0, 0.0, 0.0]).tolist() == [0.0, 0.0]
+    assert m.scores(None).tolist() == [0.0, 0.0]
+
+
+def test_empty_matrix():
+    m = ChunkMatrix([])
+    assert len(m) == 0 and m.dim == 0
+    assert m.scores([1.0, 2.0]).tolist() == []
+    assert m.top_k([1.0, 2.0], 3) == []
+
+
+def test_top_k_pairs():
+    m = ChunkMatrix([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+    top = m.top_k([1.0, 0.0], 2)
+    assert [i for i, _ in top] == [0, 2]
+    assert top[0][1] == pytest.approx(1.0)
+    assert top[1][1] == pytest.approx(2 ** -0.5)
@@ -0,0 +1,57 @@
+# backfill_match_results.py
+# ----------------------------------------------------
+# Fills result / highlights / missing / jd_family for match_attempts
+# stored before those columns existed (when to run it: see the header of
+# migrations/009_match_attempt_results.sql). Walks the table by id in
+# batches and commits per batch, so it can be stopped and re-run.
+#   cd backend && python tools/backfill_match_results.py
+# ----------------------------------------------------
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from db import SessionLocal  # noqa: E402
+from match_results import match_fields  # noqa: E402
+from models import MatchAttempt  # noqa: E402
+
+BATCH = int(os.getenv("BACKFILL_BATCH", "500"))
+
+
+def main() -> None:
+    db = SessionLocal()
+    last_id, done = 0, 0
+    try:
+        while True:
+            rows = (
+                db.query(MatchAttempt.id, MatchAttempt.raw_json, MatchAttempt.job_title)
+                  .filter(MatchAttempt.id > last_id, MatchAttempt.result.is_(None),
+                          MatchAttempt.raw_json.isnot(None))
+                  .order_by(MatchAttempt.id)
+                  .limit(BATCH)
+                  .all()
+            )
+            if not rows:
+                break
+            updates = []
+            for row_id, raw, title in rows:
+                fields = match_fields(raw, title)
+                fields.pop("score")  # keep the score stored at the time
+                updates.append({"id": row_id, **fields})
+            db.bulk_update_mappings(MatchAttempt, updates)
+            db.commit()
+            last_id = rows[-1][0]
+            done += len(rows)
+            print(f"[OK] backfilled {done} match attempts (last id {last_id})")
+    finally:
+        db.close()
+    print(f"[OK] done, {done} rows")
+
+
+if __name__ == "__main__":
+    main()
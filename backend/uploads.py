@@ -0,0 +1,129 @@
+# uploads.py
+# ----------------------------------------------------
+# Checks and hashing for resume uploads, straight off Starlette's
+# UploadFile.file (already spooled to memory / disk by the form parser,
+# so nothing is copied into a second spool):
+# - size cap (EXTRACT_MAX_BYTES, 413) from the declared size, then
+#   re-checked while hashing in UPLOAD_CHUNK_BYTES pieces
+# - cheap sniffing up front: magic bytes, DOCX zip-bomb check,
+#   PDF page cap (EXTRACT_MAX_PAGES) before any text is parsed
+# ----------------------------------------------------
+
+import hashlib
+import os
+import zipfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, BinaryIO, Optional
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from PyPDF2 import PdfReader
+
+from extraction import EXTRACT_MAX_BYTES, EXTRACT_MAX_PAGES
+
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(64 * 1024)))
+DOCX_MAX_UNZIPPED_BYTES = int(os.getenv("DOCX_MAX_UNZIPPED_BYTES", str(50 * 1024 * 1024)))
+
+
+class SpooledUpload:
+    """One upload, read from the request's own spooled file."""
+
+    def __init__(self, file: UploadFile):
+        self.filename = file.filename or ""
+        self.file: BinaryIO = file.file
+        self.size = 0
+        self.sha256 = ""
+        self._data: Optional[bytes] = None
+
+    @property
+    def source(self) -> bytes:
+        """What the extractors take."""
+        return self.read_bytes()
+
+    def head(self, n: int) -> bytes:
+        self.file.seek(0)
+        return self.file.read(n)
+
+    def read_bytes(self) -> bytes:
+        """Whole file, read once (extractors, job queue payload)."""
+        if self._data is None:
+            self.file.seek(0)
+            self._data = self.file.read()
+        return self._data
+
+    def close(self) -> None:
+        # the file itself belongs to the request, Starlette closes it
+        self._data = None
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(413, f"File too large (max {EXTRACT_MAX_BYTES // (1024 * 1024)} MB).")
+
+
+def _hash(upload: SpooledUpload) -> None:
+    digest = hashlib.sha256()
+    upload.file.seek(0)
+    while True:
+        chunk = upload.file.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        upload.size += len(chunk)
+        if upload.size > EXTRACT_MAX_BYTES:
+            raise _too_large()
+        digest.update(chunk)
+    upload.sha256 = digest.hexdigest()
+
+
+def _pdf_pages(upload: SpooledUpload) -> Optional[int]:
+    upload.file.seek(0)
+    try:
+        return len(PdfReader(upload.file).pages)
+    except Exception:
+        return None  # PyPDF2 can't read it; extraction lets pdfplumber try
+
+
+def _sniff(upload: SpooledUpload) -> None:
+    name = upload.filename.lower()
+    head = upload.head(8)
+    if name.endswith(".pdf"):
+        if not head.startswith(b"%PDF"):
+            raise HTTPException(400, "File is not a valid PDF.")
+        n_pages = _pdf_pages(upload)
+        if n_pages is not None and n_pages > EXTRACT_MAX_PAGES:
+            raise HTTPException(400, f"PDF has {n_pages} pages (max {EXTRACT_MAX_PAGES}).")
+    if name.endswith(".docx"):
+        if not head.startswith(b"PK"):
+            raise HTTPException(400, "File is not a valid DOCX.")
+        upload.file.seek(0)
+        try:
+            with zipfile.ZipFile(upload.file) as zf:
+                unzipped = sum(i.file_size for i in zf.infolist())
+        except zipfile.BadZipFile:
+            raise HTTPException(400, "File is not a valid DOCX.")
+        if unzipped > DOCX_MAX_UNZIPPED_BYTES:
+            raise HTTPException(413, "DOCX expands to too much data.")
+
+
+def _inspect(upload: SpooledUpload) -> None:
+    _hash(upload)
+    if upload.size == 0:
+        raise HTTPException(400, "Empty file.")
+    _sniff(upload)
+
+
+@asynccontextmanager
+async def spooled_upload(file: UploadFile) -> AsyncIterator[SpooledUpload]:
+    """
+    async with spooled_upload(file) as up:
+        text = await cached_extract_text(up.filename, up.source, digest=up.sha256)
+    """
+    declared = getattr(file, "size", None)
+    if declared is not None and declared > EXTRACT_MAX_BYTES:
+        raise _too_large()
+    upload = SpooledUpload(file)
+    try:
+        # file reads may hit disk, PdfReader parses the xref: off the event loop
+        await run_in_threadpool(_inspect, upload)
+        yield upload
+    finally:
+        upload.close()
@@ -0,0 +1,81 @@
+# vector_scoring.py
+# ----------------------------------------------------
+# NumPy scoring engine for Titan vectors:
+# - one contiguous float32 matrix per resume
+# - row norms computed once at build time
+# - a query is scored against every chunk with a single mat-vec
+# - top-k with argpartition (no full sort)
+# ----------------------------------------------------
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _as_vector(v) -> Optional[np.ndarray]:
+    if v is None:
+        return None
+    try:
+        arr = np.asarray(v, dtype=np.float32).ravel()
+    except (TypeError, ValueError):
+        return None
+    return arr if arr.size else None
+
+
+def cos_sim(a: Sequence[float], b: Sequence[float]) -> float:
+    va, vb = _as_vector(a), _as_vector(b)
+    if va is None or vb is None or va.shape != vb.shape:
+        return 0.0
+    na, nb = float(np.linalg.norm(va)), float(np.linalg.norm(vb))
+    if na == 0 or nb == 0:
+        return 0.0
+    return float(np.dot(va, vb) / (na * nb))
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    n = scores.shape[0]
+    if n == 0 or k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+class ChunkMatrix:
+    """
+    Stacked chunk vectors of one resume.
+    Rows that are missing or have the wrong size stay at zero and score 0.0,
+    same as the old per-pair cos_sim did.
+    """
+
+    def __init__(self, vectors: Sequence[Sequence[float]], dim: Optional[int] = None):
+        rows = [_as_vector(v) for v in vectors]
+        if dim is None:
+            dim = next((r.size for r in rows if r is not None), 0)
+        self.dim = dim
+        self.matrix = np.zeros((len(rows), dim), dtype=np.float32)
+        for i, r in enumerate(rows):
+            if r is not None and r.size == dim:
+                self.matrix[i] = r
+        self.norms = np.linalg.norm(self.matrix, axis=1)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def scores(self, query: Sequence[float]) -> np.ndarray:
+        q = _as_vector(query)
+        out = np.zeros(len(self), dtype=np.float32)
+        if q is None or q.size != self.dim or not len(self):
+            return out
+        qn = float(np.linalg.norm(q))
+        if qn == 0:
+            return out
+        dots = self.matrix @ q
+        np.divide(dots, self.norms * qn, out=out, where=self.norms > 0)
+        return out
+
+    def top_k(self, query: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        sims = self.scores(query)
+        return [(int(i), float(sims[i])) for i in top_k_indices(sims, k)]
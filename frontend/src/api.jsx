@@ -29,8 +29,13 @@ export const seedAdmin = (email) =>
   axios.post(`${AUTH}/seed_admin`, { email }, { headers: authHeader() });
 
 /* ---------- Admin (users) ---------- */
-export const adminListUsers = () =>
-  axios.get(`${ADMIN}/users`, { headers: authHeader() });
+// paged: pass back res.data.next_cursor (null = last page); role filters in SQL
+export const adminListUsers = (params = {}) =>
+  axios.get(`${ADMIN}/users`, { params, headers: authHeader() });
+
+// every (filtered) user as NDJSON; a Blob, since the endpoint needs the token
+export const adminExportUsers = (params = {}) =>
+  axios.get(`${ADMIN}/users/export`, { params, headers: authHeader(), responseType: "blob" });
 
 export const adminSetUserRole = (userId, role /* "admin" | "user" */) =>
   axios.patch(`${ADMIN}/users/${userId}/role`, { role }, { headers: authHeader() });
@@ -44,8 +49,13 @@ export const createComplaint = (payload) =>
   axios.post(`${SUPPORT}/complaints`, payload, { headers: authHeader() });
 
 // admin list / set status / delete
-export const adminListComplaints = () =>
-  axios.get(`${SUPPORT}/admin/complaints`, { headers: authHeader() });
+// params: { status, category, cursor, limit }
+export const adminListComplaints = (params = {}) =>
+  axios.get(`${SUPPORT}/admin/complaints`, { params, headers: authHeader() });
+
+// params: { status, category }; NDJSON Blob
+export const adminExportComplaints = (params = {}) =>
+  axios.get(`${SUPPORT}/admin/complaints/export`, { params, headers: authHeader(), responseType: "blob" });
 
 export const adminSetComplaintStatus = (id, status) =>
   axios.patch(`${SUPPORT}/admin/complaints/${id}/status`, { status }, { headers: authHeader() });
@@ -119,17 +129,24 @@ export const getRecentMatches = (limit = 5) =>
     headers: authHeader(),
   });
 
-export const getAllMatches = () =>
+// paged: pass back res.data.next_cursor for the next page (null = last page)
+export const getAllMatches = (cursor = null, limit = 50) =>
   axios.get(`${AI}/ai/match_history`, {
+    params: { cursor, limit },
     headers: authHeader(),
   });
 
+// dashboard aggregates (counts, avg / best / trend, top missing skills)
+export const getStats = () =>
+  axios.get(`${AI}/ai/stats`, { headers: authHeader() });
+
 export const getMatchById = async (id) => {
   return axios.get(`${AI}/ai/match_history/${id}`, { headers: authHeader() });
 };
 // ---------- Interview history ----------
-export const getAllInterviews = async () => {
+export const getAllInterviews = async (cursor = null, limit = 50) => {
   return axios.get(`${AI}/ai/interview_history`, {
+    params: { cursor, limit },
     headers: { ...authHeader() },
   });
 };
@@ -0,0 +1,62 @@
+// src/components/StatsCards.jsx
+// Cards for one block of /ai/stats (getStats): { count, avg, best, last, trend, recent }
+import React from "react";
+import { TrendingUp, TrendingDown } from "lucide-react";
+
+const fmt = (v) => (v == null ? "—" : v);
+// full class names, so Tailwind keeps them
+const TONES = { blue: "text-blue-600", purple: "text-purple-600" };
+
+export default function StatsCards({ block, label = "attempts", tone = "blue" }) {
+  const b = block || {};
+  const trend = b.trend;
+  const cards = [
+    { title: `Total ${label}`, value: fmt(b.count) },
+    { title: "Average score", value: fmt(b.avg) },
+    { title: "Best score", value: fmt(b.best) },
+    { title: "Last score", value: fmt(b.last) },
+  ];
+
+  return (
+    <div className="grid grid-cols-2 md:grid-cols-5 gap-4">
+      {cards.map((c) => (
+        <div key={c.title} className="bg-white rounded-2xl shadow-lg p-4">
+          <div className="text-xs text-gray-500">{c.title}</div>
+          <div className={`text-2xl font-bold ${TONES[tone] || TONES.blue}`}>{c.value}</div>
+        </div>
+      ))}
+      <div className="bg-white rounded-2xl shadow-lg p-4">
+        <div className="text-xs text-gray-500">Trend (recent)</div>
+        <div
+          className={`text-2xl font-bold flex items-center gap-1 ${
+            trend == null ? "text-gray-400" : trend >= 0 ? "text-green-600" : "text-red-600"
+          }`}
+        >
+          {trend == null ? "—" : (
+            <>
+              {trend >= 0 ? <TrendingUp className="w-5 h-5" /> : <TrendingDown className="w-5 h-5" />}
+              {trend > 0 ? `+${trend}` : trend}
+            </>
+          )}
+        </div>
+      </div>
+    </div>
+  );
+}
+
+// top_missing from /ai/stats: [{ skill, count }]
+export function MissingSkills({ items }) {
+  if (!items?.length) return null;
+  return (
+    <div className="bg-white rounded-2xl shadow-lg p-4">
+      <div className="text-sm font-semibold text-gray-700 mb-2">Most frequent missing skills</div>
+      <div className="flex flex-wrap gap-2">
+        {items.map((m) => (
+          <span key={m.skill} className="bg-orange-100 text-orange-700 px-3 py-1 rounded-full text-xs font-semibold">
+            {m.skill} · {m.count}
+          </span>
+        ))}
+      </div>
+    </div>
+  );
+}
@@ -1,8 +1,39 @@
-import { useEffect, useState } from "react";
+import { useCallback, useState } from "react";
 import {
-  adminListUsers, adminSetUserRole, adminDeleteUser,
-  adminListComplaints, adminSetComplaintStatus,  
+  adminListUsers, adminSetUserRole, adminDeleteUser, adminExportUsers,
+  adminListComplaints, adminSetComplaintStatus, adminDeleteComplaint, adminExportComplaints,
 } from "../../api";
+import { useCursorList } from "../../utils/paging";
+
+// filters with "" (= all) left out of the query string
+const filterParams = (filters) =>
+  Object.fromEntries(Object.entries(filters).filter(([, v]) => v));
+
+const downloadNdjson = async (request, filename) => {
+  try {
+    const res = await request();
+    const url = URL.createObjectURL(res.data);
+    const a = document.createElement("a");
+    a.href = url;
+    a.download = filename;
+    a.click();
+    URL.revokeObjectURL(url);
+  } catch (e) {
+    console.error("Export error", e);
+    alert("Export failed.");
+  }
+};
+
+function LoadMore({ list }) {
+  if (list.loading || !list.hasMore) return null;
+  return (
+    <div className="px-4 py-3 border-t text-center">
+      <button onClick={list.loadMore} disabled={list.loadingMore} className="px-3 py-1 border rounded disabled:opacity-50">
+        {list.loadingMore ? "Loading…" : "Load more"}
+      </button>
+    </div>
+  );
+}
 
 export default function AdminUsers() {
   const [tab, setTab] = useState("users"); 
@@ -34,96 +65,106 @@ export default function AdminUsers() {
 
 /* ---------------- Users ---------------- */
 function UsersSection() {
-  const [rows, setRows] = useState([]);
-  const [loading, setLoading] = useState(true);
-
-  const load = async () => {
-    setLoading(true);
-    try {
-      const res = await adminListUsers();
-      setRows(res.data.users || []);
-    } finally {
-      setLoading(false);
-    }
-  };
-  useEffect(() => { load(); }, []);
+  const [role, setRole] = useState("");
+  const fetchPage = useCallback(
+    (cursor) => adminListUsers(filterParams({ role, cursor })),
+    [role]
+  );
+  const list = useCursorList(fetchPage, { key: "users" });
+  const rows = list.items;
 
-  const promote = async (id) => { await adminSetUserRole(id, "admin"); await load(); };
-  const demote  = async (id) => { await adminSetUserRole(id, "user");  await load(); };
-  const remove  = async (id) => { if (confirm("Delete this user?")) { await adminDeleteUser(id); await load(); } };
+  const promote = async (id) => { await adminSetUserRole(id, "admin"); list.reload(); };
+  const demote  = async (id) => { await adminSetUserRole(id, "user");  list.reload(); };
+  const remove  = async (id) => { if (confirm("Delete this user?")) { await adminDeleteUser(id); list.reload(); } };
+  const exportAll = () => downloadNdjson(() => adminExportUsers(filterParams({ role })), "users.ndjson");
 
-  if (loading) return <div className="text-gray-500">Loading users…</div>;
+  const toolbar = (
+    <div className="flex items-center justify-between gap-3">
+      <select value={role} onChange={(e) => setRole(e.target.value)} className="px-3 py-1 border rounded bg-white">
+        <option value="">All roles</option>
+        <option value="user">User</option>
+        <option value="recruiter">Recruiter</option>
+        <option value="admin">Admin</option>
+      </select>
+      <button onClick={exportAll} className="px-3 py-1 border rounded">Export (NDJSON)</button>
+    </div>
+  );
+
+  if (list.loading) return <div className="space-y-3">{toolbar}<div className="text-gray-500">Loading users…</div></div>;
 
   return (
-    <div className="bg-white rounded-xl shadow overflow-x-auto">
-      <table className="min-w-full text-sm">
-        <thead className="bg-gray-50">
-          <tr>
-            <th className="px-4 py-2 text-left">ID</th>
-            <th className="px-4 py-2 text-left">Email</th>
-            <th className="px-4 py-2 text-left">Role</th>
-            <th className="px-4 py-2 text-left">Username</th>
-            <th className="px-4 py-2 text-left">Major</th>
-            <th className="px-4 py-2 text-right">Actions</th>
-          </tr>
-        </thead>
-        <tbody>
-          {rows.map((r) => (
-            <tr key={r.id} className="border-t">
-              <td className="px-4 py-2">{r.id}</td>
-              <td className="px-4 py-2">{r.email}</td>
-              <td className="px-4 py-2">{r.role}</td>
-              <td className="px-4 py-2">{r.profile?.username || "—"}</td>
-              <td className="px-4 py-2">{r.profile?.major || "—"}</td>
-              <td className="px-4 py-2 text-right space-x-2">
-                {r.role !== "admin" ? (
-                  <button onClick={() => promote(r.id)} className="px-2 py-1 border rounded">Promote</button>
-                ) : (
-                  <button onClick={() => demote(r.id)} className="px-2 py-1 border rounded">Demote</button>
-                )}
-                <button onClick={() => remove(r.id)} className="px-2 py-1 border rounded text-red-600">Delete</button>
-              </td>
+    <div className="space-y-3">
+      {toolbar}
+      <div className="bg-white rounded-xl shadow overflow-x-auto">
+        <table className="min-w-full text-sm">
+          <thead className="bg-gray-50">
+            <tr>
+              <th className="px-4 py-2 text-left">ID</th>
+              <th className="px-4 py-2 text-left">Email</th>
+              <th className="px-4 py-2 text-left">Role</th>
+              <th className="px-4 py-2 text-left">Username</th>
+              <th className="px-4 py-2 text-left">Major</th>
+              <th className="px-4 py-2 text-right">Actions</th>
             </tr>
-          ))}
-          {!rows.length && (
-            <tr><td className="px-4 py-6 text-center text-gray-500" colSpan="6">No users yet.</td></tr>
-          )}
-        </tbody>
-      </table>
+          </thead>
+          <tbody>
+            {rows.map((r) => (
+              <tr key={r.id} className="border-t">
+                <td className="px-4 py-2">{r.id}</td>
+                <td className="px-4 py-2">{r.email}</td>
+                <td className="px-4 py-2">{r.role}</td>
+                <td className="px-4 py-2">{r.profile?.username || "—"}</td>
+                <td className="px-4 py-2">{r.profile?.major || "—"}</td>
+                <td className="px-4 py-2 text-right space-x-2">
+                  {r.role !== "admin" ? (
+                    <button onClick={() => promote(r.id)} className="px-2 py-1 border rounded">Promote</button>
+                  ) : (
+                    <button onClick={() => demote(r.id)} className="px-2 py-1 border rounded">Demote</button>
+                  )}
+                  <button onClick={() => remove(r.id)} className="px-2 py-1 border rounded text-red-600">Delete</button>
+                </td>
+              </tr>
+            ))}
+            {!rows.length && (
+              <tr><td className="px-4 py-6 text-center text-gray-500" colSpan="6">No users yet.</td></tr>
+            )}
+          </tbody>
+        </table>
+        <LoadMore list={list} />
+      </div>
     </div>
   );
 }
 
 /* ---------------- Support ---------------- */
 function SupportSection() {
-  const [items, setItems] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const [status, setStatusFilter] = useState("");
+  const [category, setCategory] = useState("");
   const [viewItem, setViewItem] = useState(null); 
 
-  const load = async () => {
-    setLoading(true);
-    try {
-      const res = await adminListComplaints();
-      setItems(res.data.items || []);
-    } finally {
-      setLoading(false);
-    }
-  };
-  useEffect(() => { load(); }, []);
+  const fetchPage = useCallback(
+    (cursor) => adminListComplaints(filterParams({ status, category, cursor })),
+    [status, category]
+  );
+  const list = useCursorList(fetchPage);
+  const items = list.items;
 
   const setStatus = async (id, status) => {
     await adminSetComplaintStatus(id, status);
-    await load();
+    list.reload();
   };
 
   const remove = async (id) => {
     if (confirm("Delete this ticket?")) {
       await adminDeleteComplaint(id);
-      await load();
+      list.reload();
       setViewItem(null);
     }
   };
 
+  const exportAll = () =>
+    downloadNdjson(() => adminExportComplaints(filterParams({ status, category })), "complaints.ndjson");
+
   const badge = (s) =>
     ({
       open: "bg-yellow-100 text-yellow-800",
@@ -132,56 +173,84 @@ function SupportSection() {
       rejected: "bg-rose-100 text-rose-800",
     }[s] || "bg-gray-100 text-gray-800");
 
-  if (loading) return <div className="text-gray-500">Loading tickets…</div>;
+  const toolbar = (
+    <div className="flex items-center justify-between gap-3">
+      <div className="space-x-2">
+        <select value={status} onChange={(e) => setStatusFilter(e.target.value)} className="px-3 py-1 border rounded bg-white">
+          <option value="">All statuses</option>
+          <option value="open">Open</option>
+          <option value="in_progress">In progress</option>
+          <option value="resolved">Resolved</option>
+          <option value="rejected">Rejected</option>
+        </select>
+        <select value={category} onChange={(e) => setCategory(e.target.value)} className="px-3 py-1 border rounded bg-white">
+          <option value="">All categories</option>
+          <option value="general">General</option>
+          <option value="technical">Technical</option>
+          <option value="billing">Billing</option>
+          <option value="feedback">Feedback</option>
+          <option value="bug">Bug</option>
+          <option value="feature">Feature</option>
+        </select>
+      </div>
+      <button onClick={exportAll} className="px-3 py-1 border rounded">Export (NDJSON)</button>
+    </div>
+  );
+
+  if (list.loading) return <div className="space-y-3">{toolbar}<div className="text-gray-500">Loading tickets…</div></div>;
 
   return (
     <>
-      <div className="bg-white rounded-xl shadow overflow-x-auto">
-        <table className="min-w-full text-sm">
-          <thead className="bg-gray-50">
-            <tr>
-              <th className="px-4 py-2 text-left">ID</th>
-              <th className="px-4 py-2 text-left">From</th>
-              <th className="px-4 py-2 text-left">Subject</th>
-              <th className="px-4 py-2 text-left">Message</th>
-              <th className="px-4 py-2 text-left">Category</th>
-              <th className="px-4 py-2 text-left">Status</th>
-              <th className="px-4 py-2 text-right">Actions</th>
-            </tr>
-          </thead>
-          <tbody>
-            {items.map((t) => (
-              <tr key={t.id} className="border-t align-top">
-                <td className="px-4 py-2">{t.id}</td>
-                <td className="px-4 py-2">
-                  <div className="font-medium">{t.name}</div>
-                  <div className="text-gray-600">{t.email}</div>
-                </td>
-                <td className="px-4 py-2">{t.subject}</td>
+      <div className="space-y-3">
+        {toolbar}
+        <div className="bg-white rounded-xl shadow overflow-x-auto">
+          <table className="min-w-full text-sm">
+            <thead className="bg-gray-50">
+              <tr>
+                <th className="px-4 py-2 text-left">ID</th>
+                <th className="px-4 py-2 text-left">From</th>
+                <th className="px-4 py-2 text-left">Subject</th>
+                <th className="px-4 py-2 text-left">Message</th>
+                <th className="px-4 py-2 text-left">Category</th>
+                <th className="px-4 py-2 text-left">Status</th>
+                <th className="px-4 py-2 text-right">Actions</th>
+              </tr>
+            </thead>
+            <tbody>
+              {items.map((t) => (
+                <tr key={t.id} className="border-t align-top">
+                  <td className="px-4 py-2">{t.id}</td>
+                  <td className="px-4 py-2">
+                    <div className="font-medium">{t.name}</div>
+                    <div className="text-gray-600">{t.email}</div>
+                  </td>
+                  <td className="px-4 py-2">{t.subject}</td>
 
-                {/* one-line snippet */}
-                <td className="px-4 py-2">
-                  <div className="max-w-xs truncate text-gray-700">{t.message}</div>
-                </td>
+                  {/* one-line snippet */}
+                  <td className="px-4 py-2">
+                    <div className="max-w-xs truncate text-gray-700">{t.message}</div>
+                  </td>
 
-                <td className="px-4 py-2 capitalize">{t.category}</td>
-                <td className="px-4 py-2">
-                  <span className={`px-2 py-1 rounded text-xs ${badge(t.status)}`}>{t.status}</span>
-                </td>
-                <td className="px-4 py-2 text-right space-x-2">
-                  <button onClick={() => setViewItem(t)} className="px-2 py-1 border rounded">View</button>
-                  <button onClick={() => setStatus(t.id, "in_progress")} className="px-2 py-1 border rounded">In progress</button>
-                  <button onClick={() => setStatus(t.id, "resolved")} className="px-2 py-1 border rounded bg-green-600 text-white">Resolve</button>
-                  <button onClick={() => setStatus(t.id, "rejected")} className="px-2 py-1 border rounded text-rose-600">Reject</button>
-                  <button onClick={() => remove(t.id)} className="px-2 py-1 border rounded text-red-700">Delete</button>
-                </td>
-              </tr>
-            ))}
-            {!items.length && (
-              <tr><td className="px-4 py-6 text-center text-gray-500" colSpan="7">No tickets yet.</td></tr>
-            )}
-          </tbody>
-        </table>
+                  <td className="px-4 py-2 capitalize">{t.category}</td>
+                  <td className="px-4 py-2">
+                    <span className={`px-2 py-1 rounded text-xs ${badge(t.status)}`}>{t.status}</span>
+                  </td>
+                  <td className="px-4 py-2 text-right space-x-2">
+                    <button onClick={() => setViewItem(t)} className="px-2 py-1 border rounded">View</button>
+                    <button onClick={() => setStatus(t.id, "in_progress")} className="px-2 py-1 border rounded">In progress</button>
+                    <button onClick={() => setStatus(t.id, "resolved")} className="px-2 py-1 border rounded bg-green-600 text-white">Resolve</button>
+                    <button onClick={() => setStatus(t.id, "rejected")} className="px-2 py-1 border rounded text-rose-600">Reject</button>
+                    <button onClick={() => remove(t.id)} className="px-2 py-1 border rounded text-red-700">Delete</button>
+                  </td>
+                </tr>
+              ))}
+              {!items.length && (
+                <tr><td className="px-4 py-6 text-center text-gray-500" colSpan="7">No tickets yet.</td></tr>
+              )}
+            </tbody>
+          </table>
+          <LoadMore list={list} />
+        </div>
       </div>
 
       {/* ----- View Modal ----- */}
@@ -1,39 +1,26 @@
 // src/pages/Dashboard/HistoryPage.jsx
-import React, { useEffect, useState, useMemo } from "react";
+import React, { useState, useMemo } from "react";
 import { useNavigate } from "react-router-dom";
 import { getAllMatches, getAllInterviews } from "../../api";
+import { useCursorList } from "../../utils/paging";
 import { FileText, MessageCircle, CheckCircle, XCircle } from "lucide-react";
 
 export default function HistoryPage() {
   const navigate = useNavigate();
 
   const [mode, setMode] = useState("matches"); 
-  const [loading, setLoading] = useState(true);
-
-  const [matches, setMatches] = useState([]);
-  const [interviews, setInterviews] = useState([]);
 
   const [sortBy, setSortBy] = useState("date-new");
 
-  useEffect(() => {
-    (async () => {
-      setLoading(true);
-      try {
-        const m = await getAllMatches().catch(() => ({ data: [] }));
-        const i = await getAllInterviews().catch(() => ({ data: [] }));
-
-        setMatches(m.data.items || m.data || []);
-        setInterviews(i.data.items || i.data || []);
-      } catch (e) {
-        console.error("History load error", e);
-      }
-      setLoading(false);
-    })();
-  }, []);
+  // pages come newest first; any other order is computed here over every page
+  const loadAll = sortBy !== "date-new";
+  const matches = useCursorList(getAllMatches, { loadAll: loadAll && mode === "matches" });
+  const interviews = useCursorList(getAllInterviews, { loadAll: loadAll && mode === "interviews" });
+  const list = mode === "matches" ? matches : interviews;
+  const loading = list.loading;
 
   const data = useMemo(() => {
-    let arr = mode === "matches" ? matches : interviews;
-    arr = [...arr];
+    let arr = [...list.items];
 
     arr.sort((a, b) => {
       const da = new Date(a.created_at || 0).getTime();
@@ -51,7 +38,7 @@ export default function HistoryPage() {
     });
 
     return arr;
-  }, [mode, matches, interviews, sortBy]);
+  }, [list.items, sortBy]);
 
   const badgeClasses = (score) => {
     if (score >= 80) return "bg-gradient-to-br from-green-400 to-emerald-600";
@@ -91,6 +78,7 @@ export default function HistoryPage() {
           Showing{" "}
           <span className="font-semibold">{data.length}</span>{" "}
           {mode === "matches" ? "matches" : "interviews"}
+          {list.hasMore && (loadAll ? " (loading all…)" : "+")}
         </div>
       </div>
 
@@ -183,6 +171,18 @@ export default function HistoryPage() {
             );
           })}
       </div>
+
+      {!loading && list.hasMore && !loadAll && (
+        <div className="flex justify-center">
+          <button
+            onClick={list.loadMore}
+            disabled={list.loadingMore}
+            className="bg-white text-blue-600 border border-blue-200 px-5 py-2 rounded-xl text-sm font-semibold hover:bg-blue-50 transition disabled:opacity-50"
+          >
+            {list.loadingMore ? "Loading…" : "Load more"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
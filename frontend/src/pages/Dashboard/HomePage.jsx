@@ -11,12 +11,13 @@ import {
   Check,
 } from "lucide-react";
 import { useNavigate } from "react-router-dom";
-import { getProfile, getRecentMatches } from "../../api";
+import { getProfile, getStats } from "../../api";
+import StatsCards, { MissingSkills } from "../../components/StatsCards";
 
 export default function HomePage() {
   const navigate = useNavigate();
   const [displayName, setDisplayName] = useState("there");
-  const [recentMatches, setRecentMatches] = useState([]);
+  const [stats, setStats] = useState(null);
 
   useEffect(() => {
     (async () => {
@@ -29,9 +30,9 @@ export default function HomePage() {
           (me.data.username);
         setDisplayName(username);
 
-        // get last few matches for preview
-        const hist = await getRecentMatches(3);
-        setRecentMatches(hist.data.items || []);
+        // dashboard numbers: one rollup row, not the full histories
+        const st = await getStats();
+        setStats(st.data);
       } catch (e) {
         console.error("HomePage load error", e);
       }
@@ -69,7 +70,12 @@ export default function HomePage() {
             View your previous CV comparisons
           </p>
 
-          
+          {stats?.matches?.count > 0 && (
+            <p className="text-purple-50 mb-4">
+              {stats.matches.count} matches · average {stats.matches.avg ?? "—"} · best{" "}
+              {stats.matches.best ?? "—"}
+            </p>
+          )}
 
           <button
           onClick={() => navigate("/dashboard?tab=history")}
@@ -81,6 +87,15 @@ export default function HomePage() {
         </div>
       </div>
 
+      {stats && (stats.matches.count > 0 || stats.interviews.count > 0) && (
+        <div className="space-y-4">
+          <h2 className="text-2xl font-bold text-gray-800">Your progress</h2>
+          <StatsCards block={stats.matches} label="matches" tone="blue" />
+          <StatsCards block={stats.interviews} label="interviews" tone="purple" />
+          <MissingSkills items={stats.top_missing} />
+        </div>
+      )}
+
       {/* Why HiringBuddy? section – unchanged, just using your text */}
 
       <div className="bg-white rounded-2xl shadow-xl p-8">
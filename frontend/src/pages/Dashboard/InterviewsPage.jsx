@@ -1,30 +1,30 @@
 // src/pages/Dashboard/InterviewsPage.jsx
 import React, { useEffect, useMemo, useState } from "react";
 import { useNavigate } from "react-router-dom";
-import { getAllInterviews } from "../../api";
+import { getAllInterviews, getStats } from "../../api";
+import { useCursorList } from "../../utils/paging";
+import StatsCards from "../../components/StatsCards";
 import { MessageCircle } from "lucide-react";
 
 export default function InterviewsPage() {
   const navigate = useNavigate();
-  const [interviews, setInterviews] = useState([]);
-  const [loading, setLoading] = useState(true);
 
   // filter & sort
   const [filterType, setFilterType] = useState("all"); 
   const [sortBy, setSortBy] = useState("date-new"); // date-new or $
 
+  // pages come newest first; other orders need every page loaded
+  const loadAll = sortBy !== "date-new";
+  const {
+    items: interviews, loading, loadingMore, hasMore, loadMore,
+  } = useCursorList(getAllInterviews, { loadAll });
+
+  // totals over every interview, from the stats rollup (not the loaded pages)
+  const [stats, setStats] = useState(null);
   useEffect(() => {
-    (async () => {
-      try {
-        const res = await getAllInterviews();
-        const rawItems = res.data.items || res.data || [];
-        setInterviews(rawItems);
-      } catch (e) {
-        console.error("InterviewsPage load error", e);
-      } finally {
-        setLoading(false);
-      }
-    })();
+    getStats()
+      .then((res) => setStats(res.data.interviews))
+      .catch((e) => console.error("InterviewsPage stats error", e));
   }, []);
 
   const filteredAndSorted = useMemo(() => {
@@ -80,6 +80,10 @@ export default function InterviewsPage() {
       {/* Page title */}
       <h1 className="text-3xl font-bold text-gray-900">Interview History</h1>
 
+      {stats && stats.count > 0 && (
+        <StatsCards block={stats} label="interviews" tone="purple" />
+      )}
+
       {/* Top gradient bar (same style as matches) */}
       <div className="bg-gradient-to-r from-purple-500 to-pink-500 rounded-2xl px-6 py-4 text-white shadow-lg flex flex-col md:flex-row md:items-center md:justify-between gap-3">
         <div className="flex items-center gap-3">
@@ -110,6 +114,7 @@ export default function InterviewsPage() {
           Showing{" "}
           <span className="font-semibold">{filteredAndSorted.length}</span>{" "}
           {filteredAndSorted.length === 1 ? "interview" : "interviews"}
+          {hasMore && (loadAll ? " (loading all…)" : "+")}
         </div>
       </div>
 
@@ -198,6 +203,18 @@ export default function InterviewsPage() {
             );
           })}
       </div>
+
+      {!loading && hasMore && !loadAll && (
+        <div className="flex justify-center">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="bg-white text-purple-600 border border-purple-200 px-5 py-2 rounded-xl text-sm font-semibold hover:bg-purple-50 transition disabled:opacity-50"
+          >
+            {loadingMore ? "Loading…" : "Load more"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -2,8 +2,9 @@
 import React, { useEffect, useMemo, useState } from "react";
 import { useSearchParams, useNavigate } from "react-router-dom";
 import { ArrowLeft, ChevronRight } from "lucide-react";
-import { getMatchById } from "../../api";
+import { getMatchById, getStats } from "../../api";
 import Results from "../../components/Results";
+import StatsCards, { MissingSkills } from "../../components/StatsCards";
 
 export default function MatchDetailsPage() {
   const [searchParams] = useSearchParams();
@@ -12,6 +13,14 @@ export default function MatchDetailsPage() {
 
   const [match, setMatch] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [stats, setStats] = useState(null);
+
+  // match totals from the stats rollup: summary without an id, "your average" with one
+  useEffect(() => {
+    getStats()
+      .then((res) => setStats(res.data))
+      .catch((e) => console.error("MatchesPage stats error", e));
+  }, []);
 
   useEffect(() => {
     if (!id) {
@@ -48,6 +57,28 @@ export default function MatchDetailsPage() {
     return <p className="text-sm text-gray-600">Loading match details…</p>;
   }
 
+  if (!id) {
+    return (
+      <div className="space-y-6">
+        <h1 className="text-3xl font-bold text-gray-900">Your Matches</h1>
+        {stats ? (
+          <>
+            <StatsCards block={stats.matches} label="matches" tone="blue" />
+            <MissingSkills items={stats.top_missing} />
+          </>
+        ) : (
+          <p className="text-sm text-gray-600">Loading your stats…</p>
+        )}
+        <button
+          onClick={() => navigate("/dashboard?tab=history")}
+          className="bg-blue-500 text-white px-5 py-2 rounded-xl text-sm font-semibold hover:bg-blue-600 transition"
+        >
+          View match history
+        </button>
+      </div>
+    );
+  }
+
   if (!match) {
     return (
       <div>
@@ -119,6 +150,11 @@ export default function MatchDetailsPage() {
             <div className="text-6xl font-bold">
               {topScore == null ? "—" : `${topScore}%`}
             </div>
+            {stats?.matches?.avg != null && (
+              <p className="text-blue-100 text-sm mt-2">
+                Your average: {stats.matches.avg}% · best: {stats.matches.best ?? "—"}%
+              </p>
+            )}
           </div>
 
           <div className="hidden md:block text-right">
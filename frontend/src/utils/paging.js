@@ -0,0 +1,65 @@
+// src/utils/paging.js
+import { useCallback, useEffect, useRef, useState } from "react";
+
+// List backed by a cursor-paged endpoint ({ <key>, next_cursor }, null = last page).
+// fetchPage(cursor) must be stable (a module function, or useCallback over the
+// filters: a new fetchPage restarts from the first page).
+// With loadAll, pages keep loading until next_cursor is null: sorts other
+// than the server's order need the whole list.
+export function useCursorList(fetchPage, { loadAll = false, key = "items" } = {}) {
+  const [items, setItems] = useState([]);
+  const [cursor, setCursor] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [failed, setFailed] = useState(false);
+  const [version, setVersion] = useState(0);
+  // bumped on every restart, so a page requested before it is dropped
+  const generation = useRef(0);
+
+  useEffect(() => {
+    const gen = ++generation.current;
+    setLoading(true);
+    setLoadingMore(false);
+    setFailed(false);
+    setCursor(null);
+    (async () => {
+      try {
+        const res = await fetchPage(null);
+        if (gen !== generation.current) return;
+        setItems(res.data[key] || []);
+        setCursor(res.data.next_cursor || null);
+      } catch (e) {
+        console.error("List load error", e);
+        if (gen === generation.current) setFailed(true);
+      } finally {
+        if (gen === generation.current) setLoading(false);
+      }
+    })();
+  }, [fetchPage, key, version]);
+
+  const loadMore = useCallback(async () => {
+    if (!cursor || loadingMore) return;
+    const gen = generation.current;
+    setLoadingMore(true);
+    setFailed(false);
+    try {
+      const res = await fetchPage(cursor);
+      if (gen !== generation.current) return;
+      setItems((prev) => [...prev, ...(res.data[key] || [])]);
+      setCursor(res.data.next_cursor || null);
+    } catch (e) {
+      console.error("List load error", e);
+      if (gen === generation.current) setFailed(true);
+    } finally {
+      if (gen === generation.current) setLoadingMore(false);
+    }
+  }, [fetchPage, key, cursor, loadingMore]);
+
+  useEffect(() => {
+    if (loadAll && cursor && !loadingMore && !failed) loadMore();
+  }, [loadAll, cursor, loadingMore, failed, loadMore]);
+
+  const reload = useCallback(() => setVersion((v) => v + 1), []);
+
+  return { items, loading, loadingMore, hasMore: !!cursor, loadMore, reload };
+}